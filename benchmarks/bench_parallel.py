@@ -0,0 +1,43 @@
+"""
+Scaling of ParallelAuditor (validation + per-project compliance) with the worker count.
+
+python benchmarks/bench_parallel.py --rows 200000 --workers 1,2,4,8,16 --chunk-size 2000
+"""
+
+import argparse
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ekotrope_sync_v9aaa import ComplianceStandards, ParallelAuditor
+from synthetic import make_projects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--workers', default='1,2,4,8,16', help="comma separated worker counts")
+    parser.add_argument('--chunk-size', type=int, default=ParallelAuditor.CHUNK_SIZE)
+    parser.add_argument('--repeat', type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    projects = make_projects(args.rows)
+    standard = ComplianceStandards.get_standard('ENERGY STAR 3.2')
+    print(f"{args.rows} projects, chunk size {args.chunk_size}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    baseline = reference = None
+    for workers in [int(w) for w in args.workers.split(',')]:
+        auditor = ParallelAuditor(standard, workers, args.chunk_size)
+        best = float('inf')
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            results = auditor.run(projects)
+            best = min(best, time.perf_counter() - t0)
+        if reference is None:
+            baseline, reference = best, results
+        elif results != reference:
+            raise Exception(f"results with {workers} workers differ from {args.workers.split(',')[0]} worker(s)")
+        print(f"{workers:>8} {best:>9.3f} {baseline / best:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+REM XML import: streaming REMFileHandler._parse_rem_xml against the previous ET.parse + findall parser.
+Each parser runs in its own process so peak RSS is measured separately.
+
+python benchmarks/bench_rem_xml.py --buildings 200000 [--file existing_export.xml]
+"""
+
+import argparse
+import json
+import os, sys, time
+import subprocess
+import tempfile
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ekotrope_sync_v9aaa import REMFileHandler
+from synthetic import write_rem_xml
+
+
+def legacy_parse(filepath):
+    """The parser before the streaming rewrite: a full tree and one findall scan per record tag."""
+    projects = []
+    root = ET.parse(filepath).getroot()
+    for elem_name in ['Building', 'Home', 'Project', 'Rating']:
+        for building in root.findall(f'.//{elem_name}'):
+            project = {}
+            for child in building:
+                tag = child.tag.split('}')[-1]
+                if tag in REMFileHandler.XML_MAP and child.text:
+                    try:
+                        project[REMFileHandler.XML_MAP[tag]] = float(child.text.strip())
+                    except ValueError:
+                        project[REMFileHandler.XML_MAP[tag]] = child.text.strip()
+            if project:
+                projects.append(project)
+    return projects
+
+
+PARSERS = {'legacy': legacy_parse, 'streaming': REMFileHandler._parse_rem_xml}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows: no getrusage
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def child(parser, path):
+    before = peak_rss_mb()
+    t0 = time.perf_counter()
+    records = len(PARSERS[parser](path))
+    seconds = time.perf_counter() - t0
+    after = peak_rss_mb()
+    print(json.dumps({'records': records, 'seconds': seconds, 'peak_rss_mb': after,
+                      'rss_growth_mb': after - before if after is not None else None}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--buildings', type=int, default=100000)
+    parser.add_argument('--file', help="benchmark an existing REM XML export instead of a generated one")
+    parser.add_argument('--child', nargs=2, metavar=('PARSER', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(*args.child)
+
+    path = args.file
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(), 'rem_export.xml')
+        write_rem_xml(path, args.buildings)
+    size_mb = os.path.getsize(path) / 2 ** 20
+    print(f"{path}: {size_mb:.1f} MB")
+    print(f"{'parser':>10} {'records':>9} {'seconds':>8} {'MB/s':>7} {'peak RSS MB':>12} {'RSS growth MB':>14}")
+    for name in PARSERS:
+        out = subprocess.run([sys.executable, __file__, '--child', name, path], capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout)
+        rss = f"{r['peak_rss_mb']:.1f}" if r['peak_rss_mb'] is not None else 'n/a'
+        growth = f"{r['rss_growth_mb']:.1f}" if r['rss_growth_mb'] is not None else 'n/a'
+        print(f"{name:>10} {r['records']:>9} {r['seconds']:>8.2f} {size_mb / r['seconds']:>7.1f} {rss:>12} {growth:>14}")
+    if not args.file:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Headless pipeline benchmark on synthetic portfolios (benchmarks/synthetic.py): times load, normalize, key generation,
+validation, compliance, the JSON/REM XML/REM CSV exports, joining REM results into the projects and the REM XML/CSV
+imports, and reports rows/second and peak memory as JSON. Each size runs in its own process. --baseline compares
+against a saved run and exits 1 when a stage got slower than the tolerance allows.
+
+python benchmarks/run_benchmarks.py --sizes 1000,10000,100000 --out results.json [--baseline baseline.json] [--memory]
+"""
+
+import argparse
+import json
+import os, sys, time
+import platform
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+from ekotrope_sync_v9aaa import (PERF, ComplianceChecker, ComplianceStandards, ConfigManager, EkotropeJSONGenerator, ExcelLoader,
+                                 ParallelAuditor, ProjectKeys, REMFileHandler, REMJoiner,
+                                 new_project_store)
+import synthetic
+
+STAGES = ['load', 'normalize', 'keys', 'validation', 'compliance', 'json_export', 'xml_export', 'csv_export', 'rem_join', 'xml_import', 'csv_import']
+
+
+def run_stages(paths, out_dir, workers):
+    """Run every stage once on the portfolio files; returns {stage: {seconds, rows, rows_per_s, peak_mb, rss_mb}}.
+    peak_mb is the tracemalloc peak (--memory only), rss_mb the process peak RSS once the stage is done."""
+    PERF.reset()
+    rss = {}
+    @contextmanager
+    def stage(name):
+        with PERF.measure(f"stage: {name}") as span:
+            yield span
+        rss[name] = PERF.summary()['process_peak_mb']
+    standard = ComplianceStandards.get_standard('ENERGY STAR 3.2')
+    with stage('load') as span:
+        chunks = list(ExcelLoader.iter_chunks(paths['xlsx']))
+        span.rows = sum(map(len, chunks))
+    frame = pd.read_csv(paths['csv'])
+    with stage('normalize') as span:
+        ExcelLoader._normalize_columns(frame)
+        span.rows = len(frame)
+    del frame
+    with stage('keys') as span:
+        projects, keys, start = new_project_store(), ProjectKeys(), 0
+        for chunk in chunks:
+            projects.update(keys.add(chunk, start))
+            start += len(chunk)
+        span.rows = len(projects)
+    del chunks
+    with stage('validation') as span:
+        ParallelAuditor(standard, workers).run(projects, comply=False)
+        span.rows = len(projects)
+    with stage('compliance') as span:
+        ComplianceChecker(standard).check_batch(projects)
+        span.rows = len(projects)
+    with stage('json_export') as span:
+        span.rows = EkotropeJSONGenerator(dict(ConfigManager.DEFAULT)).write(projects, os.path.join(out_dir, 'out.json'))
+    rows = [projects[k] for k in projects]
+    with stage('xml_export') as span:
+        REMFileHandler.export_to_rem_xml(rows, os.path.join(out_dir, 'out.xml'))
+        span.rows = len(rows)
+    with stage('csv_export') as span:
+        REMFileHandler.export_to_rem_csv(rows, os.path.join(out_dir, 'out.csv'))
+        span.rows = len(rows)
+    del rows
+    records = REMFileHandler.read_rem_file(paths['xml'])
+    with stage('rem_join') as span:
+        REMJoiner(projects).merge(records)
+        span.rows = len(records)
+    del records, projects
+    with stage('xml_import') as span:
+        span.rows = len(REMFileHandler.read_rem_file(paths['xml']))
+    with stage('csv_import') as span:
+        span.rows = len(REMFileHandler.read_rem_file(paths['rem.csv']))
+    spans = PERF.summary()['spans']
+    results = {}
+    for name in STAGES:
+        s = spans[f"stage: {name}"]
+        results[name] = {'seconds': s['total_ms'] / 1000, 'rows': s['rows'], 'rows_per_s': s['rows_per_s'], 'peak_mb': s['peak_mb'], 'rss_mb': rss[name]}
+    return results
+
+
+def child(size, data_dir, seed, workers, memory):
+    paths = synthetic.portfolio(data_dir, size, seed, ('xlsx', 'csv', 'xml', 'rem.csv'))
+    PERF.enabled = True
+    if memory: PERF.set_track_memory(True)
+    with tempfile.TemporaryDirectory() as out_dir:
+        results = run_stages(paths, out_dir, workers)
+    print(json.dumps({'stages': results, 'process_peak_mb': PERF.summary()['process_peak_mb'], 'files': {
+        fmt: os.path.getsize(path) for fmt, path in paths.items()}}))
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    """Print stage timings against the baseline; returns the regressions as (size, stage, ratio) tuples."""
+    if baseline['settings'].get('memory') != results['settings'].get('memory'):
+        print("WARNING: baseline was run with a different --memory setting; timings are not comparable")
+    regressions = []
+    print(f"\n{'rows':>8} {'stage':<12} {'baseline s':>11} {'now s':>9} {'change':>8}")
+    for size, run in results['sizes'].items():
+        base = baseline['sizes'].get(size)
+        if not base: continue
+        for name, s in run['stages'].items():
+            b = base['stages'].get(name)
+            if not b: continue
+            ratio = s['seconds'] / b['seconds'] if b['seconds'] > 0 else float('inf')
+            slower = ratio > 1 + tolerance and s['seconds'] - b['seconds'] > min_seconds
+            if slower: regressions.append((size, name, ratio))
+            print(f"{size:>8} {name:<12} {b['seconds']:>11.3f} {s['seconds']:>9.3f} {ratio - 1:>+7.0%}{'  REGRESSION' if slower else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help="comma separated row counts (1000 up to 500000)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--workers', type=int, default=1, help="ParallelAuditor workers for the validation stage")
+    parser.add_argument('--memory', action='store_true', help="tracemalloc peak per stage (slows every stage down)")
+    parser.add_argument('--data-dir', help="keep the generated portfolios here and reuse them on later runs")
+    parser.add_argument('--out', help="write the results JSON here (a run saved this way is a baseline)")
+    parser.add_argument('--baseline', help="results JSON of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown per stage before it counts as a regression")
+    parser.add_argument('--min-seconds', type=float, default=0.05, help="ignore slowdowns smaller than this")
+    parser.add_argument('--child', type=int, metavar='SIZE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='ek_bench_')
+    if args.child:
+        return child(args.child, data_dir, args.seed, args.workers, args.memory)
+
+    results = {'generated': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'platform': platform.platform(),
+               'cpus': os.cpu_count(), 'settings': {'seed': args.seed, 'workers': args.workers, 'memory': args.memory}, 'sizes': {}}
+    print(f"{'rows':>8} {'stage':<12} {'seconds':>9} {'rows/s':>11} {'peak MB':>8} {'RSS MB':>7}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        cmd = [sys.executable, __file__, '--child', str(size), '--data-dir', data_dir, '--seed', str(args.seed), '--workers', str(args.workers)]
+        out = subprocess.run(cmd + (['--memory'] if args.memory else []), capture_output=True, text=True, check=True)
+        run = results['sizes'][str(size)] = json.loads(out.stdout.strip().splitlines()[-1])
+        for name, s in run['stages'].items():
+            peak = f"{s['peak_mb']:.1f}" if s['peak_mb'] is not None else ''
+            rss = f"{s['rss_mb']:.0f}" if s['rss_mb'] is not None else ''
+            print(f"{size:>8} {name:<12} {s['seconds']:>9.3f} {s['rows_per_s'] or 0:>11,.0f} {peak:>8} {rss:>7}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    if not args.data_dir:
+        for name in os.listdir(data_dir): os.remove(os.path.join(data_dir, name))
+        os.rmdir(data_dir)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than the baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Synthetic DSLD portfolios for the benchmarks: SQL-export workbooks (.xlsx/.csv) over DSLDSchema.ALL_FIELDS with the
+header variety ExcelLoader.COLUMN_ALIASES accepts, missing cells, dates and duplicate Subdivision/Lot keys, plus
+REM XML and REM CSV files. Seeded, so a size and seed always give the same files.
+
+python benchmarks/synthetic.py --rows 10000 --out /tmp/portfolio [--formats xlsx,csv,xml,rem.csv] [--seed 7]
+"""
+
+import argparse
+import csv
+import os, sys
+import random
+from datetime import date, timedelta
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ekotrope_sync_v9aaa import DSLDSchema, ExcelLoader, REMFileHandler, new_project_store
+
+REGIONS = ['North', 'South', 'East', 'West', 'Central']
+CITIES = [('Baton Rouge', 'LA', 70801), ('Lafayette', 'LA', 70501), ('Covington', 'LA', 70433), ('Houston', 'TX', 77001),
+          ('Katy', 'TX', 77449), ('Gulfport', 'MS', 39501)]
+SUB_WORDS = (['Oak', 'Elm', 'Pine', 'Cypress', 'Magnolia', 'Willow', 'Cedar', 'Live Oak', 'Pecan', 'Bayou'],
+             ['Park', 'Ridge', 'Landing', 'Crossing', 'Estates', 'Trace', 'Point', 'Grove', 'Place', 'Commons'])
+STREETS = ['Main St', 'Oak Ln', 'Cypress Dr', 'Heron Way', 'Magnolia Blvd', 'Pelican Ct', 'River Rd', 'Live Oak Dr']
+PEOPLE = ['J. Smith', 'A. Landry', 'M. Nguyen', 'R. Hebert', 'T. Johnson', 'K. Broussard', 'D. Garcia', 'L. Thibodeaux']
+SUPPLIERS = ['Acme HVAC', 'Gulf Air', 'Comfort Pros', 'Bayou Mechanical', 'Delta Cooling']
+MISSING_CELLS = [None, None, None, '', 'N/A', 'NULL']  # what a missing value looks like in the export
+
+
+def headers(rnd, variety=True):
+    """Header per schema field: a random accepted alias (one per column, as a real export has), or the standard name."""
+    return {f: rnd.choice(ExcelLoader.COLUMN_ALIASES.get(f, [f])) if variety else f for f in DSLDSchema.ALL_FIELDS}
+
+
+def _subdivisions(rnd, n):
+    names = [f"{a} {b}" for a in SUB_WORDS[0] for b in SUB_WORDS[1]]
+    rnd.shuffle(names)
+    count = max(5, min(len(names), n // 150))  # ~150 lots a subdivision, as in a real portfolio
+    return [(name, rnd.choice(REGIONS)) for name in names[:count]]
+
+
+def iter_rows(n, seed=7, missing=0.05, duplicates=0.01):
+    """Yield n project dicts keyed by the standard field names. Each value is None with probability missing
+    (the key columns a fifth as often), dates are datetime.date, and about duplicates of the rows repeat an
+    earlier Subdivision/Lot key."""
+    rnd = random.Random(seed)
+    subs = _subdivisions(rnd, n)
+    next_lot = {name: 1 for name, _ in subs}
+    keys = []
+    base = date(2024, 1, 1)
+    for i in range(n):
+        sub, region = rnd.choice(subs)
+        if keys and rnd.random() < duplicates:
+            sub, lot = rnd.choice(keys)
+        else:
+            lot = next_lot[sub]
+            next_lot[sub] += 1
+            keys.append((sub, lot))
+        city, state, zipcode = rnd.choice(CITIES)
+        living = rnd.randint(1100, 4200)
+        tons = min(5.0, max(1.5, round(living / 550 * 2) / 2))
+        tdl = living * rnd.uniform(0.02, 0.1)
+        pdw = base + timedelta(days=rnd.randint(0, 900))
+        final = pdw + timedelta(days=rnd.randint(20, 90))
+        p = {'Region': region, 'Subdivision1': sub, 'Lot1': lot, 'StreetAddress': f"{rnd.randint(100, 9999)} {rnd.choice(STREETS)}",
+             'City': city, 'State': state, 'ZipCode': zipcode + rnd.randint(0, 20), 'Plan1': f"{rnd.choice('ABCDEF')}{rnd.randint(1, 4)}",
+             'Living': living, 'PermitNo1': f"BP-{pdw.year}-{i + 1:06d}",
+             'PDWCreated1': pdw, 'FinalCreatedDate': final, 'FinalizationDate': final + timedelta(days=rnd.randint(0, 5)),
+             'ConstCompleteDate': final - timedelta(days=rnd.randint(1, 10)), 'TargetClosingDate': final + timedelta(days=rnd.randint(10, 45)),
+             'ActualClosingDate': final + timedelta(days=rnd.randint(10, 60)),
+             'Super': rnd.choice(PEOPLE), 'Tech': rnd.choice(PEOPLE), 'RTIN': str(rnd.randint(1000000, 9999999)),
+             'PDWFails1': rnd.choice([0, 0, 0, 1, 2]), 'PassFail1': 'Fail' if rnd.random() < 0.12 else 'Pass',
+             'ElecOption': rnd.choice(['Gas', 'All Electric', 'Heat Pump']), 'SupplierName': rnd.choice(SUPPLIERS), 'Tonnage': tons,
+             'RefrigeratorModel': f"RF{rnd.randint(100, 999)}", 'RangeModel': f"RG{rnd.randint(100, 999)}",
+             'TDLCFM': round(tdl, 1), 'LTOCFM': round(tdl * rnd.uniform(0.2, 0.6), 1), 'BDCFM': round(rnd.uniform(2.5, 6.5) * living * 8 / 60),
+             'MVCFM': rnd.randint(30, 90), 'ReturnCount': rnd.randint(1, 4), 'ReturnIWC': round(rnd.uniform(0.05, 0.4), 3),
+             'SupplyIWC': round(rnd.uniform(0.1, 0.45), 3), 'BlowerCFM': round(tons * rnd.uniform(350, 420)),
+             'MeasuredCFM': round(tons * rnd.uniform(320, 450)), 'FWD': rnd.randint(150, 600), 'MeasuredWattage': rnd.randint(200, 700),
+             'Charge': round(rnd.uniform(-0.12, 0.12), 3), 'BathFan1CFM': rnd.randint(50, 110), 'BathFan2CFM': rnd.choice([None, rnd.randint(50, 110)]),
+             'BathFan3CFM': rnd.choice([None, None, rnd.randint(50, 110)]), 'BathFanPass': 'Fail' if rnd.random() < 0.05 else 'Pass'}
+        for field in DSLDSchema.ALL_FIELDS:
+            if rnd.random() < (missing / 5 if field in ('Subdivision1', 'Lot1') else missing):
+                p[field] = None
+        yield p
+
+
+def write_workbook(path, n, seed=7, **kw):
+    """SQL-export workbook (.xlsx, or .csv) with aliased headers and mixed blank/N/A/NULL missing cells."""
+    rnd = random.Random(seed + 1)
+    names = headers(rnd)
+    fields = DSLDSchema.ALL_FIELDS
+    cell = lambda v: rnd.choice(MISSING_CELLS) if v is None else v
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            out = csv.writer(f)
+            out.writerow([names[c] for c in fields])
+            for p in iter_rows(n, seed, **kw):
+                out.writerow(['' if v is None else v.isoformat() if isinstance(v, date) else v for v in map(cell, (p[c] for c in fields))])
+        return names
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('DSLD')
+    ws.append([names[c] for c in fields])
+    for p in iter_rows(n, seed, **kw):
+        ws.append([cell(p[c]) for c in fields])
+    wb.save(path)
+    return names
+
+
+REM_XML_FIELDS = {field: tag for tag, field in REMFileHandler.XML_MAP.items() if field not in REMFileHandler.XML_TEXT}
+
+
+STREET_SPELLINGS = {'St': 'Street', 'Ln': 'Lane', 'Dr': 'Drive', 'Blvd': 'Boulevard', 'Ct': 'Court', 'Rd': 'Road'}
+
+
+def rem_address(rnd, address):
+    """The workbook address the way a rater typed it: the suffix spelled out now and then, and a rare typo."""
+    if address and rnd.random() < 0.2:
+        number, _, street = address.rpartition(' ')
+        address = f"{number} {STREET_SPELLINGS.get(street, street)}"
+    if address and rnd.random() < 0.03:
+        i = rnd.randint(address.index(' ') + 2, len(address) - 1)
+        address = address[:i] + address[i + 1:]
+    return address
+
+
+def write_rem_xml(path, n, seed=7, identity=0.7, **kw):
+    """REM/Rate export: a Building (every tenth a Home) per project with its mapped values as direct
+    children and the static pressures and charge in a nested Rating. The address (rem_address) and
+    ZIP code are always written, subdivision/lot/permit only for an identity share of the buildings."""
+    rnd = random.Random(seed + 2)
+    rating = ('ReturnIWC', 'SupplyIWC', 'Charge')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" ?>\n<REMRateExport version="1.0" source="synthetic">\n')
+        for i, p in enumerate(iter_rows(n, seed, **kw)):
+            tag = 'Home' if rnd.random() < 0.1 else 'Building'
+            out = [f'  <{tag} id="{i + 1}">\n']
+            if p['StreetAddress']:
+                out.append(f"    <Address><Street>{escape(rem_address(rnd, p['StreetAddress']))}</Street><City>{escape(p['City'] or '')}</City>"
+                           f"<ZipCode>{p['ZipCode'] or ''}</ZipCode></Address>\n")
+            ids = (('Subdivision1', 'Subdivision'), ('Lot1', 'LotNumber'), ('PermitNo1', 'PermitNumber')) if rnd.random() < identity else ()
+            info = ''.join(f"<{t}>{escape(str(p[k]))}</{t}>" for k, t in ids if p[k] is not None)
+            if info:
+                out.append(f"    <BuildingInfo>{info}</BuildingInfo>\n")
+            out.extend(f"    <{t}>{p[k]}</{t}>\n" for k, t in REM_XML_FIELDS.items() if k not in rating and p[k] is not None)
+            nested = ''.join(f"<{REM_XML_FIELDS[k]}>{p[k]}</{REM_XML_FIELDS[k]}>" for k in rating if p[k] is not None)
+            if nested:
+                out.append(f"    <Rating>{nested}</Rating>\n")
+            out.append(f'  </{tag}>\n')
+            f.write(''.join(out))
+        f.write('</REMRateExport>\n')
+
+
+def write_rem_csv(path, n, seed=7, **kw):
+    """REM CSV in the layout export_to_rem_csv writes."""
+    fields = list(REMFileHandler.CSV_COLUMNS.values())
+    REMFileHandler.export_to_rem_csv([{f: p[f] for f in fields if p[f] is not None} for p in iter_rows(n, seed, **kw)], path)
+
+
+WRITERS = {'xlsx': write_workbook, 'csv': write_workbook, 'xml': write_rem_xml, 'rem.csv': write_rem_csv}
+
+
+def portfolio(out_dir, n, seed=7, formats=('xlsx', 'xml', 'rem.csv')):
+    """Write (or reuse) portfolio_<n>_<seed>.<format> files in out_dir; returns {format: path}."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for fmt in formats:
+        name = f"portfolio_{n}_{seed}.{fmt}"
+        path = paths[fmt] = os.path.join(out_dir, name)
+        if not os.path.exists(path):
+            tmp = os.path.join(out_dir, f".tmp_{name}")  # same extension: the writers go by it
+            WRITERS[fmt](tmp, n, seed)
+            os.replace(tmp, path)
+    return paths
+
+
+def make_projects(n, seed=7, **kw):
+    """A keyed ProjectStore of n synthetic projects, as the loader would build it (dates as YYYY-MM-DD)."""
+    projects = new_project_store()
+    rows = [{k: v.isoformat() if isinstance(v, date) else v for k, v in p.items() if v is not None} for p in iter_rows(n, seed, **kw)]
+    projects.update(ExcelLoader.assign_keys(rows)[0])
+    return projects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--out', default='.', help="output directory")
+    parser.add_argument('--formats', default='xlsx,xml,rem.csv', help=f"comma separated: {', '.join(WRITERS)}")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    for fmt, path in portfolio(args.out, args.rows, args.seed, args.formats.split(',')).items():
+        print(f"{fmt:>8} {path} ({os.path.getsize(path) / 2 ** 20:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,30 +6,275 @@ Features: All v8 features plus REM file import/export, 8 chart types, extended c
 
 pip install pandas openpyxl matplotlib requests reportlab pillow lxml
 python ekotrope_sync_v9.py
+
+Headless (no tkinter/matplotlib):
+python ekotrope_sync_v9.py --input export.xlsx --json homes.json --rem-xml rem.xml --report report.json
+
+Startup timing report: python ekotrope_sync_v9.py --startup-timing [report.json] [--startup-budget 1500]
+
+Upgrading: CHANGES.md lists exported IDs that changed and how to migrate homes already synced.
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
+import time
+_MODULE_START = time.perf_counter()
+
+import argparse
+import hashlib
+import importlib, importlib.util
+import re
 import json
-from datetime import datetime, timedelta
-import os, math
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import os, sys, math, numbers, shutil, functools
+import multiprocessing, queue, threading
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
-
-try:
-    import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
-
-try:
-    import matplotlib
-    matplotlib.use('TkAgg')
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.figure import Figure
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+
+_STDLIB_DONE = time.perf_counter()
+
+class StartupTimer:
+    """Import and UI build timings measured from module start; reported with --startup-timing."""
+    def __init__(self, start):
+        self.start = start
+        self.entries = []
+        self.enabled = False
+        self.output = None
+        self.budget_ms = None
+        self.reported = False
+    
+    def record(self, name, began, ended=None):
+        ended = time.perf_counter() if ended is None else ended
+        entry = {'name': name, 'ms': round((ended - began) * 1000, 1), 'at_ms': round((began - self.start) * 1000, 1)}
+        self.entries.append(entry)
+        if self.enabled and self.reported:
+            print(f"[startup] {name}: {entry['ms']:.1f} ms (deferred, at +{entry['at_ms']:.0f} ms)")
+    
+    @contextmanager
+    def measure(self, name):
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, began)
+    
+    def import_module(self, name):
+        with self.measure(f"import {name}"):
+            return importlib.import_module(name)
+    
+    def report(self, label='ready'):
+        """Print the report (and save it as JSON when a path was given); returns the summary dict."""
+        total_ms = round((time.perf_counter() - self.start) * 1000, 1)
+        summary = {'label': label, 'total_ms': total_ms, 'budget_ms': self.budget_ms, 'entries': list(self.entries),
+                   'over_budget': bool(self.budget_ms and total_ms > self.budget_ms)}
+        self.reported = True
+        if not self.enabled:
+            return summary
+        print(f"Startup timing (module start -> {label})")
+        for e in self.entries:
+            print(f"  {e['name']:<32} {e['ms']:>9.1f} ms   at +{e['at_ms']:.0f} ms")
+        print(f"  {'TOTAL':<32} {total_ms:>9.1f} ms")
+        if self.budget_ms:
+            print(f"  budget {self.budget_ms:.0f} ms: {'OVER' if summary['over_budget'] else 'OK'}")
+        if self.output and self.output != '-':
+            with open(self.output, 'w') as f: json.dump(summary, f, indent=2)
+        return summary
+
+STARTUP = StartupTimer(_MODULE_START)
+STARTUP.record('import stdlib', _MODULE_START, _STDLIB_DONE)
+
+class _Span:
+    """One PerfMonitor.measure() block; set .rows inside it when the row count is only known at the end."""
+    __slots__ = ('monitor', 'name', 'rows', 'began', 'memory')
+    def __init__(self, monitor, name, rows):
+        self.monitor, self.name, self.rows = monitor, name, rows
+    def __enter__(self):
+        self.memory = self.monitor._memory_start()
+        self.began = time.perf_counter()
+        return self
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.began
+        self.monitor.add(self.name, elapsed, self.rows, self.monitor._memory_end(self.memory))
+        return False
+
+class _NullSpan:
+    rows = None
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+class PerfMonitor:
+    """Timings and counters for the slow paths (load, validation, compliance, exports, charts), shown in the
+    Diagnostics tab and by --perf. Disabled, measure() returns a shared no-op span and iterate() the iterable
+    itself, so the hooks cost an attribute check. Per name it keeps calls, total/last/max ms, rows and the
+    last rows/second; with track_memory also the tracemalloc peak above the start of the outermost span in
+    each thread (concurrent jobs share the one tracer, so treat overlapping peaks as approximate)."""
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.output = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.stats, self.counters = {}, {}
+    
+    def measure(self, name, rows=None):
+        return _Span(self, name, rows) if self.enabled else _NULL_SPAN
+    
+    def timed(self, name, rows=None):
+        """Decorator form of measure(); rows(result) gives the row count."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                if not self.enabled: return fn(*args, **kwargs)
+                with self.measure(name) as span:
+                    result = fn(*args, **kwargs)
+                    if rows: span.rows = rows(result)
+                return result
+            return call
+        return wrap
+    
+    def iterate(self, name, iterable, rows=len):
+        """Wrap a producer (e.g. a chunk generator): only the time spent producing items is recorded,
+        as one call once it is exhausted or closed, with rows(item) summed. The memory peak covers the
+        whole iteration, consumer included."""
+        return self._iterate(name, iterable, rows) if self.enabled else iterable
+    
+    def _iterate(self, name, iterable, rows):
+        elapsed, count, it = 0.0, 0, iter(iterable)
+        memory = self._memory_start()
+        try:
+            while True:
+                began = time.perf_counter()
+                item = next(it, _MISSING)
+                elapsed += time.perf_counter() - began
+                if item is _MISSING: return
+                count += rows(item)
+                yield item
+        finally:
+            self.add(name, elapsed, count, self._memory_end(memory))
+    
+    def count(self, name, n=1):
+        if not self.enabled: return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+    
+    def add(self, name, seconds, rows=None, peak_bytes=None):
+        ms = seconds * 1000
+        with self._lock:
+            s = self.stats.get(name)
+            if s is None:
+                s = self.stats[name] = {'calls': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'rows_per_s': None, 'peak_mb': None}
+            s['calls'] += 1
+            s['total_ms'] += ms
+            s['last_ms'] = ms
+            s['max_ms'] = max(s['max_ms'], ms)
+            if rows is not None:
+                s['rows'] += rows
+                s['rows_per_s'] = rows / seconds if seconds > 0 else None
+            if peak_bytes is not None:
+                s['peak_mb'] = max(s['peak_mb'] or 0.0, peak_bytes / 1e6)
+    
+    def set_track_memory(self, on):
+        import tracemalloc
+        self.track_memory = on
+        if on and not tracemalloc.is_tracing(): tracemalloc.start()
+        elif not on and tracemalloc.is_tracing(): tracemalloc.stop()
+    
+    def _memory_start(self):
+        if not self.track_memory: return None
+        import tracemalloc
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth or not tracemalloc.is_tracing(): return -1  # nested: the outer span owns the peak
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+    
+    def _memory_end(self, start):
+        if start is None: return None
+        import tracemalloc
+        self._local.depth -= 1
+        if start < 0 or not tracemalloc.is_tracing(): return None
+        return tracemalloc.get_traced_memory()[1] - start
+    
+    def summary(self):
+        with self._lock:
+            stats = {name: dict(s) for name, s in self.stats.items()}
+            counters = dict(self.counters)
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            process_peak_mb = peak / 1e6 if sys.platform == 'darwin' else peak / 1e3  # bytes on macOS, KiB elsewhere
+        except ImportError:
+            process_peak_mb = None
+        return {'generated': datetime.now().isoformat(), 'track_memory': self.track_memory, 'process_peak_mb': process_peak_mb,
+                'spans': stats, 'counters': counters}
+    
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+    
+    def report(self, out=None):
+        """Print the table (and save JSON when output is a path); returns the summary dict."""
+        out = out or sys.stdout
+        summary = self.summary()
+        print(f"{'Timing':<36} {'calls':>6} {'total ms':>10} {'last ms':>9} {'rows':>9} {'rows/s':>10} {'peak MB':>8}", file=out)
+        for name, s in sorted(summary['spans'].items(), key=lambda kv: -kv[1]['total_ms']):
+            rate = f"{s['rows_per_s']:,.0f}" if s['rows_per_s'] else ''
+            peak = f"{s['peak_mb']:.1f}" if s['peak_mb'] is not None else ''
+            print(f"  {name:<34} {s['calls']:>6} {s['total_ms']:>10.1f} {s['last_ms']:>9.1f} {s['rows'] or '':>9} {rate:>10} {peak:>8}", file=out)
+        for name, n in sorted(summary['counters'].items()):
+            print(f"  {name:<34} {n:>6}", file=out)
+        if summary['process_peak_mb']:
+            print(f"  process peak RSS {summary['process_peak_mb']:.0f} MB", file=out)
+        if self.output and self.output != '-':
+            self.dump(self.output)
+        return summary
+
+_NULL_SPAN = _NullSpan()
+PERF = PerfMonitor()
+
+class _LazyModule:
+    """Placeholder for a heavy module: imported on first attribute access, then rebound as the module global."""
+    def __init__(self, name, alias):
+        self._name, self._alias = name, alias
+    def __getattr__(self, attr):
+        module = STARTUP.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+# pandas/numpy are only imported by the first Excel load, REM CSV or compliance batch
+HAS_PANDAS = importlib.util.find_spec('pandas') is not None and importlib.util.find_spec('numpy') is not None
+pd = _LazyModule('pandas', 'pd')
+np = _LazyModule('numpy', 'np')
+
+# GUI modules are bound by load_gui_modules() so the headless CLI never imports tkinter or matplotlib
+tk = ttk = filedialog = messagebox = simpledialog = None
+FigureCanvasTkAgg = Figure = None
+HAS_MATPLOTLIB = False
+
+def load_gui_modules():
+    global tk, ttk, filedialog, messagebox, simpledialog, HAS_MATPLOTLIB
+    with STARTUP.measure('import tkinter'):
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox, simpledialog
+    HAS_MATPLOTLIB = importlib.util.find_spec('matplotlib') is not None
+
+def load_matplotlib():
+    """Import matplotlib with the TkAgg backend on the first chart draw."""
+    global FigureCanvasTkAgg, Figure, HAS_MATPLOTLIB
+    if Figure is not None: return True
+    try:
+        with STARTUP.measure('import matplotlib (TkAgg)'):
+            import matplotlib
+            matplotlib.use('TkAgg')
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+    except ImportError:
+        HAS_MATPLOTLIB = False
+    return HAS_MATPLOTLIB
 
 CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".dsld_ekotrope")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
@@ -48,13 +293,694 @@ class DSLDSchema:
     AIRFLOW_FIELDS = ['ReturnIWC', 'SupplyIWC', 'BlowerCFM', 'MeasuredCFM', 'FWD', 'MeasuredWattage', 'Charge']
     BATH_FAN_FIELDS = ['BathFan1CFM', 'BathFan2CFM', 'BathFan3CFM', 'BathFanPass']
     ALL_FIELDS = PROJECT_FIELDS + DATE_FIELDS + PERSONNEL_FIELDS + STATUS_FIELDS + HVAC_FIELDS + DUCT_FIELDS + AIRFLOW_FIELDS + BATH_FAN_FIELDS
+    NUMERIC_FIELDS = ['Living', 'Tonnage', 'TDLCFM', 'LTOCFM', 'BDCFM', 'MVCFM', 'ReturnCount', 'ReturnIWC', 'SupplyIWC', 'BlowerCFM',
+                      'MeasuredCFM', 'FWD', 'MeasuredWattage', 'Charge', 'BathFan1CFM', 'BathFan2CFM', 'BathFan3CFM']
     
     @classmethod
     def get_template_fields(cls):
         return cls.PROJECT_FIELDS + ['PermitNo1', 'RTIN']
 
+# Numeric cell states in ProjectStore: key not in the project, key present with None, float value, int value
+_ABSENT, _NULL, _VALUE, _INT = 0, 1, 2, 3
+_MISSING = object()
+
+class _NumericColumn:
+    """float64 values + one state byte per cell (which also flags ints, so row views hand them back as ints).
+    Values that are not numbers are kept in `other` and read as missing by numeric()."""
+    def __init__(self, capacity):
+        self.values = np.full(capacity, np.nan)
+        self.state = np.zeros(capacity, dtype=np.int8)
+        self.other = {}
+    
+    def grow(self, capacity):
+        n = len(self.state)
+        self.values = np.concatenate([self.values, np.full(capacity - n, np.nan)])
+        self.state = np.concatenate([self.state, np.zeros(capacity - n, dtype=np.int8)])
+    
+    def put(self, start, vals, rows=None):
+        """Write vals into rows start, start + 1, ... (or into the given row numbers)."""
+        states, floats = [], []
+        for j, v in zip(range(start, start + len(vals)) if rows is None else rows, vals):
+            if self.other: self.other.pop(j, None)
+            if v is _MISSING or v is None:
+                states.append(_ABSENT if v is _MISSING else _NULL); floats.append(math.nan)
+            elif type(v) is float:
+                states.append(_VALUE); floats.append(v)
+            elif isinstance(v, numbers.Integral) and not isinstance(v, bool) and abs(v) < 2 ** 53:
+                states.append(_INT); floats.append(float(v))
+            elif isinstance(v, numbers.Real) and not isinstance(v, (bool, numbers.Integral)):
+                states.append(_VALUE); floats.append(float(v))
+            else:
+                states.append(_VALUE); floats.append(math.nan)
+                self.other[j] = v
+        target = slice(start, start + len(states)) if rows is None else rows
+        self.state[target] = states
+        self.values[target] = floats
+    
+    def has(self, i): return self.state[i] != _ABSENT
+    
+    def get(self, i):
+        state = self.state[i]
+        if state == _INT: return int(self.values[i])
+        if state != _VALUE: return None
+        if self.other and i in self.other: return self.other[i]
+        return float(self.values[i])
+    
+    def present(self, n): return self.state[:n] != _ABSENT
+    
+    def tolist(self, n):
+        """[get(i) for i in range(n)], converted a column at a time."""
+        state = self.state[:n]
+        out = self.values[:n].tolist()
+        for i in np.flatnonzero(state == _INT).tolist(): out[i] = int(out[i])
+        for i in np.flatnonzero(state < _VALUE).tolist(): out[i] = None
+        for i, v in self.other.items():
+            if i < n: out[i] = v
+        return out
+    
+    def valid(self, n):
+        mask = self.state[:n] >= _VALUE
+        if self.other:
+            mask[[i for i in self.other if i < n]] = False
+        return mask
+
+class _CodedColumn:
+    """Dictionary-encoded column: codes into `categories`, each distinct value stored once.
+    Code -1 is None and -2 means the key is absent; codes start as int16 and widen when needed."""
+    def __init__(self, capacity):
+        self.codes = np.full(capacity, -2, dtype=np.int16)
+        self.categories = []
+        self.lookup = {}
+    
+    def grow(self, capacity):
+        n = len(self.codes)
+        self.codes = np.concatenate([self.codes, np.full(capacity - n, -2, dtype=self.codes.dtype)])
+    
+    def encode(self, v):
+        key = (type(v), v)  # keep 1, 1.0 and True apart
+        code = self.lookup.get(key)
+        if code is None:
+            code = self.lookup[key] = len(self.categories)
+            self.categories.append(v)
+            if code == np.iinfo(self.codes.dtype).max:
+                self.codes = self.codes.astype(np.int32)
+        return code
+    
+    def put(self, start, vals, rows=None):
+        encode = self.encode
+        codes = [-2 if v is _MISSING else -1 if v is None else encode(v) for v in vals]
+        self.codes[slice(start, start + len(codes)) if rows is None else rows] = codes
+    
+    def has(self, i): return self.codes[i] != -2
+    
+    def get(self, i):
+        code = self.codes[i]
+        return self.categories[code] if code >= 0 else None
+    
+    def present(self, n): return self.codes[:n] != -2
+
+class ProjectRow(Mapping):
+    """Read/write dict-like view of one ProjectStore row, for code written against plain project dicts."""
+    __slots__ = ('_store', '_row')
+    def __init__(self, store, row):
+        self._store, self._row = store, row
+    def __getitem__(self, field):
+        col = self._store._columns.get(field)
+        if col is None or not col.has(self._row): raise KeyError(field)
+        return col.get(self._row)
+    def get(self, field, default=None):
+        col = self._store._columns.get(field)
+        if col is None or not col.has(self._row): return default
+        return col.get(self._row)
+    def __iter__(self):
+        row = self._row
+        return iter([name for name, col in self._store._columns.items() if col.has(row)])
+    def __len__(self):
+        return sum(1 for _ in self)
+    def __bool__(self):
+        row = self._row
+        return any(col.has(row) for col in self._store._columns.values())
+    def __setitem__(self, field, value):
+        self._store.set_field(self._row, field, value)
+    def __repr__(self):
+        return f"ProjectRow({dict(self)!r})"
+
+class ProjectStore(Mapping):
+    """Projects keyed like the old all_projects dict, stored column-wise with a fixed schema:
+    DSLDSchema.NUMERIC_FIELDS as float64 arrays with null masks, every other field (text, dates,
+    and extra export columns) dictionary-encoded. Indexing by key returns a ProjectRow view;
+    numeric()/coded() expose the contiguous columns to vectorized code."""
+    def __init__(self, projects=None):
+        self.clear()
+        if projects:
+            self.update(projects)
+    
+    def clear(self):
+        self._capacity = 1024
+        self._n = 0
+        self._keys = []
+        self._index = {}
+        self._columns = {}
+        for f in DSLDSchema.ALL_FIELDS:
+            self._columns[f] = (_NumericColumn if f in DSLDSchema.NUMERIC_FIELDS else _CodedColumn)(self._capacity)
+        self.edits = []  # (row, field) of in-place changes, field None for a whole row; read by ProjectIndex
+        self.version = getattr(self, 'version', 0) + 1
+    
+    def _reserve(self, extra):
+        needed = self._n + extra
+        if needed <= self._capacity: return
+        self._capacity = max(needed, self._capacity * 2)
+        for col in self._columns.values():
+            col.grow(self._capacity)
+    
+    def _column(self, field):
+        col = self._columns.get(field)
+        if col is None:
+            col = self._columns[field] = _CodedColumn(self._capacity)
+        return col
+    
+    def __len__(self): return self._n
+    def __iter__(self): return iter(self._keys)
+    def __contains__(self, key): return key in self._index
+    def __getitem__(self, key): return ProjectRow(self, self._index[key])
+    def row(self, i): return ProjectRow(self, i)
+    def row_of(self, key): return self._index.get(key)
+    def key_at(self, i): return self._keys[i]
+    
+    def __setitem__(self, key, project):
+        self.update({key: project})
+    
+    def update(self, projects):
+        """Add or replace projects from a {key: dict} mapping; new keys are appended column-wise."""
+        items = projects.items() if hasattr(projects, 'items') else projects
+        new, replaced = {}, []
+        for key, p in items:
+            p = dict(p) if p else {}
+            if key in self._index:
+                replaced.append((self._index[key], p))
+            elif key in new:
+                new[key] = p  # same key twice in one batch: last wins, as with dict.update
+            else:
+                new[key] = p
+        if new:
+            self._reserve(len(new))
+            start, rows = self._n, list(new.values())
+            fields = set()  # appended slots start out absent, so only fields these rows carry are written
+            for p in rows:
+                fields.update(p)
+            for f in fields:
+                self._column(f).put(start, [p.get(f, _MISSING) for p in rows])
+            for i, key in enumerate(new, start):
+                self._index[key] = i
+                self._keys.append(key)
+            self._n += len(rows)
+        for i, p in replaced:
+            for f in set(self._columns) | set(p):
+                self._column(f).put(i, [p.get(f, _MISSING)])
+            self.edits.append((i, None))
+        self.version += 1
+    
+    def set_field(self, row, field, value):
+        self._column(field).put(row, [value])
+        self.edits.append((row, field))
+        self.version += 1
+    
+    def set_rows(self, field, rows, values):
+        """set_field() for many rows of one field in a single column write."""
+        self._column(field).put(0, values, rows)
+        self.edits.extend((row, field) for row in rows)
+        self.version += 1
+    
+    def save(self, path):
+        """Write the store into directory path: one .npy file per column array plus meta.json
+        (keys, column kinds, categories and the non-numeric cells of numeric columns)."""
+        os.makedirs(path, exist_ok=True)
+        n = self._n
+        meta = {'n': n, 'keys': self._keys, 'columns': []}
+        for j, (name, col) in enumerate(self._columns.items()):
+            if isinstance(col, _NumericColumn):
+                np.save(os.path.join(path, f"{j}.values.npy"), col.values[:n])
+                np.save(os.path.join(path, f"{j}.state.npy"), col.state[:n])
+                meta['columns'].append({'name': name, 'kind': 'numeric', 'other': [[i, v] for i, v in col.other.items() if i < n]})
+            else:
+                np.save(os.path.join(path, f"{j}.codes.npy"), col.codes[:n])
+                meta['columns'].append({'name': name, 'kind': 'coded', 'categories': col.categories})
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+    
+    @classmethod
+    def load(cls, path, mmap_mode='c'):
+        """Store written by save(). The column files are memory-mapped copy-on-write, so opening is
+        cheap and edits never reach the files."""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        store = cls.__new__(cls)
+        store.version = 1
+        store.edits = []
+        store._n = store._capacity = meta['n']
+        store._keys = meta['keys']
+        store._index = {key: i for i, key in enumerate(store._keys)}
+        store._columns = {}
+        array = lambda j, part: np.load(os.path.join(path, f"{j}.{part}.npy"), mmap_mode=mmap_mode)
+        for j, c in enumerate(meta['columns']):
+            if c['kind'] == 'numeric':
+                col = _NumericColumn.__new__(_NumericColumn)
+                col.values, col.state = array(j, 'values'), array(j, 'state')
+                col.other = {i: v for i, v in c['other']}
+            else:
+                col = _CodedColumn.__new__(_CodedColumn)
+                col.codes, col.categories = array(j, 'codes'), c['categories']
+                col.lookup = {(type(v), v): i for i, v in enumerate(col.categories)}
+            store._columns[c['name']] = col
+        return store
+    
+    def fields(self):
+        return list(self._columns)
+    
+    def numeric(self, field):
+        """(float64 values, valid mask) for the first len(self) rows; missing or non-numeric cells are invalid."""
+        col = self._columns.get(field)
+        if not isinstance(col, _NumericColumn):
+            values = np.full(self._n, np.nan)
+            valid = np.zeros(self._n, dtype=bool)
+            if col is not None:
+                for i in range(self._n):
+                    v = col.get(i)
+                    if isinstance(v, numbers.Real) and not isinstance(v, bool):
+                        values[i], valid[i] = v, True
+            return values, valid
+        return col.values[:self._n], col.valid(self._n)
+    
+    def coded(self, field):
+        """(codes, categories) for a dictionary-encoded field; negative codes are missing (-1 None, -2 absent)."""
+        col = self._columns.get(field)
+        if col is None:
+            return np.full(self._n, -2, dtype=np.int16), []
+        if isinstance(col, _NumericColumn):
+            tmp = _CodedColumn(self._n)
+            tmp.put(0, [col.get(i) if col.has(i) else _MISSING for i in range(self._n)])
+            col = tmp
+        return col.codes[:self._n], col.categories
+    
+    def values_of(self, field):
+        """Python values of one field in row order (None when missing)."""
+        col = self._columns.get(field)
+        if col is None: return [None] * self._n
+        if isinstance(col, _CodedColumn):
+            cats = col.categories + [None, None]  # codes -2/-1 -> None
+            return [cats[c] for c in col.codes[:self._n].tolist()]
+        return col.tolist(self._n)
+    
+    def _lookup_index(self, codes, categories):
+        # codes -> positions in categories + [absent, None]
+        return np.where(codes >= 0, codes, np.where(codes == -2, len(categories), len(categories) + 1))
+    
+    def match(self, field, predicate, default=None):
+        """Row mask of predicate(row.get(field, default)); the predicate runs once per distinct value."""
+        codes, categories = self.coded(field)
+        lut = np.array([bool(predicate(v)) for v in categories] + [bool(predicate(default)), bool(predicate(None))], dtype=bool)
+        return lut[self._lookup_index(codes, categories)]
+    
+    def distinct(self, field, default=None, mask=None):
+        """Distinct values of row.get(field, default) over the rows in mask (all rows if None)."""
+        codes, categories = self.coded(field)
+        if mask is not None: codes = codes[mask]
+        values = categories + [default, None]
+        return [values[i] for i in np.unique(self._lookup_index(codes, categories)).tolist()]
+    
+    def nonempty(self):
+        mask = np.zeros(self._n, dtype=bool)
+        for col in self._columns.values():
+            mask |= col.present(self._n)
+        return mask
+
+class ProjectIndex:
+    """Compound filters over a ProjectStore. Categorical fields get an inverted index (sorted codes ->
+    rows) and numeric/date fields a sorted index. Each is built on first use, then patched for rows
+    appended or edited since (the store's edit log) and rebuilt once more than REBUILD_FRACTION of
+    the rows have changed. Conditions are (field, op, value) tuples, combined with AND:
+        ('Subdivision1', 'in', ['Oak Park', 'Pine'])   text match ignoring case; also 'not in'
+        ('TDLCFM', '>', 300) / ('TDLCFM', '>', 'TDLAllowable')   number or another numeric field
+        ('Living', 'between', (1500, 2500))
+        ('TargetClosingDate', 'within', 14)   today .. 14 days ahead; negative looks back
+    Missing values never match."""
+    CATEGORICAL = ['Region', 'Subdivision1', 'Plan1', 'Super', 'Tech', 'SupplierName', 'PassFail1', 'RatingType']
+    DATES = DSLDSchema.DATE_FIELDS
+    DERIVED = {'TDLAllowable': ['Living', 'ReturnCount'], 'LTOAllowable': ['Living'], 'RatingType': ['FinalCreatedDate', 'PassFail1']}
+    NUMERIC = DSLDSchema.NUMERIC_FIELDS + ['TDLAllowable', 'LTOAllowable']
+    OPS = ['not in', 'in', 'within', 'between', '>=', '<=', '==', '!=', '>', '<']
+    REBUILD_FRACTION = 0.05
+    
+    def __init__(self, store):
+        self.store = store
+        self._indexes = {}  # field -> (rows covered, edit log position, index data)
+        self._edits = store.edits
+        self._labels = {}
+    
+    @classmethod
+    def fields(cls):
+        return cls.CATEGORICAL + [f for f in cls.NUMERIC if f not in cls.CATEGORICAL] + cls.DATES
+    
+    # --- column access: categorical -> (codes, labels), numeric/date -> float64 with NaN missing
+    
+    def _categorical(self, field, rows=None):
+        if field == 'RatingType':
+            codes, categories = self.store.coded('PassFail1')
+            passed = np.array([str(v).lower() == 'pass' for v in categories] + [False, False], dtype=bool)
+            final = self.store.coded('FinalCreatedDate')[0]
+            if rows is not None: codes, final = codes[rows], final[rows]
+            # RatingType.determine: Confirmed needs a final date and a pass
+            return (passed[codes] & (final >= 0)).astype(np.int8), ['projected', 'confirmed']
+        codes, categories = self.store.coded(field)
+        labels = self._labels.get(field)
+        if labels is None or len(labels) != len(categories):
+            labels = self._labels[field] = [str(v).strip().lower() for v in categories]
+        return (codes if rows is None else codes[rows]), labels
+    
+    def _numeric(self, field, rows=None):
+        if field in ('TDLAllowable', 'LTOAllowable'):
+            living = self._numeric('Living', rows)
+            living = np.where(living > 0, living, np.nan)
+            if field == 'LTOAllowable':
+                return np.maximum((living / 100) * 4.0, 40.0)
+            fn41 = np.nan_to_num(self._numeric('ReturnCount', rows)) >= 3
+            return np.maximum((living / 100) * np.where(fn41, 12.0, 8.0), np.where(fn41, 120.0, 80.0))
+        if field in self.DATES:
+            codes, categories = self.store.coded(field)
+            days = np.array([self._day(v) for v in categories] + [np.nan, np.nan])
+            return days[codes if rows is None else codes[rows]]
+        values, valid = self.store.numeric(field)
+        if rows is not None: values, valid = values[rows], valid[rows]
+        return np.where(valid, values, np.nan)
+    
+    @staticmethod
+    def _day(value):
+        try:
+            return float(date.fromisoformat(str(value)[:10]).toordinal())
+        except ValueError:
+            return np.nan
+    
+    # --- index maintenance
+    
+    def _index(self, field):
+        n = len(self.store)
+        if self.store.edits is not self._edits:
+            self._indexes, self._labels, self._edits = {}, {}, self.store.edits  # store was cleared
+        entry = self._indexes.get(field)
+        if entry is not None:
+            built, pos, data = entry
+            deps = set(self.DERIVED.get(field, [field]))
+            dirty = {r for r, f in self._edits[pos:] if r < built and (f is None or f in deps)}
+            if len(dirty) + n - built <= self.REBUILD_FRACTION * max(n, 1):
+                extra = np.arange(built, n)
+                return data, np.concatenate([np.fromiter(dirty, dtype=np.int64, count=len(dirty)), extra]) if dirty else extra
+        if field in self.CATEGORICAL:
+            codes = self._categorical(field)[0]
+            order = np.argsort(codes, kind='stable')
+            data = (order, codes[order])
+        else:
+            values = self._numeric(field)
+            order = np.argsort(values, kind='stable')  # NaN sorts last
+            count = int(np.count_nonzero(~np.isnan(values)))
+            data = (order[:count], values[order[:count]])
+        self._indexes[field] = (n, len(self._edits), data)
+        return data, np.arange(n, n)
+    
+    # --- queries
+    
+    def select(self, conditions, mask=None):
+        """Row mask of the rows matching every condition, optionally within mask."""
+        result = np.ones(len(self.store), dtype=bool) if mask is None else mask.copy()
+        # Index lookups first; field-to-field comparisons then only read the rows still in the running
+        deferred = [c for c in conditions if self._is_column_compare(*c)]
+        for field, op, value in conditions:
+            if (field, op, value) not in deferred:
+                result &= self._condition(field, op, value)
+        for field, op, value in deferred:
+            rows = np.flatnonzero(result)
+            with np.errstate(invalid='ignore'):
+                result[rows] = self._compare(self._numeric(field, rows), op, self._numeric(value, rows))
+        return result
+    
+    def keys(self, conditions):
+        """Keys of the non-empty projects matching conditions, in load order."""
+        mask = self.select(conditions, self.store.nonempty())
+        return [self.store.key_at(i) for i in np.flatnonzero(mask).tolist()]
+    
+    def _condition(self, field, op, value):
+        if field not in self.DERIVED and field not in self.store.fields():
+            raise Exception(f"Unknown field: {field}")
+        if op not in self.OPS:
+            raise Exception(f"Unknown operator: {op}")
+        n = len(self.store)
+        categorical = field in self.CATEGORICAL or (field not in self.NUMERIC and field not in self.DATES)
+        if op not in (('in', 'not in', '==', '!=') if categorical else ('within', 'between', '>=', '<=', '==', '!=', '>', '<')):
+            raise Exception(f"'{op}' does not apply to {field}")
+        if categorical:
+            targets = {str(v).strip().lower() for v in (value if isinstance(value, (list, tuple, set)) else [value])}
+            negate = op in ('not in', '!=')
+            if field not in self.CATEGORICAL:  # not indexed: scan the codes
+                codes, labels = self._categorical(field)
+                return self._label_match(codes, labels, targets, negate)
+            (order, sorted_codes), dirty = self._index(field)
+            labels = self._categorical(field)[1]
+            mask = np.zeros(n, dtype=bool)
+            for code in [c for c, label in enumerate(labels) if (label in targets) != negate]:
+                mask[order[np.searchsorted(sorted_codes, code):np.searchsorted(sorted_codes, code, side='right')]] = True
+            if len(dirty):
+                codes, labels = self._categorical(field, dirty)
+                mask[dirty] = self._label_match(codes, labels, targets, negate)
+            return mask
+        if self._is_column_compare(field, op, value):
+            with np.errstate(invalid='ignore'):
+                return self._compare(self._numeric(field), op, self._numeric(value))
+        try:
+            lo, hi, lo_side, hi_side = self._bounds(field, op, value)
+        except (TypeError, ValueError):
+            raise Exception(f"Not a number/date or numeric field for {field}: {value}")
+        (order, sorted_values), dirty = self._index(field)
+        mask = np.zeros(n, dtype=bool)
+        if op == '!=':
+            mask[order] = True
+            mask[order[np.searchsorted(sorted_values, lo, 'left'):np.searchsorted(sorted_values, hi, 'right')]] = False
+        else:
+            mask[order[np.searchsorted(sorted_values, lo, lo_side):np.searchsorted(sorted_values, hi, hi_side)]] = True
+        if len(dirty):
+            values = self._numeric(field, dirty)
+            with np.errstate(invalid='ignore'):
+                mask[dirty] = self._compare(values, '!=', lo) if op == '!=' else \
+                              self._compare(values, '>=' if lo_side == 'left' else '>', lo) & self._compare(values, '<=' if hi_side == 'right' else '<', hi)
+        return mask
+    
+    def _is_column_compare(self, field, op, value):
+        """Field against field, e.g. TDLCFM > TDLAllowable: evaluated over the columns, nothing to look up."""
+        numeric = field in self.NUMERIC or field in self.DATES
+        return numeric and isinstance(value, str) and (value in self.NUMERIC or value in self.DATES) and op in ('>', '>=', '<', '<=', '==', '!=')
+    
+    @staticmethod
+    def _label_match(codes, labels, targets, negate):
+        lut = np.array([(label in targets) != negate for label in labels] + [False, False], dtype=bool)
+        return lut[codes]
+    
+    def _bounds(self, field, op, value):
+        """(lo, hi, lo side, hi side) for searchsorted: 'left' at lo includes it, 'right' at hi includes it."""
+        if op == 'within':
+            today = float(date.today().toordinal())
+            lo, hi = sorted((today, today + float(value)))
+            return lo, hi, 'left', 'right'
+        if field in self.DATES:
+            value = [self._day(v) for v in value] if op == 'between' else self._day(value)
+        if op == 'between':
+            lo, hi = sorted(float(v) for v in value)
+            return lo, hi, 'left', 'right'
+        value = float(value)
+        return {'>': (value, np.inf, 'right', 'right'), '>=': (value, np.inf, 'left', 'right'),
+                '<': (-np.inf, value, 'left', 'left'), '<=': (-np.inf, value, 'left', 'right'),
+                '==': (value, value, 'left', 'right'), '!=': (value, value, 'left', 'right')}[op]
+    
+    @staticmethod
+    def _compare(a, op, b):
+        if op == '!=': return (a != b) & ~np.isnan(a) & ~np.isnan(b)
+        return {'>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal, '==': np.equal}[op](a, b)
+    
+    @classmethod
+    def parse(cls, text):
+        """Conditions from 'field op value; ...', e.g.
+        Subdivision1 in Oak Park, Pine; TargetClosingDate within 14; TDLCFM > TDLAllowable"""
+        conditions = []
+        pattern = re.compile(r'^\s*(\w+)\s*(' + '|'.join(re.escape(op) for op in cls.OPS) + r')\s*(.+?)\s*$', re.IGNORECASE)
+        for clause in filter(str.strip, text.split(';')):
+            m = pattern.match(clause)
+            if not m: raise Exception(f"Cannot read filter: {clause.strip()}")
+            field, op, raw = m.group(1), m.group(2).lower(), m.group(3)
+            if op in ('in', 'not in') or field in cls.CATEGORICAL or (field not in cls.NUMERIC and field not in cls.DATES):
+                value = [v.strip() for v in raw.split(',')]  # text fields compare as text: Lot1 == 012
+            elif op == 'between':
+                value = [cls._number(v) for v in re.split(r'\s*(?:,|\.\.|\band\b)\s*', raw) if v]
+                if len(value) != 2: raise Exception(f"between needs two values: {clause.strip()}")
+            else:
+                value = cls._number(raw)
+            conditions.append((field, op, value))
+        return conditions
+    
+    @staticmethod
+    def _number(text):
+        text = text.strip()
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+def new_project_store():
+    """ProjectStore when numpy is available, else the plain dict the app used before."""
+    return ProjectStore() if HAS_PANDAS else {}
+
+MERGE_POLICIES = ['replace', 'keep', 'report']
+
+def merge_projects(target, projects, policy='replace'):
+    """Merge {key: project} (or (key, project) pairs) into target, a ProjectStore or dict. A key already in
+    target is a collision: 'replace' overwrites it, 'keep' leaves the project there, and 'report' merges
+    nothing at all when there is one. A key repeated within the batch is a duplicate, not a collision: the
+    later project wins. Returns the added/replaced/kept/collisions/duplicates key lists."""
+    if policy not in MERGE_POLICIES:
+        raise Exception(f"Unknown merge policy: {policy} (expected one of {', '.join(MERGE_POLICIES)})")
+    items = projects.items() if hasattr(projects, 'items') else projects
+    batch, seen, collisions, duplicates = {}, set(), {}, {}
+    for key, p in items:
+        if key in seen: duplicates[key] = True
+        seen.add(key)
+        if key in target:
+            collisions[key] = True
+            if policy == 'keep': continue
+        batch[key] = p
+    result = {'added': [k for k in batch if k not in target], 'replaced': [], 'kept': [], 'collisions': list(collisions),
+              'duplicates': list(duplicates)}
+    if policy == 'report' and collisions:
+        result['added'] = []
+        return result
+    result['replaced' if policy == 'replace' else 'kept'] = result['collisions']
+    target.update(batch)
+    return result
+
+class ProjectCache:
+    """Loaded Excel/CSV exports kept under CONFIG_DIR/project_cache as ProjectStore.save() directories,
+    so reopening an unchanged workbook maps its columns back instead of parsing it again. Entries are
+    named by content hash; index.json maps path|size|mtime to that hash, so only a file whose stat
+    changed is hashed. Least recently used entries are removed once the cache passes max_mb."""
+    FORMAT = 3  # 2: numeric and date fields typed at load (FieldCoercer); 3: other schema fields as text
+    
+    def __init__(self, root=None, max_mb=500):
+        self.root = root or os.path.join(CONFIG_DIR, 'project_cache')
+        self.max_bytes = max_mb * 2 ** 20
+        self._digests = {}
+    
+    @staticmethod
+    def stat_key(filepath):
+        st = os.stat(filepath)
+        return f"{os.path.abspath(filepath)}|{st.st_size}|{st.st_mtime_ns}"
+    
+    @staticmethod
+    def content_hash(filepath):
+        h = hashlib.blake2b(digest_size=16)
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        return h.hexdigest()
+    
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.root, 'index.json')) as f: return json.load(f)
+        except (OSError, ValueError): return {}
+    
+    def _write_index(self, index):
+        tmp = os.path.join(self.root, f"index.json.{os.getpid()}")
+        with open(tmp, 'w') as f: json.dump(index, f, indent=1)
+        os.replace(tmp, os.path.join(self.root, 'index.json'))
+    
+    def _digest(self, filepath, index):
+        key = self.stat_key(filepath)
+        digest = index.get(key) or self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = self.content_hash(filepath)
+        return key, digest
+    
+    @PERF.timed('ProjectCache.load', rows=lambda r: len(r[0]) if r else 0)
+    def load(self, filepath):
+        """(ProjectStore, info dict) for a file cached before, else None."""
+        if not HAS_PANDAS or self.max_bytes <= 0 or not os.path.isdir(self.root): return None
+        try:
+            index = self._read_index()
+            key, digest = self._digest(filepath, index)
+            path = os.path.join(self.root, digest)
+            with open(os.path.join(path, 'info.json')) as f:
+                info = json.load(f)
+            if info.get('format') != self.FORMAT: return None
+            store = ProjectStore.load(path)
+            os.utime(path)  # recency for eviction
+            if index.get(key) != digest:
+                index[key] = digest
+                self._write_index(index)
+            return store, info
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    @PERF.timed('ProjectCache.save')
+    def save(self, filepath, store, info=None):
+        """Cache a fully loaded store for filepath; info (e.g. loader warnings) comes back from load().
+        Caching is best-effort: on an error (a cell value JSON cannot encode, a full disk) the partly
+        written entry is removed and the error raised for the caller to report, the load itself stands."""
+        if not isinstance(store, ProjectStore) or self.max_bytes <= 0: return
+        os.makedirs(self.root, exist_ok=True)
+        index = self._read_index()
+        key, digest = self._digest(filepath, index)
+        path = os.path.join(self.root, digest)
+        if not os.path.exists(path):
+            tmp = f"{path}.tmp{os.getpid()}"
+            try:
+                store.save(tmp)
+                with open(os.path.join(tmp, 'info.json'), 'w') as f:
+                    json.dump({'format': self.FORMAT, 'source': os.path.abspath(filepath), 'projects': len(store), **(info or {})}, f)
+                os.replace(tmp, path)
+            except Exception:
+                shutil.rmtree(tmp, ignore_errors=True)
+                raise
+        source = key.rsplit('|', 2)[0]
+        index = {k: d for k, d in index.items() if k.rsplit('|', 2)[0] != source}  # older versions of the same file
+        index[key] = digest
+        self._write_index(index)
+        self.evict(keep=digest)
+    
+    def evict(self, keep=None):
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not os.path.isdir(path) or '.tmp' in name: continue
+            size = sum(e.stat().st_size for e in os.scandir(path) if e.is_file())
+            entries.append((os.path.getmtime(path), size, name))
+        total = sum(size for _, size, _ in entries)
+        removed = set()
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes: break
+            if name == keep: continue
+            # A mapped entry cannot be deleted on Windows; it goes on a later pass
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+            if not os.path.exists(os.path.join(self.root, name)):
+                removed.add(name)
+                total -= size
+        if removed:
+            self._write_index({k: d for k, d in self._read_index().items() if d not in removed})
+
 class REMFileHandler:
+    @staticmethod
+    def project_keys(projects):
+        """(key, project) pairs for REM records: Subdivision_LotN, with REM_n/index fallbacks."""
+        for i, p in enumerate(projects):
+            key = p.get('Subdivision1', '') or f"REM_{i+1}"
+            lot = p.get('Lot1', '') or str(i+1)
+            yield f"{key}_Lot{lot}", p
+
     @classmethod
+    @PERF.timed('REMFileHandler.read_rem_file', rows=len)
     def read_rem_file(cls, filepath):
         projects = []
         ext = os.path.splitext(filepath)[1].lower()
@@ -62,96 +988,318 @@ class REMFileHandler:
             projects = cls._parse_rem_xml(filepath)
         elif ext == '.csv' and HAS_PANDAS:
             df = pd.read_csv(filepath)
+            # export_to_rem_csv headers, then anything the Excel aliases know (Subdivision, Lot, Address ...)
+            rename = ExcelLoader._rename_map(df.columns)
+            rename.update((col, cls.CSV_COLUMNS[col]) for col in df.columns if col in cls.CSV_COLUMNS)
+            df = df.rename(columns=rename)
             for record in df.to_dict('records'):
                 project = {k: v for k, v in record.items() if pd.notna(v)}
                 if project:
                     projects.append(project)
         return projects
     
+    RECORD_TAGS = ['Building', 'Home', 'Project', 'Rating']
+    XML_MAP = {'ConditionedFloorArea': 'Living', 'TotalDuctLeakage': 'TDLCFM', 'DuctLeakageToOutside': 'LTOCFM',
+               'BlowerDoorCFM50': 'BDCFM', 'CoolingCapacity': 'Tonnage', 'SystemAirflow': 'MeasuredCFM',
+               'ReturnStaticPressure': 'ReturnIWC', 'SupplyStaticPressure': 'SupplyIWC', 'RefrigerantCharge': 'Charge',
+               'Street': 'StreetAddress', 'City': 'City', 'State': 'State', 'ZipCode': 'ZipCode',
+               'Subdivision': 'Subdivision1', 'LotNumber': 'Lot1', 'PermitNumber': 'PermitNo1'}
+    # Identity fields stay text ("012" lots, ZIP codes) so REMJoiner can match them to the workbook
+    XML_TEXT = {'StreetAddress', 'City', 'State', 'ZipCode', 'Subdivision1', 'Lot1', 'PermitNo1'}
+    
     @classmethod
     def _parse_rem_xml(cls, filepath):
-        projects = []
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        xml_map = {'ConditionedFloorArea': 'Living', 'TotalDuctLeakage': 'TDLCFM', 'DuctLeakageToOutside': 'LTOCFM',
-                   'BlowerDoorCFM50': 'BDCFM', 'CoolingCapacity': 'Tonnage', 'SystemAirflow': 'MeasuredCFM',
-                   'ReturnStaticPressure': 'ReturnIWC', 'SupplyStaticPressure': 'SupplyIWC', 'RefrigerantCharge': 'Charge'}
-        for elem_name in ['Building', 'Home', 'Project', 'Rating']:
-            for building in root.findall(f'.//{elem_name}'):
-                project = {}
-                for child in building:
-                    tag = child.tag.split('}')[-1]
-                    if tag in xml_map and child.text:
+        """One iterparse pass: every Building/Home/Project/Rating element below the root is a record made
+        from the mapped elements inside it, at any depth, down to the next nested record (a Rating inside
+        a Building is its own record). Elements are cleared as soon as they close, so memory stays flat
+        however large the export. Records come back grouped in RECORD_TAGS order, in document order
+        within each tag."""
+        xml_map, text_fields = cls.XML_MAP, cls.XML_TEXT
+        records = {tag: [] for tag in cls.RECORD_TAGS}
+        stack = []  # innermost open record's project dict (or None) for each open element
+        root = None
+        for event, elem in ET.iterparse(filepath, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                    stack.append(None)
+                elif elem.tag in records:
+                    project = {}
+                    records[elem.tag].append(project)
+                    stack.append(project)
+                else:
+                    stack.append(stack[-1])
+                continue
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if parent is not None:
+                tag = elem.tag.split('}')[-1]
+                if tag in xml_map and elem.text:
+                    field = xml_map[tag]
+                    if field in text_fields:
+                        parent[field] = elem.text.strip()
+                    else:
                         try:
-                            project[xml_map[tag]] = float(child.text.strip())
+                            parent[field] = float(elem.text.strip())
                         except:
-                            project[xml_map[tag]] = child.text.strip()
-                if project:
-                    projects.append(project)
-        return projects
+                            parent[field] = elem.text.strip()
+            elem.clear()
+            if len(stack) == 1:
+                root.clear()
+        return [p for tag in cls.RECORD_TAGS for p in records[tag] if p]
     
     @classmethod
-    def export_to_rem_xml(cls, projects, filepath):
-        root = ET.Element('REMRateExport')
-        root.set('version', '1.0')
-        root.set('exportDate', datetime.now().isoformat())
-        root.set('source', 'DSLD Ekotrope Sync v9')
+    def export_to_rem_xml(cls, projects, filepath, indent="  ", check=None):
+        """Write REM XML one <Building> at a time, so memory does not grow with the project count.
+        With the default indent the file is what minidom's toprettyxml gave; indent=None writes it
+        without whitespace. check() is called every 1000 buildings (raise to stop); the file is
+        only replaced once the export completes."""
+        attrs = {'version': '1.0', 'exportDate': datetime.now().isoformat(), 'source': 'DSLD Ekotrope Sync v9'}
+        newl = '\n' if indent is not None else ''
+        tmp = f"{filepath}.tmp"
+        written = 0
+        try:
+            with PERF.measure('REMFileHandler.export_to_rem_xml') as span, open(tmp, 'w', encoding='utf-8') as f:
+                f.write('<?xml version="1.0" ?>\n<REMRateExport' + ''.join(f' {k}="{_xml_escape(v)}"' for k, v in attrs.items()))
+                for i, p in enumerate(projects):
+                    if check and i % 1000 == 0: check()
+                    if not p: continue
+                    if not written: f.write('>' + newl)
+                    out = []
+                    _pretty_xml(out, cls._building_element(p, i), indent, 1)
+                    f.write(''.join(out))
+                    written += 1
+                f.write(f'</REMRateExport>{newl}' if written else f'/>{newl}')
+                span.rows = written
+            os.replace(tmp, filepath)
+        except BaseException:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+        return True
+    
+    @staticmethod
+    def _building_element(p, i):
+        building = ET.Element('Building')
+        building.set('id', str(i + 1))
         
-        for i, p in enumerate(projects):
-            if not p: continue
-            building = ET.SubElement(root, 'Building')
-            building.set('id', str(i + 1))
-            
-            if p.get('StreetAddress'):
-                addr = ET.SubElement(building, 'Address')
-                for field, tag in [('StreetAddress', 'Street'), ('City', 'City'), ('State', 'State'), ('ZipCode', 'ZipCode')]:
-                    if p.get(field):
-                        ET.SubElement(addr, tag).text = str(p[field])
-            
-            info = ET.SubElement(building, 'BuildingInfo')
-            for field, tag in [('Living', 'ConditionedFloorArea'), ('Subdivision1', 'Subdivision'), ('Lot1', 'LotNumber')]:
+        if p.get('StreetAddress'):
+            addr = ET.SubElement(building, 'Address')
+            for field, tag in [('StreetAddress', 'Street'), ('City', 'City'), ('State', 'State'), ('ZipCode', 'ZipCode')]:
                 if p.get(field):
-                    ET.SubElement(info, tag).text = str(p[field])
-            
-            ducts = ET.SubElement(building, 'DuctTesting')
-            if p.get('TDLCFM') is not None:
-                ET.SubElement(ducts, 'TotalDuctLeakage').text = f"{p['TDLCFM']:.1f}"
-            if p.get('LTOCFM') is not None:
-                ET.SubElement(ducts, 'DuctLeakageToOutside').text = f"{p['LTOCFM']:.1f}"
-            
-            if p.get('BDCFM') is not None:
-                infiltration = ET.SubElement(building, 'Infiltration')
-                ET.SubElement(infiltration, 'BlowerDoorCFM50').text = f"{p['BDCFM']:.1f}"
-            
-            hvac = ET.SubElement(building, 'HVAC')
-            for field, tag in [('Tonnage', 'CoolingCapacity'), ('MeasuredCFM', 'SystemAirflow'), ('ReturnIWC', 'ReturnStaticPressure'),
-                              ('SupplyIWC', 'SupplyStaticPressure'), ('Charge', 'RefrigerantCharge')]:
-                if p.get(field) is not None:
-                    ET.SubElement(hvac, tag).text = f"{p[field]}"
+                    ET.SubElement(addr, tag).text = str(p[field])
         
-        xml_str = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_str)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(dom.toprettyxml(indent="  "))
-        return True
+        info = ET.SubElement(building, 'BuildingInfo')
+        for field, tag in [('Living', 'ConditionedFloorArea'), ('Subdivision1', 'Subdivision'), ('Lot1', 'LotNumber'), ('PermitNo1', 'PermitNumber')]:
+            if p.get(field):
+                ET.SubElement(info, tag).text = str(p[field])
+        
+        ducts = ET.SubElement(building, 'DuctTesting')
+        if p.get('TDLCFM') is not None:
+            ET.SubElement(ducts, 'TotalDuctLeakage').text = f"{p['TDLCFM']:.1f}"
+        if p.get('LTOCFM') is not None:
+            ET.SubElement(ducts, 'DuctLeakageToOutside').text = f"{p['LTOCFM']:.1f}"
+        
+        if p.get('BDCFM') is not None:
+            infiltration = ET.SubElement(building, 'Infiltration')
+            ET.SubElement(infiltration, 'BlowerDoorCFM50').text = f"{p['BDCFM']:.1f}"
+        
+        hvac = ET.SubElement(building, 'HVAC')
+        for field, tag in [('Tonnage', 'CoolingCapacity'), ('MeasuredCFM', 'SystemAirflow'), ('ReturnIWC', 'ReturnStaticPressure'),
+                          ('SupplyIWC', 'SupplyStaticPressure'), ('Charge', 'RefrigerantCharge')]:
+            if p.get(field) is not None:
+                ET.SubElement(hvac, tag).text = f"{p[field]}"
+        return building
+    
+    CSV_COLUMNS = {'Subdivision': 'Subdivision1', 'Lot': 'Lot1', 'Address': 'StreetAddress', 'Conditioned Floor Area': 'Living',
+                   'Total Duct Leakage CFM25': 'TDLCFM', 'Leakage to Outside CFM25': 'LTOCFM', 'Blower Door CFM50': 'BDCFM',
+                   'Cooling Tons': 'Tonnage', 'Pass/Fail': 'PassFail1'}  # ACH50 is computed and goes before Cooling Tons
     
     @classmethod
     def export_to_rem_csv(cls, projects, filepath):
         if not HAS_PANDAS:
             raise Exception("pandas required for CSV export")
-        data = []
-        for p in projects:
-            if not p: continue
-            ach50 = (p['BDCFM'] * 60) / (p['Living'] * 8) if p.get('BDCFM') and p.get('Living') and p['Living'] > 0 else None
-            row = {'Subdivision': p.get('Subdivision1', ''), 'Lot': p.get('Lot1', ''), 'Address': p.get('StreetAddress', ''),
-                   'Conditioned Floor Area': p.get('Living', ''), 'Total Duct Leakage CFM25': p.get('TDLCFM', ''),
-                   'Leakage to Outside CFM25': p.get('LTOCFM', ''), 'Blower Door CFM50': p.get('BDCFM', ''),
-                   'ACH50': f"{ach50:.2f}" if ach50 else '', 'Cooling Tons': p.get('Tonnage', ''),
-                   'Pass/Fail': p.get('PassFail1', '')}
-            data.append(row)
-        pd.DataFrame(data).to_csv(filepath, index=False)
+        projects = [p for p in projects if p]
+        with PERF.measure('REMFileHandler.export_to_rem_csv', rows=len(projects)):
+            df = pd.DataFrame({col: [p.get(field, '') for p in projects] for col, field in cls.CSV_COLUMNS.items()})
+            # ACH50 for the whole column at once; '' where it is 0 (no blower door number or no floor area)
+            number = lambda col: pd.to_numeric(df[col], errors='coerce')
+            ach50 = ConstructionCalculators.ach50(number('Blower Door CFM50'), number('Conditioned Floor Area'))
+            df.insert(df.columns.get_loc('Cooling Tons'), 'ACH50', [f"{v:.2f}" if v else '' for v in ach50.tolist()])
+            df.to_csv(filepath, index=False)
         return True
 
+def _xml_escape(text):
+    # Same escaping as minidom's writer, for text and attribute values
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;').replace('>', '&gt;')
+
+def _pretty_xml(out, elem, indent, level=0):
+    """Append elem to the out list the way minidom's toprettyxml prints it: a leaf with text on one
+    line, <Tag/> when empty. Line ends in text are normalized the way an XML parser reads them."""
+    pad, newl = (indent * level, '\n') if indent is not None else ('', '')
+    attrs = ''.join(f' {k}="{_xml_escape(v)}"' for k, v in elem.attrib.items())
+    if len(elem):
+        out.append(f"{pad}<{elem.tag}{attrs}>{newl}")
+        for child in elem:
+            _pretty_xml(out, child, indent, level + 1)
+        out.append(f"{pad}</{elem.tag}>{newl}")
+    elif elem.text:
+        text = _xml_escape(elem.text.replace('\r\n', '\n').replace('\r', '\n'))
+        out.append(f"{pad}<{elem.tag}{attrs}>{text}</{elem.tag}>{newl}")
+    else:
+        out.append(f"{pad}<{elem.tag}{attrs}/>{newl}")
+
+class REMJoiner:
+    """Attach REM/Rate results to loaded projects (a ProjectStore or dict). Records are matched through hash
+    indexes on normalized permit number, subdivision + lot, and street address (with the ZIP code when both
+    sides have one), tried in that order; a key several projects share is ambiguous and never matches.
+    Records still unmatched are compared by street name (difflib ratio >= FUZZY_RATIO) only against the
+    unmatched projects with the same house number and ZIP code (or city). apply() writes the records'
+    MEASUREMENT_FIELDS into the matched projects, column-wise on a ProjectStore; join() only reads, so it
+    can run off the GUI thread."""
+    MEASUREMENT_FIELDS = [f for f in REMFileHandler.XML_MAP.values() if f in DSLDSchema.DUCT_FIELDS + DSLDSchema.AIRFLOW_FIELDS + ['BDCFM', 'Tonnage']]
+    METHODS = ['permit', 'lot', 'address', 'fuzzy']
+    FUZZY_RATIO = 0.85
+    ABBREVIATIONS = {'street': 'st', 'avenue': 'ave', 'drive': 'dr', 'lane': 'ln', 'road': 'rd', 'boulevard': 'blvd', 'court': 'ct',
+                     'circle': 'cir', 'place': 'pl', 'parkway': 'pkwy', 'highway': 'hwy', 'trail': 'trl', 'terrace': 'ter', 'cove': 'cv',
+                     'north': 'n', 'south': 's', 'east': 'e', 'west': 'w'}
+    
+    def __init__(self, projects):
+        self.projects = projects
+        self.n = len(projects)
+        column = lambda field, fn: self._normalized(projects, field, fn)
+        self.permit, self.sub, self.lot = column('PermitNo1', self.permit_key), column('Subdivision1', self.text_key), column('Lot1', self.lot_key)
+        self.address, self.zip, self.city = column('StreetAddress', self.address_key), column('ZipCode', self.zip_key), column('City', self.text_key)
+        self.indexes = {'permit': self._index(self.permit),
+                        'lot': self._index([(s, l) if s and l else None for s, l in zip(self.sub, self.lot)]),
+                        'address_zip': self._index([(a, z) if a and z else None for a, z in zip(self.address, self.zip)]),
+                        'address': self._index(self.address)}
+    
+    # --- normalization: one key per distinct value, None when there is nothing to match on
+    
+    @staticmethod
+    def text_key(v):
+        if v is None: return None
+        return ' '.join(re.sub(r'[^a-z0-9]+', ' ', str(v).lower()).split()) or None
+    
+    @staticmethod
+    def permit_key(v):
+        if v is None: return None
+        return re.sub(r'[^A-Z0-9]', '', str(v).upper()) or None
+    
+    @staticmethod
+    def lot_key(v):
+        if v is None: return None
+        if isinstance(v, float) and v.is_integer(): v = int(v)
+        text = re.sub(r'^(lot|lt)\s*#?\s*', '', str(v).strip().lower())
+        return (text.lstrip('0') or text) if text else None
+    
+    @staticmethod
+    def zip_key(v):
+        if v is None: return None
+        m = re.match(r'\s*(\d{5})', str(v))
+        return m.group(1) if m else None
+    
+    @classmethod
+    def address_key(cls, v):
+        text = cls.text_key(v)
+        return ' '.join(cls.ABBREVIATIONS.get(t, t) for t in text.split()) if text else None
+    
+    @staticmethod
+    def _normalized(projects, field, fn):
+        if isinstance(projects, ProjectStore):
+            codes, categories = projects.coded(field)
+            lut = [fn(v) for v in categories] + [None, None]  # codes -2/-1 -> None
+            return [lut[c] for c in codes.tolist()]
+        return [fn(p.get(field)) if p else None for p in projects.values()]
+    
+    @staticmethod
+    def _index(keys):
+        index = {}
+        for row, key in enumerate(keys):
+            if key is not None:
+                index[key] = -1 if key in index else row  # -1: shared, ambiguous
+        return index
+    
+    # --- matching
+    
+    def match(self, record):
+        """(row, method) of the project record belongs to, or (None, None)."""
+        indexes = self.indexes
+        address, zipcode = self.address_key(record.get('StreetAddress')), self.zip_key(record.get('ZipCode'))
+        sub, lot = self.text_key(record.get('Subdivision1')), self.lot_key(record.get('Lot1'))
+        for method, index, key in (('permit', 'permit', self.permit_key(record.get('PermitNo1'))),
+                                   ('lot', 'lot', (sub, lot) if sub and lot else None),
+                                   ('address', 'address_zip', (address, zipcode) if address and zipcode else None),
+                                   ('address', 'address', address)):
+            row = indexes[index].get(key, -1) if key is not None else -1
+            if row >= 0: return row, method
+        return None, None
+    
+    def join(self, records):
+        """Match every record; returns {'matches': [(record index, row, method)], 'unmatched': [record index],
+        'counts': {method: n}}. Exact keys first, then the blocked fuzzy pass over what is left."""
+        matches, unmatched = [], []
+        for i, record in enumerate(records):
+            row, method = self.match(record)
+            if row is None: unmatched.append(i)
+            else: matches.append((i, row, method))
+        if unmatched:
+            fuzzy = self._fuzzy(records, unmatched, {row for _, row, _ in matches})
+            matches.extend(fuzzy)
+            matched = {i for i, _, _ in fuzzy}
+            unmatched = [i for i in unmatched if i not in matched]
+        counts = {method: 0 for method in self.METHODS}
+        for _, _, method in matches: counts[method] += 1
+        return {'matches': matches, 'unmatched': unmatched, 'counts': counts}
+    
+    @staticmethod
+    def _split_address(address):
+        number, _, street = (address or '').partition(' ')
+        return (number, street) if number.isdigit() and street else (None, None)
+    
+    def _fuzzy(self, records, pending, taken):
+        from difflib import SequenceMatcher
+        blocks = {}  # (house number, 'zip'/'city', value) -> [(row, street)] of projects nothing matched yet
+        for row, address in enumerate(self.address):
+            number, street = self._split_address(address)
+            if number is None or row in taken: continue
+            for kind, value in (('zip', self.zip[row]), ('city', self.city[row])):
+                if value: blocks.setdefault((number, kind, value), []).append((row, street))
+        matches = []
+        for i in pending:
+            record = records[i]
+            number, street = self._split_address(self.address_key(record.get('StreetAddress')))
+            if number is None: continue
+            zipcode, city = self.zip_key(record.get('ZipCode')), self.text_key(record.get('City'))
+            candidates = blocks.get((number, 'zip', zipcode)) if zipcode else blocks.get((number, 'city', city)) if city else None
+            best, best_ratio, tie = None, self.FUZZY_RATIO, False
+            for row, other in candidates or ():
+                ratio = SequenceMatcher(None, street, other).ratio()
+                if ratio > best_ratio: best, best_ratio, tie = row, ratio, False
+                elif ratio == best_ratio and best is not None: tie = True
+            if best is not None and not tie:
+                matches.append((i, best, 'fuzzy'))
+        return matches
+    
+    def merge(self, records, fields=None):
+        return self.apply(records, self.join(records), fields)
+    
+    def apply(self, records, result, fields=None):
+        """Copy the matched records' measurements (fields, default MEASUREMENT_FIELDS) into their projects;
+        a project matched twice keeps the later record's values. Returns result."""
+        fields = fields or self.MEASUREMENT_FIELDS
+        store = self.projects
+        keys = None if isinstance(store, ProjectStore) else list(store)
+        with PERF.measure('REMJoiner.merge', rows=len(result['matches'])):
+            for field in fields:
+                latest = {row: records[i][field] for i, row, _ in result['matches'] if records[i].get(field) is not None}
+                if not latest: continue
+                if keys is None:
+                    store.set_rows(field, list(latest), list(latest.values()))
+                else:
+                    for row, value in latest.items(): store[keys[row]][field] = value
+        return result
+
 class ComplianceStandards:
     ENERGY_STAR_32_CZ2 = {'name': 'ENERGY STAR 3.2 CZ2', 'duct_leakage_total_rate': 8.0, 'duct_leakage_total_min': 80.0,
         'duct_leakage_total_rate_alt': 12.0, 'duct_leakage_total_min_alt': 120.0, 'duct_leakage_outside_rate': 4.0,
@@ -253,7 +1401,129 @@ class ComplianceChecker:
                 if results['overall'] == 'PASS': results['overall'] = 'WARN'
         return results
 
+    # Columns read by the checks; check_batch() works on these only
+    FIELDS = ['Living', 'ReturnCount', 'TDLCFM', 'LTOCFM', 'ReturnIWC', 'SupplyIWC', 'Charge', 'MeasuredCFM', 'Tonnage', 'MVCFM']
+
+    @classmethod
+    def build_table(cls, projects):
+        """Column table for check_batch(): {field: (float64 values, present mask)} plus an 'empty' row mask.
+        None means missing (as in check_project); a DataFrame's NaN cells are treated as missing."""
+        if isinstance(projects, ProjectStore):
+            table = {'empty': ~projects.nonempty()}
+            for f in cls.FIELDS:
+                table[f] = projects.numeric(f)
+            return table
+        if HAS_PANDAS and isinstance(projects, pd.DataFrame):
+            table = {'empty': np.zeros(len(projects), dtype=bool)}
+            for f in cls.FIELDS:
+                if f in projects.columns:
+                    vals = pd.to_numeric(projects[f], errors='coerce').to_numpy(dtype='float64')
+                    table[f] = (vals, ~np.isnan(vals))
+                else:
+                    table[f] = (np.full(len(projects), np.nan), np.zeros(len(projects), dtype=bool))
+            return table
+        projects = list(projects)
+        table = {'empty': np.array([not p for p in projects], dtype=bool)}
+        for f in cls.FIELDS:
+            raw = [p.get(f) if p else None for p in projects]
+            vals = pd.to_numeric(pd.Series(raw, dtype=object), errors='coerce').to_numpy(dtype='float64')
+            # None is missing, and so is text that is not a number (check_project would raise on it)
+            present = np.array([v is not None and not isinstance(v, str) for v in raw], dtype=bool) | ~np.isnan(vals)
+            table[f] = (vals, present)
+        return table
+
+    @PERF.timed('ComplianceChecker.check_batch', rows=len)
+    def check_batch(self, projects):
+        """Vectorized check_project() over a list of projects, a DataFrame or a build_table() result."""
+        if not HAS_PANDAS: raise Exception("pandas required for batch compliance")
+        table = projects if isinstance(projects, dict) and 'empty' in projects else self.build_table(projects)
+        col = lambda f: table[f][0]
+        has = lambda f: table[f][1]
+        n = len(table['empty'])
+        living = np.where(has('Living'), col('Living'), 0.0)
+        return_count = np.where(has('ReturnCount'), col('ReturnCount'), 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fn41 = return_count >= 3
+            sized = living > 0
+            status = {}
+            tdl_allow = np.maximum((living / 100) * np.where(fn41, 12.0, 8.0), np.where(fn41, 120.0, 80.0))
+            status['tdl'] = _status_codes(has('TDLCFM') & sized, col('TDLCFM') <= tdl_allow, FAIL_CODE)
+            lto_allow = np.maximum((living / 100) * 4.0, 40.0)
+            status['lto'] = _status_codes(has('LTOCFM') & sized, col('LTOCFM') <= lto_allow, FAIL_CODE)
+            status['return_iwc'] = _status_codes(has('ReturnIWC'), np.abs(col('ReturnIWC')) <= 0.20, WARN_CODE)
+            status['supply_iwc'] = _status_codes(has('SupplyIWC'), np.abs(col('SupplyIWC')) <= 0.25, WARN_CODE)
+            status['charge'] = _status_codes(has('Charge'), np.abs(col('Charge')) <= 0.05, WARN_CODE)
+            cfm, tons = col('MeasuredCFM'), col('Tonnage')
+            cpt = cfm / tons
+            applies = has('MeasuredCFM') & (cfm != 0) & has('Tonnage') & (tons > 0)
+            cpt_status = np.where((cpt >= 350) & (cpt <= 450), PASS_CODE, np.where((cpt >= 300) & (cpt <= 500), WARN_CODE, FAIL_CODE))
+            status['cfm_per_ton'] = np.where(applies, cpt_status, NA_CODE).astype(np.int8)
+            status['bath_fan'] = _status_codes(has('MVCFM'), col('MVCFM') >= 50, FAIL_CODE)
+        return ComplianceBatch(table, status, n, fn41, tdl_allow, lto_allow, cpt)
+
+NA_CODE, PASS_CODE, FAIL_CODE, WARN_CODE = 0, 1, 2, 3
+STATUS_NAMES = {PASS_CODE: 'PASS', FAIL_CODE: 'FAIL', WARN_CODE: 'WARN'}
+
+def _status_codes(applies, passed, fail_code):
+    return np.where(applies, np.where(passed, PASS_CODE, fail_code), NA_CODE).astype(np.int8)
+
+class ComplianceBatch:
+    """Result of ComplianceChecker.check_batch(): per-check status codes as arrays.
+    Check text is only formatted by result(i), e.g. for the detail view."""
+    CHECK_ORDER = ['tdl', 'lto', 'return_iwc', 'supply_iwc', 'charge', 'cfm_per_ton', 'bath_fan']
+
+    def __init__(self, table, status, n, fn41, tdl_allow, lto_allow, cpt):
+        self.table, self.status, self.n = table, status, n
+        self.fn41, self.tdl_allow, self.lto_allow, self.cpt = fn41, tdl_allow, lto_allow, cpt
+        stacked = np.stack([status[k] for k in self.CHECK_ORDER]) if n else np.zeros((len(self.CHECK_ORDER), 0), dtype=np.int8)
+        self.pass_count = (stacked == PASS_CODE).sum(axis=0)
+        self.fail_count = (stacked == FAIL_CODE).sum(axis=0)
+        self.warn_count = (stacked == WARN_CODE).sum(axis=0)
+        failed = (self.fail_count > 0) | table['empty']
+        self.overall = np.where(failed, 'FAIL', np.where(self.warn_count > 0, 'WARN', 'PASS'))
+
+    def __len__(self): return self.n
+
+    def summary(self, i):
+        return {'overall': str(self.overall[i]), 'pass_count': int(self.pass_count[i]),
+                'fail_count': int(self.fail_count[i]), 'warn_count': int(self.warn_count[i])}
+
+    def totals(self):
+        return {s: int((self.overall == s).sum()) for s in ('PASS', 'FAIL', 'WARN')}
+
+    def result(self, i):
+        """Same dict as ComplianceChecker.check_project() for row i."""
+        results = {**self.summary(i), 'checks': [], 'footnotes_applied': []}
+        if self.table['empty'][i]:
+            return results
+        if self.fn41[i]:
+            results['footnotes_applied'].append('Footnote 41: 3+ returns')
+        val = lambda f: self.table[f][0][i]
+        for k in self.CHECK_ORDER:
+            code = self.status[k][i]
+            if code == NA_CODE: continue
+            status = STATUS_NAMES[code]
+            if k == 'tdl':
+                check = ('Total Duct Leakage (6.4.2)', f"{val('TDLCFM'):.0f} CFM25", f"<={self.tdl_allow[i]:.0f} CFM25")
+            elif k == 'lto':
+                check = ('Duct Leakage to Outside (6.5)', f"{val('LTOCFM'):.0f} CFM25", f"<={self.lto_allow[i]:.0f} CFM25")
+            elif k == 'return_iwc':
+                check = ('Return Static (5b.2)', f"{val('ReturnIWC'):.3f} IWC", "<=0.20 IWC")
+            elif k == 'supply_iwc':
+                check = ('Supply Static (5b.2)', f"{val('SupplyIWC'):.3f} IWC", "<=0.25 IWC")
+            elif k == 'charge':
+                check = ('Refrigerant Charge (5a.3)', f"{val('Charge'):.3f}", "+/-0.05")
+            elif k == 'cfm_per_ton':
+                check = ('Airflow (5a.1)', f"{self.cpt[i]:.0f} CFM/ton", "350-450 CFM/ton")
+            else:
+                check = ('Bath Fan (8.2)', f"{val('MVCFM'):.0f} CFM", ">=50 CFM")
+            results['checks'].append({'component': check[0], 'value': check[1], 'requirement': check[2], 'status': status})
+        return results
+
 class DataValidator:
+    # Fields read by validate_project()
+    FIELDS = ['Subdivision1', 'Lot1', 'Living', 'StreetAddress', 'TDLCFM', 'LTOCFM', 'PassFail1']
+    
     def validate_project(self, project):
         issues = {'errors': [], 'warnings': [], 'info': [], 'is_valid': False, 'total_issues': 0}
         if not project:
@@ -271,6 +1541,109 @@ class DataValidator:
         issues['total_issues'] = len(issues['errors']) + len(issues['warnings'])
         return issues
 
+class ParallelAuditor:
+    """validate_project() and check_project() over a process pool. Projects are split into chunks of
+    chunk_size; only the fields the two checks read are sent to the workers, and the results come
+    back in input order. workers=1, or fewer than MIN_PARALLEL_ROWS projects, runs in this process."""
+    FIELDS = list(dict.fromkeys(DataValidator.FIELDS + ComplianceChecker.FIELDS))
+    CHUNK_SIZE = 2000
+    MIN_PARALLEL_ROWS = 10000  # below this, starting the worker processes costs more than it saves
+    
+    def __init__(self, standard, workers=None, chunk_size=None):
+        self.standard = standard
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+    
+    @classmethod
+    def project_rows(cls, projects):
+        """(keys, rows): each row is a tuple of FIELDS values (None when missing), or None for an empty project."""
+        keys = list(projects.keys())
+        if isinstance(projects, ProjectStore):
+            nonempty = projects.nonempty().tolist()
+            columns = [projects.values_of(f) for f in cls.FIELDS]
+            return keys, [r if ok else None for r, ok in zip(zip(*columns), nonempty)] if columns else []
+        return keys, [tuple(p.get(f) for f in cls.FIELDS) if p else None for p in projects.values()]
+    
+    @PERF.timed('ParallelAuditor.run', rows=lambda r: len(r[0] if r[0] is not None else r[1]))
+    def run(self, projects, validate=True, comply=True, progress=None, check=None, cache=None):
+        """Returns (validation_results, compliance_results) dicts keyed like projects; a skipped part is None.
+        progress(done, total) is called as chunks finish, check() between chunks (raise to stop).
+        With an AuditCache only rows whose fields (or, for compliance, the standard) changed are evaluated."""
+        keys, rows = self.project_rows(projects)
+        if cache is None:
+            validation, compliance = self._evaluate(rows, validate, comply, progress, check)
+        else:
+            validation, compliance = cache.lookup(self, rows, validate, comply, progress, check)
+        return (dict(zip(keys, validation)) if validate else None,
+                dict(zip(keys, compliance)) if comply else None)
+    
+    def _evaluate(self, rows, validate, comply, progress=None, check=None):
+        chunks = [rows[i:i + self.chunk_size] for i in range(0, len(rows), self.chunk_size)]
+        validation = [] if validate else None
+        compliance = [] if comply else None
+        def collect(part, done):
+            if validate: validation.extend(part[0])
+            if comply: compliance.extend(part[1])
+            if progress: progress(done, len(rows))
+            if check: check()
+        if self.workers <= 1 or len(chunks) <= 1 or len(rows) < self.MIN_PARALLEL_ROWS:
+            for chunk in chunks:
+                collect(_audit_chunk(chunk, self.standard, validate, comply), len(validation or compliance or ()))
+        else:
+            pool = _process_pool(min(self.workers, len(chunks)))
+            try:
+                futures = [pool.submit(_audit_chunk, chunk, self.standard, validate, comply) for chunk in chunks]
+                for n, future in enumerate(futures, 1):
+                    collect(future.result(), min(n * self.chunk_size, len(rows)))
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+        return validation, compliance
+
+class AuditCache:
+    """Results of earlier ParallelAuditor runs keyed by each project's row of audit fields, so a reload or
+    an edit only re-checks the projects whose inputs changed. Compliance entries are also tied to the rule
+    set and dropped when the standard changes. Only rows seen in the latest run are kept."""
+    def __init__(self):
+        self.validation, self.compliance = {}, {}
+        self.rules = None
+        self.hits = self.misses = 0
+    
+    def lookup(self, auditor, rows, validate, comply, progress=None, check=None):
+        if comply:
+            rules = tuple(sorted(auditor.standard.items()))
+            if rules != self.rules: self.compliance, self.rules = {}, rules
+        unique = list(dict.fromkeys(rows))
+        todo = [r for r in unique if (validate and r not in self.validation) or (comply and r not in self.compliance)]
+        self.misses += len(todo)
+        self.hits += len(rows) - len(todo)
+        PERF.count('AuditCache hits', len(rows) - len(todo))
+        PERF.count('AuditCache misses', len(todo))
+        validation, compliance = auditor._evaluate(todo, validate, comply, progress, check)
+        if validate:
+            known = self.validation
+            known.update(zip(todo, validation))
+            self.validation = {r: known[r] for r in unique}
+            validation = [self.validation[r] for r in rows]
+        if comply:
+            known = self.compliance
+            known.update(zip(todo, compliance))
+            self.compliance = {r: known[r] for r in unique}
+            compliance = [self.compliance[r] for r in rows]
+        return validation, compliance
+
+def _process_pool(workers):
+    # Spawned, not forked: the GUI starts pools from a JobRunner thread while Tk and the other worker
+    # threads hold locks a forked child would inherit mid-use (freeze_support in main covers the EXE)
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def _audit_chunk(rows, standard, validate, comply):
+    # Worker side of ParallelAuditor: rebuild the projected projects and run both checks
+    projects = [dict(zip(ParallelAuditor.FIELDS, r)) if r is not None else {} for r in rows]
+    validator, checker = DataValidator(), ComplianceChecker(standard)
+    return ([validator.validate_project(p) for p in projects] if validate else None,
+            [checker.check_project(p) for p in projects] if comply else None)
+
 class RatingType:
     @classmethod
     def determine(cls, project):
@@ -278,18 +1651,82 @@ class RatingType:
         passed = str(project.get('PassFail1', '')).lower() == 'pass'
         return 'Confirmed' if has_final and passed else 'Projected'
 
+class BuilderIdTemplate:
+    """builderHomeId template such as {Subdivision1}_Lot{Lot1}, parsed once into literal text and the
+    fields it needs so each ID is rendered in a single join. strict=True (configure time) rejects
+    placeholders that are not DSLDSchema template fields; otherwise they stay in the ID as typed."""
+    PLACEHOLDER = re.compile(r'\{([^{}]*)\}')
+    
+    def __init__(self, template, strict=True):
+        self.template = template
+        allowed = DSLDSchema.get_template_fields()
+        self.literals, self.slots = [], []
+        pos = 0
+        for m in self.PLACEHOLDER.finditer(template):
+            if m.group(1) not in allowed:
+                if strict: raise Exception(f"Unknown template field {m.group(0)} - available: " + ', '.join('{' + f + '}' for f in dict.fromkeys(allowed)))
+                continue
+            self.literals.append(template[pos:m.start()])
+            self.slots.append(m.group(1))
+            pos = m.end()
+        self.literals.append(template[pos:])
+        self.fields = list(dict.fromkeys(self.slots))
+    
+    @staticmethod
+    def clean(value):
+        return str(value or '').strip().replace(' ', '_')
+    
+    def render(self, project):
+        parts = [self.literals[0]]
+        for field, literal in zip(self.slots, self.literals[1:]):
+            parts.append(self.clean(project.get(field, '')))
+            parts.append(literal)
+        return ''.join(parts)
+    
+    def render_batch(self, projects):
+        """IDs for every row of a ProjectStore (or a list of projects). For a store each field is
+        cleaned once per distinct value and picked up by code."""
+        if not isinstance(projects, ProjectStore):
+            return [self.render(p) if p else '' for p in projects]
+        columns = {}
+        for field in self.fields:
+            codes, categories = projects.coded(field)
+            cleaned = [self.clean(v) for v in categories] + ['', '']  # codes -2 (absent) / -1 (None) index the two ''
+            columns[field] = [cleaned[c] for c in codes.tolist()]
+        rows = [columns[f] for f in self.slots]
+        ids = []
+        for values in zip(*rows) if rows else ([()] * len(projects)):
+            parts = [self.literals[0]]
+            for value, literal in zip(values, self.literals[1:]):
+                parts.append(value)
+                parts.append(literal)
+            ids.append(''.join(parts))
+        return ids
+
 class EkotropeJSONGenerator:
     def __init__(self, config):
         self.config = config
+        self._template = None
     
-    def generate(self, projects, target_version='ENERGY STAR 3.2', orientation='N'):
-        homes = []
-        for p in projects:
+    def template(self):
+        """Compiled builder_home_id_template, recompiled only when the config value changes."""
+        text = self.config.get('builder_home_id_template', '{Subdivision1}_Lot{Lot1}')
+        if self._template is None or self._template.template != text:
+            self._template = BuilderIdTemplate(text, strict=False)
+        return self._template
+    
+    def iter_homes(self, projects, target_version='ENERGY STAR 3.2', orientation='N'):
+        """Yield the Ekotrope home object of each exportable project, one at a time. A ProjectStore
+        has its IDs rendered column-wise up front."""
+        template = self.template()
+        if isinstance(projects, ProjectStore):
+            ids = template.render_batch(projects)
+            projects = map(projects.row, range(len(ids)))
+        else:
+            ids = None
+        for i, p in enumerate(projects):
             if not p: continue
-            template = self.config.get('builder_home_id_template', '{Subdivision1}_Lot{Lot1}')
-            builder_id = template
-            for field in DSLDSchema.get_template_fields():
-                builder_id = builder_id.replace('{' + field + '}', str(p.get(field, '') or '').strip().replace(' ', '_'))
+            builder_id = ids[i] if ids is not None else template.render(p)
             if not builder_id or builder_id == '_Lot': continue
             home = {'builderHomeId': builder_id, 'ratingType': RatingType.determine(p), 'targetEnergyStarVersion': target_version}
             if p.get('StreetAddress'):
@@ -303,26 +1740,111 @@ class EkotropeJSONGenerator:
                 if p.get('TDLCFM') is not None: dist['totalDuctLeakageCfm25'] = float(p['TDLCFM'])
                 if p.get('LTOCFM') is not None: dist['leakageToOutsideCfm25'] = float(p['LTOCFM'])
                 home['distributionSystems'] = [dist]
-            homes.append(home)
-        return {'homes': homes, 'metadata': {'generated': datetime.now().isoformat(), 'source': 'DSLD v9', 'count': len(homes)}}
+            yield home
+    
+    @staticmethod
+    def metadata(count):
+        return {'generated': datetime.now().isoformat(), 'source': 'DSLD v9', 'count': count}
+    
+    @PERF.timed('EkotropeJSONGenerator.generate', rows=lambda r: len(r['homes']))
+    def generate(self, projects, target_version='ENERGY STAR 3.2', orientation='N'):
+        homes = list(self.iter_homes(projects, target_version, orientation))
+        return {'homes': homes, 'metadata': self.metadata(len(homes))}
+    
+    @PERF.timed('EkotropeJSONGenerator.write', rows=lambda count: count)
+    def write(self, projects, filepath, target_version='ENERGY STAR 3.2', orientation='N', ndjson=False, check=None):
+        """Stream the export to filepath and return the home count. The JSON file is the same as
+        json.dump(generate(...), f, indent=2), written home by home with metadata at the end; ndjson
+        writes one compact home object per line and no metadata. check() runs every 1000 homes; the file
+        is only replaced once the export completes."""
+        tmp = f"{filepath}.tmp"
+        count = 0
+        try:
+            with open(tmp, 'w') as f:
+                if not ndjson: f.write('{\n  "homes": [')
+                for home in self.iter_homes(projects, target_version, orientation):
+                    if check and count % 1000 == 0: check()
+                    if ndjson:
+                        f.write(json.dumps(home) + '\n')
+                    else:
+                        f.write((',\n    ' if count else '\n    ') + json.dumps(home, indent=2).replace('\n', '\n    '))
+                    count += 1
+                if not ndjson:
+                    metadata = json.dumps(self.metadata(count), indent=2).replace('\n', '\n  ')
+                    f.write(('\n  ],' if count else '],') + f'\n  "metadata": {metadata}\n}}')
+            os.replace(tmp, filepath)
+        except BaseException:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+        return count
+
+def is_ndjson(filepath):
+    return os.path.splitext(filepath)[1].lower() in ('.ndjson', '.jsonl')
+
+def _is_column(v): return isinstance(v, (list, tuple)) or (hasattr(v, '__array__') and hasattr(v, '__len__'))
+
+def _columnwise(vector):
+    """Make a ConstructionCalculators formula array-aware: a call with any list, NumPy array or pandas Series
+    argument runs vector(...) on float64 arrays (None/NaN -> NaN) instead, returning an array, or a Series
+    on the first Series argument's index. Scalar calls go to the scalar function unchanged."""
+    def wrap(scalar):
+        def call(*args, **kwargs):
+            values = list(args) + list(kwargs.values())
+            if not any(_is_column(v) for v in values):
+                return scalar(*args, **kwargs)
+            as_float = lambda v: (v.to_numpy(dtype=float, na_value=np.nan) if hasattr(v, 'to_numpy') else
+                                  np.asarray(np.nan if v is None else v, dtype=float))
+            result = vector(*map(as_float, args), **{k: as_float(v) for k, v in kwargs.items()})
+            series = next((v for v in values if hasattr(v, 'to_numpy') and hasattr(v, 'index')), None)
+            return pd.Series(result, index=series.index) if series is not None else result
+        call.__name__, call.__doc__ = scalar.__name__, scalar.__doc__
+        return staticmethod(call)
+    return wrap
+
+def _per(numerator, denominator, ok):
+    # numerator / denominator where ok, else 0; ok is False for missing (NaN) inputs
+    return np.where(ok, numerator / np.where(ok, denominator, 1.0), 0.0)
 
 class ConstructionCalculators:
-    @staticmethod
+    """Field formulas. Each also takes NumPy arrays or pandas Series (see _columnwise), treating None/NaN
+    like the scalar versions treat None; derive() adds all of them to a dataset in one call."""
+    @_columnwise(lambda cfm, sqft: _per(np.nan_to_num(cfm), sqft, sqft > 0) * 100)
     def duct_leakage_per_100(cfm, sqft): return (cfm or 0) / sqft * 100 if sqft and sqft > 0 else 0
-    @staticmethod
+    @_columnwise(lambda sqft, rate=8.0, minimum=80.0: np.where(sqft > 0, np.maximum((sqft / 100) * rate, minimum), minimum))
     def allowable_duct_leakage(sqft, rate=8.0, minimum=80.0): return max((sqft / 100) * rate, minimum) if sqft and sqft > 0 else minimum
-    @staticmethod
+    @_columnwise(lambda cfm, tons: _per(np.nan_to_num(cfm), tons, tons > 0))
     def cfm_per_ton(cfm, tons): return (cfm or 0) / tons if tons and tons > 0 else 0
-    @staticmethod
+    @_columnwise(lambda ret_iwc, sup_iwc: np.abs(np.nan_to_num(ret_iwc)) + np.abs(np.nan_to_num(sup_iwc)))
     def total_external_sp(ret_iwc, sup_iwc): return abs(ret_iwc or 0) + abs(sup_iwc or 0)
-    @staticmethod
+    @_columnwise(lambda bdcfm, sqft, ceiling_height=8: _per(np.nan_to_num(bdcfm) * 60, sqft * ceiling_height, sqft > 0))
     def ach50(bdcfm, sqft, ceiling_height=8): return (bdcfm or 0) * 60 / (sqft * ceiling_height) if sqft and sqft > 0 else 0
-    @staticmethod
+    @_columnwise(lambda sqft, factor=500: _per(sqft, factor, sqft > 0))
     def recommended_tonnage(sqft, factor=500): return sqft / factor if sqft and sqft > 0 else 0
-    @staticmethod
+    @_columnwise(lambda ach50, n=17: np.nan_to_num(ach50) / n)
     def natural_ach(ach50, n=17): return ach50 / n if ach50 else 0
-    @staticmethod
+    @_columnwise(lambda sqft, br: 0.01 * np.nan_to_num(sqft) + 7.5 * (np.where(np.nan_to_num(br) != 0, np.nan_to_num(br), 2) + 1))
     def required_ventilation_cfm(sqft, br): return 0.01 * (sqft or 0) + 7.5 * ((br or 2) + 1)
+    
+    @classmethod
+    def derive(cls, data):
+        """Derived columns for a whole dataset: a ProjectStore gives {name: float64 array}, a DataFrame with
+        DSLD column names a copy with the columns added. TDLAllowable applies the Fn41 limits from 3 returns."""
+        def col(field):
+            if not isinstance(data, ProjectStore):
+                return data[field] if field in data else pd.Series(np.nan, index=data.index)
+            values, valid = data.numeric(field)
+            return np.where(valid, values, np.nan)
+        living = col('Living')
+        fn41 = np.nan_to_num(np.asarray(col('ReturnCount'), dtype=float)) >= 3
+        ach50 = cls.ach50(col('BDCFM'), living)
+        derived = {'TDLPer100': cls.duct_leakage_per_100(col('TDLCFM'), living),
+                   'LTOPer100': cls.duct_leakage_per_100(col('LTOCFM'), living),
+                   'TDLAllowable': cls.allowable_duct_leakage(living, np.where(fn41, 12.0, 8.0), np.where(fn41, 120.0, 80.0)),
+                   'LTOAllowable': cls.allowable_duct_leakage(living, 4.0, 40.0),
+                   'CFMPerTon': cls.cfm_per_ton(col('MeasuredCFM'), col('Tonnage')),
+                   'TotalESP': cls.total_external_sp(col('ReturnIWC'), col('SupplyIWC')),
+                   'ACH50': ach50, 'NaturalACH': cls.natural_ach(ach50)}
+        return derived if isinstance(data, ProjectStore) else data.assign(**derived)
 
 class ThemeManager:
     LIGHT = {'name': 'Light', 'bg': '#f5f5f5', 'fg': '#1a1a1a', 'bg_alt': '#ffffff', 'accent': '#1e5799',
@@ -340,9 +1862,396 @@ class ThemeManager:
     def get(self, key): return self.current.get(key, '#000000')
     def is_dark(self): return self.current == self.DARK
 
+class ChartData:
+    """Everything the chart tab plots, aggregated column-wise from the projects in one pass: histograms
+    as (counts, edges), scatter series as (x, y) arrays and per-region tallies. Filters match the old
+    per-project loops (missing values skipped, rates only where Living > 0). rows limits it to those
+    store rows, e.g. one subdivision."""
+    BINS = 20
+    FIELDS = ['TDLCFM', 'LTOCFM', 'Living', 'MeasuredCFM', 'Tonnage', 'Charge', 'MeasuredWattage', 'ReturnIWC', 'SupplyIWC']
+    
+    def __init__(self, projects, rows=None):
+        store = projects if isinstance(projects, ProjectStore) else ProjectStore(projects)
+        index = ProjectIndex(store)
+        def coded(field):
+            codes, categories = store.coded(field)
+            return (codes if rows is None else codes[rows]), categories
+        v = {f: index._numeric(f, rows) for f in self.FIELDS}
+        has = {f: ~np.isnan(x) for f, x in v.items()}
+        living, tdl, lto = v['Living'], v['TDLCFM'], v['LTOCFM']
+        sized = living > 0
+        codes, categories = coded('PassFail1')
+        labels = np.array([str(c).lower() for c in categories] + ['', 'none'])
+        pf = labels[codes]
+        passed = pf == 'pass'
+        self.count = len(pf)
+        self.pass_fail = (int(passed.sum()), int((pf == 'fail').sum()), int((~passed & (pf != 'fail')).sum()))
+        confirmed = int(index._categorical('RatingType', rows)[0].sum())
+        self.ratings = (confirmed, self.count - confirmed)
+    
+        both = has['TDLCFM'] & has['LTOCFM']
+        self.tdl_lto = (tdl[both], lto[both])
+        self.tdl_living = (living[has['TDLCFM'] & has['Living'] & (living != 0)], tdl[has['TDLCFM'] & has['Living'] & (living != 0)])
+        self.tdl_hist = self._hist(tdl[has['TDLCFM']])
+        per_100 = ConstructionCalculators.duct_leakage_per_100
+        self.tdl_rate_hist = self._hist(per_100(tdl, living)[has['TDLCFM'] & sized])
+        self.lto_rate_hist = self._hist(per_100(lto, living)[has['LTOCFM'] & sized])
+    
+        cfm, tons = v['MeasuredCFM'], v['Tonnage']
+        rated = has['MeasuredCFM'] & (cfm != 0) & (tons > 0)
+        self.cfm_per_ton_hist = self._hist(ConstructionCalculators.cfm_per_ton(cfm, tons)[rated])
+        self.charge_hist = self._hist(v['Charge'][has['Charge']])
+        sized_hvac = has['Tonnage'] & (tons != 0) & has['Living'] & (living != 0)
+        self.tons_living = (living[sized_hvac], tons[sized_hvac])
+        self.wattage_hist = self._hist(v['MeasuredWattage'][has['MeasuredWattage']])
+    
+        ret, sup = np.abs(v['ReturnIWC']), np.abs(v['SupplyIWC'])
+        paired = has['ReturnIWC'] & has['SupplyIWC']
+        self.return_supply = (ret[paired], sup[paired])
+        self.return_hist = self._hist(ret[has['ReturnIWC']])
+        self.supply_hist = self._hist(sup[has['SupplyIWC']])
+        self.esp_hist = self._hist(ConstructionCalculators.total_external_sp(v['ReturnIWC'], v['SupplyIWC'])[paired])
+    
+        region = coded('Region')
+        self.regions = self._regions(region, 20, passed, tdl, has['TDLCFM'])
+        self.regions_short = self._regions(region, 15, passed, tdl, has['TDLCFM'])
+    
+    @classmethod
+    def _hist(cls, values):
+        return np.histogram(values, bins=cls.BINS) if len(values) else None
+    
+    @staticmethod
+    def _regions(region, width, passed, tdl, has_tdl):
+        """[(name, count, passes, tdl_sum, tdl_count)] by descending count, names cut to width
+        characters (absent -> 'Unknown', None -> 'None'), ties in order of first appearance."""
+        codes, categories = region
+        names = [str(c)[:width] for c in categories] + ['Unknown', 'None']
+        slot = np.where(codes < 0, codes + len(names), codes)
+        size = len(names)
+        counts = np.bincount(slot, minlength=size)
+        passes = np.bincount(slot, weights=passed, minlength=size)
+        tdl_sum = np.bincount(slot[has_tdl], weights=tdl[has_tdl], minlength=size)
+        tdl_count = np.bincount(slot[has_tdl], minlength=size)
+        seen, first = np.unique(slot, return_index=True)
+        groups = {}
+        for s in seen[np.argsort(first)].tolist():
+            g = groups.setdefault(names[s], [0, 0, 0.0, 0])
+            g[0] += int(counts[s]); g[1] += int(passes[s]); g[2] += float(tdl_sum[s]); g[3] += int(tdl_count[s])
+        return sorted(((name, *g) for name, g in groups.items()), key=lambda r: -r[1])
+
+class ChartRenderer:
+    """Draws the chart tab's 2x2 panels from a ChartData onto a matplotlib Figure, independent of Tk.
+    Artists filled with a theme colour carry the theme key as their gid so restyle() can recolour a
+    drawn figure for another theme without rebuilding it."""
+    CHARTS = {'Overview': '_overview', 'Duct Leakage': '_duct', 'HVAC': '_hvac', 'Static Pressure': '_pressure', 'By Region': '_region'}
+    
+    def __init__(self, theme, max_points=5000, dense_mode='hexbin'):
+        self.theme = theme
+        self.max_points, self.dense_mode = max_points, dense_mode
+    
+    def draw(self, fig, chart_type, data):
+        with PERF.measure(f'ChartRenderer.draw ({chart_type})', rows=data.count):
+            fig.set_facecolor(self.theme['bg'])
+            getattr(self, self.CHARTS[chart_type])(fig, data)
+            fig.tight_layout(pad=3.0)
+    
+    def restyle(self, fig):
+        t = self.theme
+        fig.set_facecolor(t['bg'])
+        for ax in fig.axes:
+            ax.set_facecolor(t['bg_alt'])
+            for text in (ax.title, ax.xaxis.label, ax.yaxis.label):
+                text.set_color(t['fg'])
+            ax.tick_params(colors=t['fg'])
+        for artist in fig.findobj(lambda a: a.get_gid() in t):
+            artist.set_facecolor(t[artist.get_gid()])
+    
+    def _axes(self, fig, n):
+        return fig.add_subplot(2, 2, n, facecolor=self.theme['bg_alt'])
+    
+    def _label(self, ax, title, xlabel=None, ylabel=None, ticks=True):
+        fg = self.theme['fg']
+        if xlabel: ax.set_xlabel(xlabel, color=fg)
+        if ylabel: ax.set_ylabel(ylabel, color=fg)
+        ax.set_title(title, color=fg)
+        if ticks: ax.tick_params(colors=fg)
+    
+    def _themed(self, artists, keys):
+        for artist, key in zip(artists, keys):
+            artist.set_gid(key)
+            artist.set_facecolor(self.theme[key])
+    
+    def _hist(self, ax, hist, color):
+        if hist is None: return False
+        counts, edges = hist
+        _, _, patches = ax.hist(edges[:-1], bins=edges, weights=counts, color=self.theme.get(color, color), edgecolor='white')
+        if color in self.theme: self._themed(patches, [color] * len(patches))
+        return True
+    
+    def _scatter(self, ax, xy, alpha, title, xlabel, ylabel):
+        """Scatter of xy, labelled. Past max_points it becomes a hexbin density map or a stratified
+        sample, named in the title, so drawing time stops growing with the dataset."""
+        x, y = xy
+        n = len(x)
+        if n > self.max_points and self.dense_mode == 'hexbin':
+            hb = ax.hexbin(x, y, gridsize=50, bins='log', mincnt=1, cmap='viridis')
+            bar = ax.figure.colorbar(hb, ax=ax)
+            bar.set_label('Lots', color=self.theme['fg'])
+            bar.ax.tick_params(colors=self.theme['fg'])
+            title += f' (density, {n:,} lots)'
+        elif n > self.max_points:
+            keep = self.sample(x, y, self.max_points)
+            self._themed([ax.scatter(x[keep], y[keep], alpha=alpha)], ['accent'])
+            title += f' (sample {len(keep):,} of {n:,})'
+        elif n:
+            self._themed([ax.scatter(x, y, alpha=alpha)], ['accent'])
+        self._label(ax, title, xlabel, ylabel)
+        return n > 0
+    
+    @staticmethod
+    def sample(x, y, limit, cells=20, seed=0):
+        """Indices of at most limit points: the limit // 8 lowest and highest on each axis (the outliers
+        a uniform sample would drop), then the rest of the budget spread over a cells x cells grid in
+        proportion to each cell's count. Seeded, so a redraw shows the same points."""
+        n, tail = len(x), max(limit // 8, 1)
+        outliers = np.zeros(n, dtype=bool)
+        for v in (x, y):
+            order = np.argpartition(v, (tail, n - tail - 1))
+            outliers[order[:tail]] = outliers[order[n - tail:]] = True
+        rest = np.flatnonzero(~outliers)
+        rest = np.random.default_rng(seed).permutation(rest)
+        cell = np.zeros(len(rest), dtype=np.int64)
+        for v in (x, y):
+            edges = np.linspace(v[rest].min(), v[rest].max(), cells + 1) if len(rest) else np.zeros(cells + 1)
+            cell = cell * cells + np.clip(np.searchsorted(edges, v[rest], side='right') - 1, 0, cells - 1)
+        counts = np.bincount(cell, minlength=cells * cells)
+        quota = np.ceil(counts * (limit - np.count_nonzero(outliers)) / max(len(rest), 1)).astype(np.int64)
+        order = np.argsort(cell, kind='stable')  # random order within each cell
+        starts = np.cumsum(counts) - counts
+        rank = np.empty(len(rest), dtype=np.int64)
+        rank[order] = np.arange(len(rest)) - starts[cell[order]]
+        keep = np.concatenate([np.flatnonzero(outliers), rest[rank < quota[cell]]])
+        return np.sort(keep[:limit])
+    
+    def _overview(self, fig, data):
+        ax1 = self._axes(fig, 1)
+        if any(data.pass_fail):
+            ax1.pie(data.pass_fail, labels=['Pass', 'Fail', 'Other'], autopct='%1.0f%%', colors=['#28a745', '#dc3545', '#6c757d'])
+        self._label(ax1, 'Pass/Fail Distribution', ticks=False)
+    
+        ax2 = self._axes(fig, 2)
+        self._hist(ax2, data.tdl_hist, 'accent')
+        self._label(ax2, 'Total Duct Leakage Distribution', 'TDL CFM25', 'Count')
+    
+        ax3 = self._axes(fig, 3)
+        self._themed(ax3.bar(['Confirmed', 'Projected'], data.ratings), ['success', 'warning'])
+        self._label(ax3, 'Rating Types')
+    
+        ax4 = self._axes(fig, 4)
+        top = data.regions_short[:8]
+        if top:
+            self._themed(ax4.barh([t[0] for t in top], [t[1] for t in top]), ['accent'] * len(top))
+        self._label(ax4, 'Projects by Region')
+    
+    def _duct(self, fig, data):
+        ax1 = self._axes(fig, 1)
+        if self._scatter(ax1, data.tdl_lto, 0.6, 'TDL vs LTO', 'TDL CFM25', 'LTO CFM25'):
+            top = data.tdl_lto[0].max()
+            ax1.plot([0, top], [0, top], 'r--', alpha=0.5, label='1:1')
+    
+        ax2 = self._axes(fig, 2)
+        if self._hist(ax2, data.tdl_rate_hist, 'accent'):
+            ax2.axvline(8, color='red', linestyle='--', label='Limit (8)')
+            ax2.axvline(12, color='orange', linestyle='--', label='Fn41 (12)')
+        self._label(ax2, 'TDL Rate Distribution', 'CFM25/100sqft')
+        ax2.legend()
+    
+        ax3 = self._axes(fig, 3)
+        if self._hist(ax3, data.lto_rate_hist, '#17a2b8'):
+            ax3.axvline(4, color='red', linestyle='--', label='Limit (4)')
+        self._label(ax3, 'LTO Rate Distribution', 'CFM25/100sqft')
+        ax3.legend()
+    
+        ax4 = self._axes(fig, 4)
+        self._scatter(ax4, data.tdl_living, 0.5, 'TDL vs Living Area', 'Living Sqft', 'TDL CFM25')
+    
+    def _hvac(self, fig, data):
+        ax1 = self._axes(fig, 1)
+        if self._hist(ax1, data.cfm_per_ton_hist, 'accent'):
+            ax1.axvline(350, color='red', linestyle='--')
+            ax1.axvline(450, color='red', linestyle='--')
+        self._label(ax1, 'Airflow per Ton', 'CFM/Ton')
+    
+        ax2 = self._axes(fig, 2)
+        if self._hist(ax2, data.charge_hist, '#17a2b8'):
+            ax2.axvline(-0.05, color='red', linestyle='--')
+            ax2.axvline(0.05, color='red', linestyle='--')
+        self._label(ax2, 'Refrigerant Charge', 'Charge Variance')
+    
+        ax3 = self._axes(fig, 3)
+        self._scatter(ax3, data.tons_living, 0.5, 'Tonnage vs Living Area', 'Living Sqft', 'Tonnage')
+    
+        ax4 = self._axes(fig, 4)
+        self._hist(ax4, data.wattage_hist, '#ffc107')
+        self._label(ax4, 'Measured Wattage', 'Watts')
+    
+    def _pressure(self, fig, data):
+        ax1 = self._axes(fig, 1)
+        if self._scatter(ax1, data.return_supply, 0.6, 'Return vs Supply Static', 'Return IWC', 'Supply IWC'):
+            ax1.axvline(0.20, color='red', linestyle='--', alpha=0.7)
+            ax1.axhline(0.25, color='red', linestyle='--', alpha=0.7)
+    
+        for n, hist, color, limit, title, xlabel in [
+                (2, data.return_hist, '#28a745', 0.20, 'Return Static Pressure', 'IWC'),
+                (3, data.supply_hist, '#17a2b8', 0.25, 'Supply Static Pressure', 'IWC'),
+                (4, data.esp_hist, '#6f42c1', 0.45, 'Total External Static Pressure', 'Total ESP (IWC)')]:
+            ax = self._axes(fig, n)
+            if self._hist(ax, hist, color):
+                ax.axvline(limit, color='red', linestyle='--', label=f'Max {limit:.2f}')
+            self._label(ax, title, xlabel)
+            ax.legend()
+    
+    def _region(self, fig, data):
+        top = data.regions[:10]
+        names = [t[0] for t in top]
+        counts = [t[1] for t in top]
+        pass_rates = [t[2] / t[1] * 100 if t[1] > 0 else 0 for t in top]
+        avg_tdl = [t[3] / t[4] if t[4] > 0 else 0 for t in top]
+    
+        ax1 = self._axes(fig, 1)
+        self._themed(ax1.barh(names, counts), ['accent'] * len(names))
+        self._label(ax1, 'Projects by Region', 'Project Count')
+    
+        ax2 = self._axes(fig, 2)
+        ax2.barh(names, pass_rates, color=['#28a745' if r >= 90 else '#ffc107' if r >= 70 else '#dc3545' for r in pass_rates])
+        self._label(ax2, 'Pass Rate by Region', 'Pass Rate (%)')
+        ax2.set_xlim(0, 100)
+    
+        ax3 = self._axes(fig, 3)
+        ax3.barh(names, avg_tdl, color='#17a2b8')
+        self._label(ax3, 'Avg TDL by Region', 'Avg TDL CFM25')
+    
+        ax4 = self._axes(fig, 4)
+        if counts:
+            ax4.pie(counts[:6], labels=names[:6], autopct='%1.0f%%')
+        self._label(ax4, 'Top Regions Share', ticks=False)
+
+class ChartPack:
+    """Weekly chart packs rendered off-screen: every ChartRenderer chart for all projects, each region and
+    each region/subdivision, written as OUT/<group>.pdf (one page per chart) and/or OUT/<group>/<chart>.png.
+    Each group's ChartData is aggregated once here and shared by all of its figures; the drawing runs on
+    the Agg canvas (no Tk) in worker processes, several groups per task."""
+    LEVELS = ['region', 'subdivision']
+    FORMATS = ['pdf', 'png']
+    MIN_PARALLEL_GROUPS = 8  # below this, starting the worker processes costs more than it saves
+    
+    def __init__(self, out_dir, levels=None, formats=('pdf',), workers=None, theme=None, max_points=5000, dense_mode='hexbin'):
+        self.out_dir = out_dir
+        self.levels = list(levels or self.LEVELS)
+        self.formats = list(formats)
+        self.workers = workers or os.cpu_count() or 1
+        self.theme = theme or ThemeManager.LIGHT
+        self.max_points, self.dense_mode = max_points, dense_mode
+    
+    @staticmethod
+    def _labels(store, field):
+        codes, categories = store.coded(field)
+        names = np.array([str(c).strip() or 'Unknown' for c in categories] + ['Unknown', 'Unknown'], dtype=object)
+        return names[codes]
+    
+    @staticmethod
+    def _split(labels, rows):
+        """[(label, rows)] sorted by label."""
+        names, inverse = np.unique(labels, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        return list(zip(names.tolist(), np.split(rows[order], np.cumsum(np.bincount(inverse, minlength=len(names)))[:-1])))
+    
+    def groups(self, store):
+        """[(name, rows)], all projects first (rows None), then each region and region/subdivision asked for."""
+        out = [('All Projects', None)]
+        rows = np.arange(len(store))
+        region = self._labels(store, 'Region')
+        subdivision = self._labels(store, 'Subdivision1') if 'subdivision' in self.levels else None
+        for name, in_region in self._split(region, rows):
+            if 'region' in self.levels:
+                out.append((name, in_region))
+            if subdivision is not None:
+                out += [(f"{name} - {sub}", r) for sub, r in self._split(subdivision[in_region], in_region)]
+        return out
+    
+    @PERF.timed('ChartPack.run', rows=len)
+    def run(self, projects, progress=None, check=None):
+        """Render every group; returns the written paths. progress(done, total) counts groups and
+        check() is called between tasks (raise to stop)."""
+        store = projects if isinstance(projects, ProjectStore) else ProjectStore(projects)
+        tasks, slugs = [], set()
+        for name, rows in self.groups(store):
+            if check: check()
+            slug = base = re.sub(r'[^\w.-]+', '_', name).strip('_') or 'Unknown'
+            n = 1
+            while slug.lower() in slugs:
+                n += 1
+                slug = f"{base}_{n}"
+            slugs.add(slug.lower())
+            tasks.append((name, slug, ChartData(store, rows)))
+        os.makedirs(self.out_dir, exist_ok=True)
+        options = (self.out_dir, self.formats, self.theme, self.max_points, self.dense_mode)
+        size = max(1, -(-len(tasks) // (self.workers * 4)))
+        chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+        written = []
+        def collect(paths, done):
+            written.extend(paths)
+            if progress: progress(done, len(tasks))
+            if check: check()
+        if self.workers <= 1 or len(tasks) < self.MIN_PARALLEL_GROUPS:
+            for n, chunk in enumerate(chunks):
+                collect(_render_chart_pack(chunk, *options), min((n + 1) * size, len(tasks)))
+        else:
+            pool = _process_pool(min(self.workers, len(chunks)))
+            try:
+                futures = [pool.submit(_render_chart_pack, chunk, *options) for chunk in chunks]
+                for n, future in enumerate(futures, 1):
+                    collect(future.result(), min(n * size, len(tasks)))
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+        return written
+
+def _render_chart_pack(tasks, out_dir, formats, theme, max_points, dense_mode):
+    # Worker side of ChartPack: draw each group's charts with matplotlib's Agg canvas and save them
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.backends.backend_pdf import PdfPages
+    renderer = ChartRenderer(theme, max_points, dense_mode)
+    written = []
+    for name, slug, data in tasks:
+        figures = []
+        for chart_type in ChartRenderer.CHARTS:
+            fig = Figure(figsize=(12, 8), dpi=100)
+            FigureCanvasAgg(fig)
+            renderer.draw(fig, chart_type, data)
+            fig.suptitle(f"{name} - {chart_type} ({data.count:,} projects)", color=theme['fg'], fontweight='bold')
+            figures.append((chart_type, fig))
+        if 'png' in formats:
+            os.makedirs(os.path.join(out_dir, slug), exist_ok=True)
+            for chart_type, fig in figures:
+                path = os.path.join(out_dir, slug, chart_type.lower().replace(' ', '_') + '.png')
+                fig.savefig(path)
+                written.append(path)
+        if 'pdf' in formats:
+            path = os.path.join(out_dir, slug + '.pdf')
+            with PdfPages(path) as pdf:
+                for _, fig in figures:
+                    pdf.savefig(fig)
+            written.append(path)
+    return written
+
 class ConfigManager:
     DEFAULT = {'builder_home_id_template': '{Subdivision1}_Lot{Lot1}', 'target_energy_star_version': 'ENERGY STAR 3.2',
-               'current_user': '', 'theme': 'dark', 'default_orientation': 'N'}
+               'current_user': '', 'theme': 'dark', 'default_orientation': 'N',
+               'audit_workers': 0, 'audit_chunk_size': 2000,  # audit_workers 0 = one per CPU core
+               'project_cache_mb': 500,  # 0 turns the on-disk project cache off
+               'chart_max_points': 5000, 'chart_dense_mode': 'hexbin',  # larger scatters: 'hexbin' or 'sample'
+               'rem_merge_policy': 'report'}  # REM keys already loaded: 'replace', 'keep', or 'report' (ask)
     def __init__(self):
         ensure_config_dir()
         self.config = self._load()
@@ -358,6 +2267,179 @@ class ConfigManager:
     def get(self, key, default=None): return self.config.get(key, default)
     def set(self, key, value): self.config[key] = value; self.save()
 
+class ProjectKeys:
+    """Keys for loaded rows: Subdivision_LotN built over the Subdivision1/Lot1 columns of a chunk at once,
+    with RowN[_address] for rows missing either one. A key already taken gets "_<row>" appended and is
+    recorded in duplicates (natural key -> source rows, first row included) in the same hash pass.
+    rows (key -> source row) persists across add() calls, so streamed chunks and later merges look keys
+    up in O(1); existing is an extra container of taken keys (a store, or keys from an earlier load)."""
+    def __init__(self, existing=()):
+        self.existing = existing
+        self.rows = {}
+        self.duplicates = {}
+        self.missing_cols = []
+    
+    def __contains__(self, key): return key in self.rows or key in self.existing
+    def __len__(self): return len(self.rows)
+    
+    @staticmethod
+    def natural_keys(subs, lots):
+        """Subdivision_LotN per row, None where either column is empty."""
+        return [f"{s}_Lot{l}" if s and l else None for s, l in zip(subs, lots)]
+    
+    def add(self, projects, start=0):
+        """Key one chunk (rows numbered from start); returns {key: project} for its non-empty rows."""
+        projects = [p or None for p in projects]
+        keys = self.natural_keys([p and p.get('Subdivision1') for p in projects], [p and p.get('Lot1') for p in projects])
+        rows, duplicates, existing = self.rows, self.duplicates, self.existing
+        keyed = {}
+        for i, (p, key) in enumerate(zip(projects, keys), start):
+            if p is None: continue
+            if key is None:
+                addr = p.get('StreetAddress', '') or ''
+                key = f"Row{i+1}_{addr[:20]}" if addr else f"Row{i+1}"
+                if not self.missing_cols:
+                    self.missing_cols = [c for c in ['Subdivision1', 'Lot1'] if not p.get(c)]
+            elif key in rows or key in existing:
+                dup = duplicates.get(key)
+                if dup is None:
+                    dup = duplicates[key] = [rows[key]] if key in rows else []
+                dup.append(i)
+                key = f"{key}_{i}"
+            rows[key] = i
+            keyed[key] = p
+        return keyed
+    
+    @staticmethod
+    def report(duplicates, limit=10):
+        """One line per duplicated Subdivision/Lot (1-based source rows), at most limit lines."""
+        lines = [f"{key}: rows {', '.join(str(r + 1) for r in rows)}" for key, rows in list(duplicates.items())[:limit]]
+        if len(duplicates) > limit:
+            lines.append(f"... and {len(duplicates) - limit} more")
+        return lines
+
+class FieldCoercer:
+    """Load-time typing of the DSLDSchema.NUMERIC_FIELDS and DATE_FIELDS columns, a whole column of a chunk
+    at a time: numbers become int (whole values) or float, dates YYYY-MM-DD text. A cell that is there but
+    does not parse becomes None and is counted in counts (field -> cells); errors keeps the first
+    MAX_ERRORS of them as (source row, field, raw text). Rows are numbered as in ProjectKeys.
+    The other schema fields (TEXT) become text, so a lot, ZIP code or permit number has the same type
+    whether it came from a number cell in .xlsx/.xls or from .csv."""
+    NUMERIC = frozenset(DSLDSchema.NUMERIC_FIELDS)
+    DATES = frozenset(DSLDSchema.DATE_FIELDS)
+    TEXT = frozenset(DSLDSchema.ALL_FIELDS) - NUMERIC - DATES
+    # Tried in order on date text, each on the cells the earlier ones left; 'mixed' parses cell by cell
+    DATE_FORMATS = ['ISO8601', '%m/%d/%Y', '%m/%d/%y', 'mixed']
+    EXCEL_EPOCH = '1899-12-30'
+    MAX_ERRORS = 1000
+    
+    def __init__(self):
+        self.counts = {}
+        self.errors = []
+    
+    def __len__(self): return sum(self.counts.values())
+    
+    def column(self, field, values, start=0):
+        """values (one field of a chunk, rows numbered from start) typed for field; other fields come back as they are."""
+        if field in self.NUMERIC: return self.numeric(field, values, start)
+        if field in self.DATES: return self.dates(field, values, start)
+        if field in self.TEXT: return self.text(values)
+        return values
+    
+    def records(self, records, start=0):
+        """Type the schema fields of a chunk of records in place."""
+        fields = [f for f in (records[0] if records else ()) if f in self.NUMERIC or f in self.DATES or f in self.TEXT]
+        for f in fields:
+            for record, v in zip(records, self.column(f, [r.get(f) for r in records], start)):
+                record[f] = v
+        return records
+    
+    def numeric(self, field, values, start=0):
+        raw = self._array(values)
+        nums = pd.to_numeric(pd.Series(raw, dtype=object), errors='coerce').to_numpy(dtype='float64', na_value=np.nan, copy=True)
+        given = pd.notna(raw)
+        given &= ~self._blank(raw, given & np.isnan(nums))
+        retry = [i for i in np.flatnonzero(given & np.isnan(nums)).tolist() if type(raw[i]) is str]
+        if retry:
+            # Thousands separators, currency signs and padding, e.g. "1,850" or " $12 "
+            text = pd.Series(raw[retry]).str.replace(r'[,$\s]', '', regex=True)
+            nums[retry] = pd.to_numeric(text, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        ok = np.isfinite(nums)
+        self._bad(field, raw, given & ~ok, start)
+        whole = ok & (nums == np.round(nums)) & (np.abs(nums) < 2 ** 53)
+        out = np.where(whole, np.where(whole, nums, 0).astype(np.int64).astype(object), nums.astype(object))
+        out[~ok] = None
+        return out.tolist()
+    
+    def dates(self, field, values, start=0):
+        raw = self._array(values)
+        given = pd.notna(raw)
+        parsed = pd.Series(pd.NaT, index=range(len(raw)), dtype='datetime64[us]')
+        text = np.fromiter((type(v) is str for v in raw), bool, len(raw)) & given
+        blank = self._blank(raw, text)
+        given &= ~blank
+        text &= ~blank
+        serial = np.zeros(len(raw), dtype=bool)
+        serial[[i for i in np.flatnonzero(given & ~text).tolist() if isinstance(raw[i], numbers.Real) and not isinstance(raw[i], bool)]] = True
+        if text.any():
+            strings = pd.Series(raw[text], index=np.flatnonzero(text)).str.strip()
+            for fmt in self.DATE_FORMATS:
+                left = strings[parsed[strings.index].isna().to_numpy()]
+                if left.empty: break
+                parsed[left.index] = pd.to_datetime(left, format=fmt, errors='coerce')
+        if serial.any():
+            # Unformatted Excel date cells hold day numbers
+            days = raw[serial].astype('float64')
+            days[days <= 0] = np.nan
+            parsed[np.flatnonzero(serial)] = pd.to_datetime(days, unit='D', origin=self.EXCEL_EPOCH, errors='coerce')
+        other = given & ~text & ~serial
+        if other.any():
+            parsed[np.flatnonzero(other)] = pd.to_datetime(pd.Series(raw[other]), errors='coerce')
+        ok = parsed.notna().to_numpy()
+        self._bad(field, raw, given & ~ok, start)
+        out = parsed.dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+        out[~ok] = None
+        return out.tolist()
+    
+    @staticmethod
+    def text(values):
+        # Number cells as the sheet shows them: 1.0 (a float64 column with blanks) -> "1", 1.5 -> "1.5"
+        return [v if v is None or type(v) is str else str(int(v)) if isinstance(v, float) and v.is_integer() else str(v)
+                for v in values]
+    
+    @staticmethod
+    def _array(values):
+        raw = np.empty(len(values), dtype=object)
+        raw[:] = values
+        return raw
+    
+    @staticmethod
+    def _blank(raw, mask):
+        # The cells of mask holding '' or whitespace-only text, which are missing values like None/NaN
+        blank = np.zeros(len(raw), dtype=bool)
+        for i in np.flatnonzero(mask).tolist():
+            if type(raw[i]) is str and not raw[i].strip(): blank[i] = True
+        return blank
+    
+    def _bad(self, field, raw, mask, start):
+        bad = np.flatnonzero(mask)
+        if not len(bad): return
+        self.counts[field] = self.counts.get(field, 0) + len(bad)
+        for i in bad[:self.MAX_ERRORS - len(self.errors)].tolist():
+            self.errors.append((start + i, field, str(raw[i])))
+    
+    @staticmethod
+    def report(counts, errors, limit=10, examples=3):
+        """One line per field with cells that did not parse (count, then the first 1-based source rows and values)."""
+        seen = {}
+        for row, field, value in errors:
+            seen.setdefault(field, [])
+            if len(seen[field]) < examples: seen[field].append(f"row {row + 1} {value!r}")
+        lines = [f"{field}: {n} cell{'s' if n != 1 else ''} ({', '.join(seen.get(field, []))})" for field, n in list(counts.items())[:limit]]
+        if len(counts) > limit:
+            lines.append(f"... and {len(counts) - limit} more fields")
+        return lines
+
 class ExcelLoader:
     # Column alias map: maps various SQL export names -> internal standard name
     # Supports multiple export formats (with/without numbers, spaces, etc.)
@@ -401,19 +2483,27 @@ class ExcelLoader:
         'MeasuredWattage':  ['MeasuredWattage', 'Measured Wattage'],
         'Charge':           ['Charge', 'RefrigerantCharge', 'Refrigerant Charge'],
     }
+    # Compiled once: any alias (lowercase, no spaces) -> standard name
+    ALIAS_LOOKUP = {alias.lower().replace(' ', '').strip(): standard for standard, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    
+    # Resolved header layouts, fingerprint of the raw header row -> plan (see _plan); exports repeat a few layouts
+    _PLANS = {}
+    PLAN_CACHE_SIZE = 64
+    
+    # Cell strings pandas reads as NaN by default, plus Excel error values (pandas' openpyxl reader drops those too)
+    NA_STRINGS = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+                            'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+                            '#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!'])
+    CHUNK_SIZE = 2000
     
     @staticmethod
-    def _normalize_columns(df):
-        """Normalize column names to internal standard names.
+    @PERF.timed('ExcelLoader._rename_map')
+    def _rename_map(columns):
+        """Map raw header names to internal standard names.
         Handles multiple SQL export formats (with/without numbers, spaces, etc.)"""
-        # Build reverse lookup: any alias (lowercase, no spaces) -> standard name
-        alias_map = {}
-        for standard, aliases in ExcelLoader.COLUMN_ALIASES.items():
-            for alias in aliases:
-                alias_map[alias.lower().replace(' ', '').strip()] = standard
-        
+        alias_map = ExcelLoader.ALIAS_LOOKUP
         rename_map = {}
-        for col in df.columns:
+        for col in columns:
             clean = str(col).strip()
             lookup = clean.lower().replace(' ', '')
             if lookup in alias_map:
@@ -422,29 +2512,411 @@ class ExcelLoader:
                     rename_map[col] = target
             elif clean != col:
                 rename_map[col] = clean  # At least strip whitespace
-        
+        return rename_map
+    
+    @staticmethod
+    def fingerprint(columns):
+        return hashlib.sha1('\x1f'.join(map(repr, columns)).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _plan(columns):
+        """Rename and dtype plan of a raw header row, resolved once per layout: rename (raw -> standard name),
+        names (the header after renaming), numeric and dates (the standard names present from
+        DSLDSchema.NUMERIC_FIELDS / DATE_FIELDS) and dtype, what the pandas readers are told per raw column:
+        text (object) for the other schema fields, so lots like "012", ZIP codes and dates are not inferred as numbers.
+        Numeric and unknown columns are still inferred."""
+        key = ExcelLoader.fingerprint(columns)
+        plan = ExcelLoader._PLANS.get(key)
+        if plan is not None:
+            PERF.count('ExcelLoader plan hits')
+            return plan
+        PERF.count('ExcelLoader plan misses')
+        rename = ExcelLoader._rename_map(columns)
+        names = [rename.get(c, c) for c in columns]
+        schema, numeric = set(DSLDSchema.ALL_FIELDS), set(DSLDSchema.NUMERIC_FIELDS)
+        plan = {'rename': rename, 'names': names,
+                'numeric': [n for n in names if n in numeric], 'dates': [n for n in names if n in DSLDSchema.DATE_FIELDS],
+                'dtype': {c: object for c, n in zip(columns, names) if n in schema and n not in numeric}}
+        if len(ExcelLoader._PLANS) >= ExcelLoader.PLAN_CACHE_SIZE:
+            ExcelLoader._PLANS.pop(next(iter(ExcelLoader._PLANS)))
+        ExcelLoader._PLANS[key] = plan
+        return plan
+    
+    @staticmethod
+    @PERF.timed('ExcelLoader._normalize_columns', rows=len)
+    def _normalize_columns(df):
+        """Normalize column names to internal standard names."""
+        rename_map = ExcelLoader._plan(list(df.columns))['rename']
         if rename_map:
             df = df.rename(columns=rename_map)
         return df
     
     @staticmethod
-    def load_file(filepath):
+    def _header_names(raw):
+        # Same naming pandas gives the header row: blanks become "Unnamed: n", repeats get ".1", ".2" ...
+        names, seen = [], {}
+        for j, col in enumerate(raw):
+            name = f"Unnamed: {j}" if col is None or (isinstance(col, str) and not col.strip()) else col
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return ExcelLoader._plan(names)['names']
+    
+    @staticmethod
+    def _cell(v):
+        # Whole floats always come back as int, also where pandas typed a column with blanks as float64
+        # (Lot 1.0): a deliberate change to builderHomeId / ZIP text, see CHANGES.md for migrating synced homes
+        if v is None: return None
+        if isinstance(v, str): return None if v in ExcelLoader.NA_STRINGS else v
+        if isinstance(v, float):
+            if v != v: return None
+            return int(v) if v.is_integer() else v
+        if isinstance(v, (datetime, date)): return v.strftime('%Y-%m-%d')
+        return v
+    
+    @staticmethod
+    def iter_chunks(filepath, chunk_size=None, coercer=None):
+        """Yield lists of normalized project records, at most chunk_size rows each, while the file is read.
+        .xlsx/.xlsm stream through openpyxl read-only mode, .csv through chunked pandas reads;
+        other formats (.xls) are read whole and then chunked. Schema fields come out typed the same way
+        for every format (see FieldCoercer); pass a coercer to get the cells that did not parse."""
+        coercer = coercer if coercer is not None else FieldCoercer()
+        return PERF.iterate('ExcelLoader.iter_chunks', ExcelLoader._read_chunks(filepath, chunk_size or ExcelLoader.CHUNK_SIZE, coercer))
+    
+    @staticmethod
+    def _read_chunks(filepath, chunk_size, coercer):
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext in ('.xlsx', '.xlsm'):
+            yield from ExcelLoader._iter_xlsx(filepath, chunk_size, coercer)
+            return
         if not HAS_PANDAS: raise Exception("pandas not installed")
-        df = pd.read_excel(filepath)
-        
-        # Normalize column names (handles extra spaces, different casing)
-        df = ExcelLoader._normalize_columns(df)
-        
-        projects = df.to_dict('records')
-        for p in projects:
-            for k, v in list(p.items()):
-                if pd.isna(v): p[k] = None
-                elif isinstance(v, pd.Timestamp): p[k] = v.strftime('%Y-%m-%d')
+        if ext == '.csv':
+            # The header row alone first, so the reader gets the layout's dtypes instead of inferring them
+            plan = ExcelLoader._plan(list(pd.read_csv(filepath, nrows=0).columns))
+            frames = pd.read_csv(filepath, chunksize=chunk_size, dtype=plan['dtype'])
+        else:
+            df = pd.read_excel(filepath)
+            frames = (df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size))
+        rename_map, start = None, 0
+        for frame in frames:
+            if rename_map is None:
+                rename_map = ExcelLoader._plan(list(frame.columns))['rename']
+            if rename_map:
+                frame = frame.rename(columns=rename_map)
+            # Records built from whole columns: NaN/NaT -> None, timestamps -> YYYY-MM-DD, schema fields typed
+            names = list(frame.columns)
+            with PERF.measure('FieldCoercer', rows=len(frame)):
+                columns = [coercer.column(name, ExcelLoader._column_values(frame.iloc[:, j]), start) for j, name in enumerate(names)]
+            start += len(frame)
+            yield [dict(zip(names, values)) for values in zip(*columns)]
+    
+    @staticmethod
+    def _column_values(series):
+        values = series.tolist()
+        for i in np.flatnonzero(series.isna().to_numpy()).tolist():
+            values[i] = None
+        if series.dtype.kind in 'MO':
+            values = [v.strftime('%Y-%m-%d') if isinstance(v, pd.Timestamp) else v for v in values]
+        return values
+    
+    @staticmethod
+    def _iter_xlsx(filepath, chunk_size, coercer):
+        import openpyxl
+        wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None: return
+            names = ExcelLoader._header_names(header)
+            cell = ExcelLoader._cell
+            chunk, blank_run, start = [], 0, 0
+            for row in rows:
+                values = [cell(v) for v in row]
+                if all(v is None for v in values):
+                    blank_run += 1  # trailing blank rows are dropped, as pandas does
+                    continue
+                if len(values) > len(names):
+                    names = ExcelLoader._header_names(list(header) + [None] * (len(values) - len(header)))
+                for _ in range(blank_run):
+                    chunk.append(dict.fromkeys(names))
+                blank_run = 0
+                record = dict.fromkeys(names)
+                record.update(zip(names, values))
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    yield ExcelLoader._typed(chunk, start, coercer)
+                    start += len(chunk)
+                    chunk = []
+            if chunk:
+                yield ExcelLoader._typed(chunk, start, coercer)
+        finally:
+            wb.close()
+    
+    @staticmethod
+    def _typed(chunk, start, coercer):
+        if not HAS_PANDAS: return chunk  # openpyxl alone still loads the workbook, untyped
+        with PERF.measure('FieldCoercer', rows=len(chunk)):
+            return coercer.records(chunk, start)
+    
+    @staticmethod
+    def assign_keys(projects, existing=(), start=0):
+        """Key projects as Subdivision_LotN, appending the row index on collisions and falling back
+        to RowN[_address] when the key columns are empty. Returns (keyed dict, missing key columns).
+        existing/start let streamed chunks be keyed one at a time; ProjectKeys also keeps the index
+        and the duplicate report across chunks."""
+        keys = ProjectKeys(existing)
+        return keys.add(projects, start), keys.missing_cols
+    
+    @staticmethod
+    @PERF.timed('ExcelLoader.load_file', rows=len)
+    def load_file(filepath, coercer=None):
+        projects = []
+        for chunk in ExcelLoader.iter_chunks(filepath, coercer=coercer):
+            projects.extend(chunk)
         return projects
 
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """Handle passed to background work: progress reports, Tk-thread callbacks and cancellation checks."""
+    def __init__(self, runner, name, writes):
+        self.runner, self.name, self.writes = runner, name, writes
+        self.cancel_event = threading.Event()
+    
+    @property
+    def cancelled(self): return self.cancel_event.is_set()
+    def cancel(self): self.cancel_event.set()
+    
+    def check(self):
+        if self.cancel_event.is_set(): raise JobCancelled(self.name)
+    
+    def progress(self, done, total=None, text=None):
+        self.runner.post(self.runner.on_progress, self, done, total, text)
+    
+    def post(self, callback, *args):
+        """Run callback(*args) on the Tk thread, in order with this job's other callbacks."""
+        self.runner.post(callback, *args)
+
+class JobRunner:
+    """Runs load/validate/comply/export work on a thread pool and hands every callback back to the
+    Tk thread through root.after. A job that writes all_projects never overlaps another data job."""
+    POLL_MS = 40
+    SLICE_MS = 30  # time per poll spent running posted callbacks, so the window keeps repainting
+    
+    def __init__(self, root, on_progress=None, on_idle=None, max_workers=2):
+        self.root = root
+        self.on_progress = on_progress or (lambda *a: None)
+        self.on_idle = on_idle
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dsld-job')
+        self.queue = queue.Queue()
+        self.running = []
+        self._polling = False
+    
+    def conflict(self, writes):
+        """Name of a running job a new job would clash with, else None."""
+        for job in self.running:
+            if writes or job.writes: return job.name
+        return None
+    
+    def submit(self, name, work, on_done=None, on_error=None, on_cancel=None, writes=False):
+        """Start work(job) in the pool; on_done(result) / on_error(exc) / on_cancel() run on the Tk thread.
+        Returns the Job, or None when a conflicting job is running."""
+        if self.conflict(writes): return None
+        job = Job(self, name, writes)
+        self.running.append(job)
+        def run():
+            try:
+                result = work(job)
+            except JobCancelled:
+                self.post(self._finish, job, on_cancel)
+            except Exception as e:
+                self.post(self._finish, job, on_error, e)
+            else:
+                self.post(self._finish, job, on_done, result)
+        self.executor.submit(run)
+        self._schedule()
+        return job
+    
+    def cancel_all(self):
+        for job in self.running:
+            job.cancel()
+    
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    def post(self, callback, *args):
+        self.queue.put((callback, args))
+    
+    def _finish(self, job, callback, *args):
+        if job in self.running: self.running.remove(job)
+        try:
+            if callback: callback(*args)
+        finally:
+            if not self.running and self.on_idle: self.on_idle()
+    
+    def _schedule(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+    
+    def _poll(self):
+        self._polling = False
+        deadline = time.perf_counter() + self.SLICE_MS / 1000
+        while time.perf_counter() < deadline:
+            try:
+                callback, args = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+        if self.running or not self.queue.empty():
+            self._schedule()
+
+class VirtualTreeview:
+    """Virtual list mode for a ttk.Treeview: only the rows that fit on screen exist as items. They are
+    refilled from the key list on scroll, so loading or filtering only swaps the list, whatever its size.
+    row_values(key) -> (values, tag) formats one row; selection is tracked by key. A plain click or arrow
+    key replaces the whole selection, off-screen rows included; Shift/Control(/Command) extend it."""
+    ITEM = 'row{}'
+    EXTEND_MASK = 0x0001 | 0x0004 | (0x0008 if sys.platform == 'darwin' else 0)  # Shift, Control, Command
+    
+    def __init__(self, tree, scrollbar, row_values, on_select=None):
+        self.tree, self.scrollbar, self.row_values, self.on_select = tree, scrollbar, row_values, on_select
+        self.keys = []
+        self.window = []
+        self.selected = set()
+        self.top = 0
+        self.visible = 30
+        self._mode = None  # 'replace' / 'extend' for the selection change a click or arrow key is about to make
+        tree.configure(yscrollcommand='')
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.bind('<Configure>', self._on_resize)
+        tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        tree.bind('<ButtonPress-1>', self._on_press)
+        tree.bind('<MouseWheel>', lambda e: self._scroll_event(-1 if e.delta > 0 else 1, 3))
+        tree.bind('<Button-4>', lambda e: self._scroll_event(-1, 3))
+        tree.bind('<Button-5>', lambda e: self._scroll_event(1, 3))
+        tree.bind('<Up>', lambda e: self._on_arrow(-1, e))
+        tree.bind('<Down>', lambda e: self._on_arrow(1, e))
+        tree.bind('<Prior>', lambda e: self._scroll_event(-1, self.visible))
+        tree.bind('<Next>', lambda e: self._scroll_event(1, self.visible))
+    
+    def set_rows(self, keys):
+        self.keys = list(keys)
+        self.selected.clear()
+        self.top = 0
+        self.refresh()
+    
+    def append_rows(self, keys):
+        self.keys.extend(keys)
+        if len(self.window) < self.visible: self.refresh()
+        else: self._update_scrollbar()
+    
+    def selection_keys(self):
+        return [k for k in self.keys if k in self.selected] if self.selected else []
+    
+    def select_all(self):
+        self.selected = set(self.keys)
+        self.refresh()
+    
+    def scroll(self, rows):
+        self.top += rows
+        self.refresh()
+    
+    def refresh(self):
+        total = len(self.keys)
+        self.top = max(0, min(self.top, total - self.visible))
+        window = self.keys[self.top:self.top + self.visible]
+        items = self.tree.get_children()
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+        for j in range(len(items), len(window)):
+            self.tree.insert('', 'end', iid=self.ITEM.format(j))
+        for j, key in enumerate(window):
+            values, tag = self.row_values(key)
+            self.tree.item(self.ITEM.format(j), values=values, tags=(tag,))
+        self.window = window
+        self._mode = None  # the select event of this selection_set only mirrors self.selected
+        self.tree.selection_set([self.ITEM.format(j) for j, k in enumerate(window) if k in self.selected])
+        self.tree.yview_moveto(0)
+        self._update_scrollbar()
+    
+    def _update_scrollbar(self):
+        total = len(self.keys)
+        if total <= self.visible: self.scrollbar.set(0, 1)
+        else: self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.top = int(float(amount) * len(self.keys))
+            self.refresh()
+        elif action == 'scroll':
+            self.scroll(int(amount) * (self.visible if unit == 'pages' else 1))
+    
+    def _scroll_event(self, direction, rows):
+        self.scroll(direction * rows)
+        return 'break'
+    
+    def _extends(self, event):
+        return bool(getattr(event, 'state', 0) & self.EXTEND_MASK)
+    
+    def _on_press(self, event):
+        if self.tree.identify_region(event.x, event.y) in ('cell', 'tree'):
+            self._mode = 'extend' if self._extends(event) else 'replace'
+    
+    def _on_arrow(self, step, event=None):
+        # Moving past the first/last visible row scrolls the window instead of the widget; Shift+arrow
+        # extends the selection by key (the Treeview itself would select only the new row)
+        extend = self._extends(event)
+        focus = self.tree.focus()
+        at = int(focus[3:]) if focus.startswith('row') else -1
+        target = self.top + at + step
+        if at < 0 or not 0 <= target < len(self.keys): return None
+        edge = not 0 <= at + step < len(self.window)
+        if not edge and not extend:
+            self._mode = 'replace'  # the Treeview moves focus and selection itself
+            return None
+        key = self.keys[target]
+        if extend: self.selected.add(key)
+        else: self.selected = {key}
+        if edge:
+            self.scroll(step)
+        else:
+            self.refresh()
+            focus = self.ITEM.format(at + step)
+        self.tree.focus(focus)
+        return 'break'
+    
+    def _on_resize(self, event):
+        try:
+            row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        except (TypeError, ValueError):
+            row_height = 20
+        visible = max(1, (event.height - 25) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+    
+    def _on_tree_select(self, event):
+        shown = set(self.tree.selection())
+        mode, self._mode = self._mode, None
+        if mode == 'replace':
+            self.selected = {key for j, key in enumerate(self.window) if self.ITEM.format(j) in shown}
+        else:
+            for j, key in enumerate(self.window):
+                if self.ITEM.format(j) in shown: self.selected.add(key)
+                else: self.selected.discard(key)
+        if self.on_select: self.on_select(event)
+
 class EkotropeSyncApp:
     def __init__(self):
-        self.root = tk.Tk()
+        load_gui_modules()
+        with STARTUP.measure('create Tk root'):
+            self.root = tk.Tk()
         self.root.title("DSLD Homes - Ekotrope Sync v9 (REM/Rate Integration)")
         self.root.geometry("1500x950")
         self.config = ConfigManager()
@@ -453,12 +2925,23 @@ class EkotropeSyncApp:
         self.json_gen = EkotropeJSONGenerator(self.config)
         self.calc = ConstructionCalculators()
         self.validator = DataValidator()
-        self.all_projects = {}
+        self.all_projects = new_project_store()
         self.validation_results = {}
         self.compliance_results = {}
+        self._comp_batch, self._comp_rows = None, {}
+        self.audit_cache = AuditCache()
+        self._project_index = None
+        self._chart_data, self._chart_figures = None, {}
+        self.project_cache = ProjectCache(max_mb=self.config.get('project_cache_mb', 500))
         self.current_user = self.config.get('current_user', 'Unknown')
-        self._apply_theme()
-        self._build_ui()
+        with STARTUP.measure('apply theme'):
+            self._apply_theme()
+        with STARTUP.measure('build UI'):
+            self._build_ui()
+        self.jobs = JobRunner(self.root, self._on_job_progress, self._on_jobs_idle)
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
+        if STARTUP.enabled:
+            self.root.after_idle(lambda: STARTUP.report('UI ready'))
         if not self.current_user or self.current_user == 'Unknown': self._prompt_user()
     
     def _apply_theme(self):
@@ -488,7 +2971,7 @@ class EkotropeSyncApp:
         self._apply_theme()
         self.theme_btn.config(text=" Light" if self.theme.is_dark() else " Dark")
         self._update_tree_tags()
-        if HAS_MATPLOTLIB: self.refresh_charts()
+        if Figure is not None: self._restyle_charts()
     
     def _update_tree_tags(self):
         t = self.theme.current
@@ -532,7 +3015,7 @@ class EkotropeSyncApp:
         fm.add_command(label="Export to REM XML...", command=self.export_rem_xml)
         fm.add_command(label="Export to REM CSV...", command=self.export_rem_csv)
         fm.add_separator()
-        fm.add_command(label="Exit", command=self.root.quit)
+        fm.add_command(label="Exit", command=self._on_close)
         menubar.add_cascade(label="File", menu=fm)
         sm = tk.Menu(menubar, tearoff=0)
         sm.add_command(label="Configure Template...", command=self.configure_template)
@@ -564,6 +3047,9 @@ class EkotropeSyncApp:
         self.rem_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.rem_tab, text="   REM/Rate  ")
         self._build_rem_tab()
+        self.diag_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.diag_tab, text="   Diagnostics  ")
+        self._build_diagnostics_tab()
         
         # Status bar
         status_frame = ttk.Frame(self.root)
@@ -572,6 +3058,10 @@ class EkotropeSyncApp:
         self.status.pack(fill='x', side='left', expand=True)
         self.count_lbl = ttk.Label(status_frame, text="0 projects", relief='sunken', width=15)
         self.count_lbl.pack(side='right')
+        self.cancel_btn = ttk.Button(status_frame, text="Cancel", command=self.cancel_jobs, state='disabled', width=8)
+        self.cancel_btn.pack(side='right', padx=2)
+        self.progress = ttk.Progressbar(status_frame, length=160, mode='determinate')
+        self.progress.pack(side='right', padx=2)
     
     def _build_export_tab(self):
         main = ttk.Frame(self.export_tab)
@@ -609,6 +3099,11 @@ class EkotropeSyncApp:
         self.status_cb.pack(side='left', padx=5)
         self.status_cb.bind('<<ComboboxSelected>>', lambda e: self.apply_filters())
         ttk.Button(filter_row, text="Clear Filters", command=self.clear_filters).pack(side='right', padx=5)
+        ttk.Label(filter_row, text="Query:").pack(side='left', padx=(15, 5))
+        self.query_entry = ttk.Entry(filter_row, width=60)
+        self.query_entry.pack(side='left', padx=5, fill='x', expand=True)
+        self.query_entry.bind('<Return>', lambda e: self.apply_filters())
+        ttk.Button(filter_row, text="Apply", command=self.apply_filters).pack(side='left', padx=2)
         
         list_frame = ttk.LabelFrame(main, text="Projects")
         list_frame.pack(fill='both', expand=True, pady=(0, 10))
@@ -618,13 +3113,12 @@ class EkotropeSyncApp:
             self.tree.heading(c, text=c.title())
             self.tree.column(c, width=w)
         self._update_tree_tags()
-        vsb = ttk.Scrollbar(list_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
+        vsb = ttk.Scrollbar(list_frame, orient='vertical')
         self.tree.grid(row=0, column=0, sticky='nsew')
         vsb.grid(row=0, column=1, sticky='ns')
         list_frame.grid_columnconfigure(0, weight=1)
         list_frame.grid_rowconfigure(0, weight=1)
-        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.project_list = VirtualTreeview(self.tree, vsb, self._tree_row, on_select=self.on_tree_select)
         
         btn_frame = ttk.Frame(main)
         btn_frame.pack(fill='x')
@@ -690,6 +3184,7 @@ class EkotropeSyncApp:
         self.chart_type_cb.pack(side='left', padx=5)
         self.chart_type_cb.bind('<<ComboboxSelected>>', lambda e: self.refresh_charts())
         ttk.Button(top, text=" Refresh", command=self.refresh_charts).pack(side='left', padx=10)
+        ttk.Button(top, text=" Export Packs...", command=self.export_chart_packs).pack(side='left', padx=5)
         self.chart_frame = ttk.Frame(self.charts_tab)
         self.chart_frame.pack(fill='both', expand=True, padx=5, pady=5)
     
@@ -791,121 +3286,299 @@ class EkotropeSyncApp:
             map_tree.insert('', 'end', values=m)
         map_tree.pack(fill='both', expand=True, padx=5, pady=5)
     
+    def _build_diagnostics_tab(self):
+        top = ttk.Frame(self.diag_tab)
+        top.pack(fill='x', padx=10, pady=10)
+        self.perf_var = tk.BooleanVar(value=PERF.enabled)
+        self.perf_mem_var = tk.BooleanVar(value=PERF.track_memory)
+        ttk.Checkbutton(top, text="Record timings", variable=self.perf_var, command=self._toggle_perf).pack(side='left', padx=5)
+        ttk.Checkbutton(top, text="Track memory (slower)", variable=self.perf_mem_var, command=self._toggle_perf).pack(side='left', padx=5)
+        ttk.Button(top, text=" Refresh", command=self.refresh_diagnostics).pack(side='left', padx=10)
+        ttk.Button(top, text=" Reset", command=self.reset_diagnostics).pack(side='left', padx=5)
+        ttk.Button(top, text=" Save JSON...", command=self.save_diagnostics).pack(side='left', padx=5)
+        self.diag_sum = ttk.Label(top, text="", font=('Arial', 10))
+        self.diag_sum.pack(side='left', padx=20)
+        cols = [('name', 'Name', 320), ('calls', 'Calls', 70), ('total_ms', 'Total ms', 100), ('last_ms', 'Last ms', 100),
+                ('max_ms', 'Max ms', 100), ('rows', 'Rows', 100), ('rows_per_s', 'Rows/s', 100), ('peak_mb', 'Peak MB', 90)]
+        self.diag_tree = ttk.Treeview(self.diag_tab, columns=[c for c, _, _ in cols], show='headings')
+        for c, title, w in cols:
+            self.diag_tree.heading(c, text=title)
+            self.diag_tree.column(c, width=w, anchor='w' if c == 'name' else 'e')
+        self.diag_tree.pack(fill='both', expand=True, padx=10, pady=5)
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.refresh_diagnostics() if self.notebook.select() == str(self.diag_tab) else None)
+    
+    # ================================================================
+    # BACKGROUND JOBS
+    # ================================================================
+    
+    def _job_busy(self, writes=False):
+        """Warn and return True when a running job would clash with a new one."""
+        name = self.jobs.conflict(writes)
+        if name:
+            messagebox.showwarning("Busy", f"Please wait for '{name}' to finish or cancel it.")
+        return bool(name)
+    
+    def _start_job(self, name, work, on_done, error_title, on_cancel=None, writes=False, error_detail="", on_error=None):
+        def failed(e):
+            if on_error: on_error()
+            self.status.config(text=f"{name} failed")
+            messagebox.showerror(error_title, f"{str(e)}{error_detail}")
+        def cancelled():
+            self.status.config(text=f"{name} cancelled")
+            if on_cancel: on_cancel()
+        def timed(job):
+            with PERF.measure(f"job: {name}"):
+                return work(job)
+        job = self.jobs.submit(name, timed, on_done, failed, cancelled, writes=writes)
+        if job:
+            self.cancel_btn.config(state='normal')
+            self.status.config(text=f"{name}...")
+        return job
+    
+    def _on_job_progress(self, job, done, total, text):
+        if job.cancelled: return
+        if total:
+            self.progress.config(mode='determinate', maximum=total, value=done)
+        else:
+            self.progress.config(mode='indeterminate')
+            self.progress.step(5)
+        if text: self.status.config(text=text)
+    
+    def _on_jobs_idle(self):
+        self.progress.config(mode='determinate', value=0)
+        self.cancel_btn.config(state='disabled')
+    
+    def cancel_jobs(self):
+        self.jobs.cancel_all()
+        self.status.config(text="Cancelling...")
+    
+    def _on_close(self):
+        self.jobs.shutdown()
+        self.root.quit()
+    
     # ================================================================
     # DATA LOADING
     # ================================================================
     
     def load_excel_file(self):
-        filepath = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
-        if not filepath: return
-        try:
-            projects = ExcelLoader.load_file(filepath)
-            # Generate unique keys - prevent collisions when columns are missing
-            self.all_projects = {}
-            missing_cols = []
-            for i, p in enumerate(projects):
-                if not p: continue
-                sub = p.get('Subdivision1')
-                lot = p.get('Lot1')
-                if sub and lot:
-                    key = f"{sub}_Lot{lot}"
-                    if key in self.all_projects:
-                        key = f"{key}_{i}"
-                else:
-                    addr = p.get('StreetAddress', '') or ''
-                    key = f"Row{i+1}_{addr[:20]}" if addr else f"Row{i+1}"
-                    if not missing_cols:
-                        missing_cols = [c for c in ['Subdivision1', 'Lot1'] if not p.get(c)]
-                self.all_projects[key] = p
+        filepath = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV export", "*.csv")])
+        if not filepath or self._job_busy(writes=True): return
+        # The projects loaded before stay until the file gives its first rows, and come back if it fails
+        previous = {'store': self.all_projects, 'source': self.source_lbl.cget('text'), 'replaced': False}
+        
+        def replace():
+            if previous['replaced']: return
+            previous['replaced'] = True
+            self.all_projects = new_project_store()
+            self.project_list.set_rows([])
             self.source_lbl.config(text=f" {os.path.basename(filepath)}")
-            self.status.config(text=f"Loaded {len(self.all_projects)} projects from {filepath}")
-            self.count_lbl.config(text=f"{len(self.all_projects)} projects")
+        
+        def show_chunk(keyed):
+            replace()
+            self._add_loaded_chunk(keyed)
+        
+        def show_store(store):
+            replace()
+            self._set_loaded_store(store)
+        
+        def restore():
+            if not previous['replaced']: return
+            self._set_loaded_store(previous['store'])
+            self.source_lbl.config(text=previous['source'])
+            self._populate_filters()
+        
+        def work(job):
+            cached = self.project_cache.load(filepath)
+            if cached:
+                job.post(show_store, cached[0])
+                info = cached[1]
+                return info.get('missing_cols', []), info.get('found_cols', []), info.get('duplicates', {}), info.get('coercion', {}), True
+            rows = 0
+            keys, coercer = ProjectKeys(), FieldCoercer()
+            found_cols = []
+            # Rows are keyed here and shown chunk by chunk while the rest of the file is still being read
+            for chunk in ExcelLoader.iter_chunks(filepath, coercer=coercer):
+                job.check()
+                if not found_cols and chunk:
+                    found_cols = sorted(set(chunk[0].keys()))
+                # Generate unique keys - prevent collisions when columns are missing
+                keyed = keys.add(chunk, rows)
+                rows += len(chunk)
+                job.post(show_chunk, keyed)
+                job.progress(rows, None, f"Loading {filepath}... {rows} rows")
+            return keys.missing_cols, found_cols, keys.duplicates, {'counts': coercer.counts, 'errors': coercer.errors}, False
+        
+        def done(result):
+            replace()  # a file without rows still replaces what was loaded
+            missing_cols, found_cols, duplicates, coercion, from_cache = result
+            if not from_cache:
+                info = {'missing_cols': missing_cols, 'found_cols': found_cols, 'duplicates': duplicates, 'coercion': coercion}
+                store = self.all_projects
+                self.jobs.submit("Caching project file", lambda job: self.project_cache.save(filepath, store, info))
+            self.status.config(text=f"Loaded {len(self.all_projects)} projects from {filepath}" + (" (cached)" if from_cache else ""))
+            self.sel_lbl.config(text=f"Selected: 0 of {len(self.project_list.keys)}")
             self._populate_filters()
-            self._populate_tree()
-            
             # Warn user if key columns were missing (helps troubleshoot)
             if missing_cols:
-                found_cols = sorted(set(projects[0].keys())) if projects else []
                 messagebox.showwarning("Column Warning",
                     f"Missing expected columns: {', '.join(missing_cols)}\n\n"
                     f"Found {len(found_cols)} columns in file.\n"
                     f"Loaded {len(self.all_projects)} projects using fallback keys.\n\n"
                     f"Check that your Excel has correct column headers.")
-        except Exception as e:
-            messagebox.showerror("Load Error", f"{str(e)}\n\nFile: {filepath}")
+            if duplicates:
+                messagebox.showwarning("Duplicate Lots",
+                    f"{len(duplicates)} Subdivision/Lot keys appear on more than one row:\n\n" + "\n".join(ProjectKeys.report(duplicates)) +
+                    f"\n\nThe later rows were loaded as Subdivision_LotN_<row>.")
+            if coercion.get('counts'):
+                counts = coercion['counts']
+                messagebox.showwarning("Invalid Values",
+                    f"{sum(counts.values())} numeric/date cells could not be read and were loaded as empty:\n\n" +
+                    "\n".join(FieldCoercer.report(counts, coercion['errors'])))
+        
+        def cancelled():
+            if not previous['replaced']:
+                self.status.config(text=f"Load cancelled - kept the {len(self.all_projects)} projects loaded before")
+                return
+            self.status.config(text=f"Load cancelled - kept the first {len(self.all_projects)} projects")
+            self._populate_filters()
+        
+        self._start_job("Loading Excel", work, done, "Load Error", cancelled, writes=True, error_detail=f"\n\nFile: {filepath}",
+                        on_error=restore)
+    
+    def _set_loaded_store(self, store):
+        self.all_projects = store
+        self._populate_tree()
+        self.count_lbl.config(text=f"{len(store)} projects")
+    
+    def _add_loaded_chunk(self, keyed):
+        self.all_projects.update(keyed)
+        self.project_list.append_rows(key for key, p in keyed.items() if p)
+        self.count_lbl.config(text=f"{len(self.all_projects)} projects")
     
     def load_rem_file(self):
         filepath = filedialog.askopenfilename(filetypes=[("REM files", "*.xml *.csv"), ("All files", "*.*")])
-        if not filepath: return
-        try:
-            projects = REMFileHandler.read_rem_file(filepath)
-            for i, p in enumerate(projects):
-                key = p.get('Subdivision1', '') or f"REM_{i+1}"
-                lot = p.get('Lot1', '') or str(i+1)
-                self.all_projects[f"{key}_Lot{lot}"] = p
+        if not filepath or self._job_busy(writes=True): return
+        
+        def done(result):
+            # Records that match a loaded project attach their test results to it; the rest are added as projects
+            records, joiner, joined = result
+            joiner.apply(records, joined)
+            matched = f"{len(joined['matches'])} matched to loaded projects"
+            if joined['matches']:
+                matched += f" ({', '.join(f'{n} by {m}' for m, n in joined['counts'].items() if n)})"
+            projects = [records[i] for i in joined['unmatched']]
+            keyed = list(REMFileHandler.project_keys(projects))
+            policy = self.config.get('rem_merge_policy', 'report')
+            result = merge_projects(self.all_projects, keyed, policy)
+            if policy == 'report' and result['collisions']:
+                collisions = result['collisions']
+                answer = messagebox.askyesnocancel("REM Merge",
+                    f"{len(collisions)} REM records have keys that are already loaded:\n\n" + "\n".join(collisions[:10]) +
+                    (f"\n... and {len(collisions) - 10} more" if len(collisions) > 10 else "") +
+                    "\n\nYes: replace them with the REM data\nNo: keep the loaded projects\nCancel: do not merge this file")
+                if answer is None:
+                    self.status.config(text=f"Loaded {len(records)} from REM file: {matched}; the other {len(projects)} were not added")
+                    self._populate_tree()
+                    return
+                result = merge_projects(self.all_projects, keyed, 'replace' if answer else 'keep')
             self.source_lbl.config(text=f" {os.path.basename(filepath)}")
-            self.status.config(text=f"Loaded {len(projects)} from REM file")
+            repeated = f", {len(result['duplicates'])} keys repeated in the file (later record used)" if result['duplicates'] else ""
+            self.status.config(text=f"Loaded {len(records)} from REM file: {matched}, "
+                                    f"{len(result['added'])} added, {len(result['replaced'])} replaced, {len(result['kept'])} kept" + repeated)
             self.count_lbl.config(text=f"{len(self.all_projects)} projects")
             self._populate_filters()
             self._populate_tree()
-        except Exception as e:
-            messagebox.showerror("Load Error", str(e))
+        
+        def work(job):
+            records = REMFileHandler.read_rem_file(filepath)
+            job.check()
+            joiner = REMJoiner(self.all_projects)
+            return records, joiner, joiner.join(records)
+        
+        self._start_job("Loading REM file", work, done, "Load Error", writes=True)
     
     def _populate_filters(self):
-        regions = sorted(set(str(p.get('Region', 'Unknown')) for p in self.all_projects.values() if p))
+        if isinstance(self.all_projects, ProjectStore):
+            regions = sorted(set(str(v) for v in self.all_projects.distinct('Region', 'Unknown', self.all_projects.nonempty())))
+        else:
+            regions = sorted(set(str(p.get('Region', 'Unknown')) for p in self.all_projects.values() if p))
         self.region_cb['values'] = ['All'] + regions
         self.region_cb.set('All')
     
-    def _populate_tree(self, projects=None):
-        self.tree.delete(*self.tree.get_children())
-        if projects is None:
-            projects = self.all_projects
-        for key, p in projects.items():
-            if not p: continue
-            lot = str(p.get('Lot1', ''))[:8]
-            addr = str(p.get('StreetAddress', ''))[:25]
-            subdiv = str(p.get('Subdivision1', ''))[:18]
-            sqft = f"{p.get('Living', 0):.0f}" if p.get('Living') else ''
-            tons = f"{p.get('Tonnage', 0):.1f}" if p.get('Tonnage') else ''
-            tdl = f"{p.get('TDLCFM', 0):.0f}" if p.get('TDLCFM') is not None else ''
-            lto = f"{p.get('LTOCFM', 0):.0f}" if p.get('LTOCFM') is not None else ''
-            bd = f"{p.get('BDCFM', 0):.0f}" if p.get('BDCFM') is not None else ''
-            rating = RatingType.determine(p)
-            pf = str(p.get('PassFail1', ''))[:4]
-            tag = 'pass' if pf.lower() == 'pass' else 'fail' if pf.lower() == 'fail' else ''
-            self.tree.insert('', 'end', iid=key, values=(lot, addr, subdiv, sqft, tons, tdl, lto, bd, rating, pf), tags=(tag,))
-        self.sel_lbl.config(text=f"Selected: 0 of {len(projects)}")
+    def _populate_tree(self, keys=None):
+        if keys is None:
+            keys = self._filtered_keys('All', 'All')
+        with PERF.measure('_populate_tree', rows=len(keys)):
+            self.project_list.set_rows(keys)
+        self.sel_lbl.config(text=f"Selected: 0 of {len(keys)}")
+    
+    def _tree_row(self, key):
+        p = self.all_projects.get(key) or {}
+        lot = str(p.get('Lot1', ''))[:8]
+        addr = str(p.get('StreetAddress', ''))[:25]
+        subdiv = str(p.get('Subdivision1', ''))[:18]
+        sqft = f"{p.get('Living', 0):.0f}" if p.get('Living') else ''
+        tons = f"{p.get('Tonnage', 0):.1f}" if p.get('Tonnage') else ''
+        tdl = f"{p.get('TDLCFM', 0):.0f}" if p.get('TDLCFM') is not None else ''
+        lto = f"{p.get('LTOCFM', 0):.0f}" if p.get('LTOCFM') is not None else ''
+        bd = f"{p.get('BDCFM', 0):.0f}" if p.get('BDCFM') is not None else ''
+        rating = RatingType.determine(p)
+        pf = str(p.get('PassFail1', ''))[:4]
+        tag = 'pass' if pf.lower() == 'pass' else 'fail' if pf.lower() == 'fail' else ''
+        return (lot, addr, subdiv, sqft, tons, tdl, lto, bd, rating, pf), tag
+    
+    def _filtered_keys(self, region, status, query=''):
+        """Keys of non-empty projects matching the Region / Pass-Fail filters and the query text
+        (ProjectIndex.parse syntax), in load order."""
+        store = self.all_projects
+        if not isinstance(store, ProjectStore):
+            if query.strip(): raise Exception("Query filters need numpy installed")
+            keys = []
+            for key, p in store.items():
+                if not p: continue
+                if region != 'All' and str(p.get('Region', '')) != region: continue
+                pf = str(p.get('PassFail1', '')).lower()
+                if status == 'Pass' and pf != 'pass': continue
+                if status == 'Fail' and pf != 'fail': continue
+                keys.append(key)
+            return keys
+        if self._project_index is None or self._project_index.store is not store:
+            self._project_index = ProjectIndex(store)
+        conditions = ProjectIndex.parse(query)
+        if region != 'All': conditions.append(('Region', 'in', [region]))
+        if status in ('Pass', 'Fail'): conditions.append(('PassFail1', 'in', [status]))
+        return self._project_index.keys(conditions)
     
     def apply_filters(self):
-        region = self.region_cb.get()
-        status = self.status_cb.get()
-        filtered = {}
-        for key, p in self.all_projects.items():
-            if not p: continue
-            if region != 'All' and str(p.get('Region', '')) != region: continue
-            pf = str(p.get('PassFail1', '')).lower()
-            if status == 'Pass' and pf != 'pass': continue
-            if status == 'Fail' and pf != 'fail': continue
-            filtered[key] = p
-        self._populate_tree(filtered)
+        try:
+            keys = self._filtered_keys(self.region_cb.get(), self.status_cb.get(), self.query_entry.get())
+        except Exception as e:
+            messagebox.showerror("Filter", str(e))
+            return
+        self._populate_tree(keys)
     
     def clear_filters(self):
         self.region_cb.set('All')
         self.status_cb.set('All')
+        self.query_entry.delete(0, 'end')
         self._populate_tree()
     
     def on_tree_select(self, event):
-        selected = self.tree.selection()
-        self.sel_lbl.config(text=f"Selected: {len(selected)} of {len(self.tree.get_children())}")
+        self.sel_lbl.config(text=f"Selected: {len(self.project_list.selected)} of {len(self.project_list.keys)}")
     
     def select_all(self):
-        self.tree.selection_set(self.tree.get_children())
+        self.project_list.select_all()
         self.on_tree_select(None)
     
     def configure_template(self):
         current = self.config.get('builder_home_id_template', '{Subdivision1}_Lot{Lot1}')
         new_template = simpledialog.askstring("Template", f"Builder Home ID Template:\n\nAvailable: {{Subdivision1}}, {{Lot1}}, {{PermitNo1}}, {{RTIN}}", initialvalue=current, parent=self.root)
         if new_template:
+            try:
+                BuilderIdTemplate(new_template)
+            except Exception as e:
+                messagebox.showerror("Template", str(e))
+                return
             self.config.set('builder_home_id_template', new_template)
             messagebox.showinfo("Saved", f"Template: {new_template}")
     
@@ -914,7 +3587,7 @@ class EkotropeSyncApp:
     # ================================================================
     
     def preview_json(self):
-        selected = self.tree.selection()
+        selected = self.project_list.selection_keys()
         if not selected:
             messagebox.showwarning("Select", "Select projects first")
             return
@@ -930,46 +3603,57 @@ class EkotropeSyncApp:
         txt.insert('1.0', json.dumps(data, indent=2))
     
     def generate_json(self):
-        selected = self.tree.selection()
+        selected = self.project_list.selection_keys()
         if not selected:
             messagebox.showwarning("Select", "Select projects to export")
             return
-        filepath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if self._job_busy(): return
+        filepath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json"), ("NDJSON (one home per line)", "*.ndjson")])
         if not filepath: return
         projects = [self.all_projects.get(k) for k in selected]
         version = self.version_cb.get()
         orientation = self.orientation_cb.get().split(' ')[0]
-        data = self.json_gen.generate(projects, version, orientation)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
-        self.status.config(text=f"Exported {len(selected)} projects to {filepath}")
-        messagebox.showinfo("Export", f"Exported {len(selected)} projects")
+        
+        def work(job):
+            self.json_gen.write(projects, filepath, version, orientation, ndjson=is_ndjson(filepath), check=job.check)
+        
+        def done(_):
+            self.status.config(text=f"Exported {len(selected)} projects to {filepath}")
+            messagebox.showinfo("Export", f"Exported {len(selected)} projects")
+        
+        self._start_job("Exporting JSON", work, done, "Export Error")
     
     def export_rem_xml(self):
         if not self.all_projects:
             messagebox.showwarning("No Data", "Load data first")
             return
+        if self._job_busy(): return
         filepath = filedialog.asksaveasfilename(defaultextension=".xml", filetypes=[("XML", "*.xml")])
         if not filepath: return
-        try:
-            REMFileHandler.export_to_rem_xml(list(self.all_projects.values()), filepath)
+        count = len(self.all_projects)
+        
+        def done(_):
             self.status.config(text=f"Exported REM XML to {filepath}")
-            messagebox.showinfo("Export", f"Exported {len(self.all_projects)} projects to REM XML")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+            messagebox.showinfo("Export", f"Exported {count} projects to REM XML")
+        
+        projects = self.all_projects
+        self._start_job("Exporting REM XML", lambda job: REMFileHandler.export_to_rem_xml(projects.values(), filepath, check=job.check), done, "Export Error")
     
     def export_rem_csv(self):
         if not self.all_projects:
             messagebox.showwarning("No Data", "Load data first")
             return
+        if self._job_busy(): return
         filepath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         if not filepath: return
-        try:
-            REMFileHandler.export_to_rem_csv(list(self.all_projects.values()), filepath)
+        count = len(self.all_projects)
+        
+        def done(_):
             self.status.config(text=f"Exported REM CSV to {filepath}")
-            messagebox.showinfo("Export", f"Exported {len(self.all_projects)} projects to REM CSV")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+            messagebox.showinfo("Export", f"Exported {count} projects to REM CSV")
+        
+        projects = self.all_projects
+        self._start_job("Exporting REM CSV", lambda job: REMFileHandler.export_to_rem_csv(list(projects.values()), filepath), done, "Export Error")
     
     # ================================================================
     # VALIDATION
@@ -979,19 +3663,32 @@ class EkotropeSyncApp:
         if not self.all_projects:
             messagebox.showwarning("No Data", "Load data first")
             return
-        self.validation_results.clear()
+        if self._job_busy(): return
+        projects = self.all_projects
+        auditor = self._auditor(ComplianceStandards.get_standard(self.std_cb.get()))
+        
+        def work(job):
+            progress = lambda done, total: job.progress(done, total, f"Validating {done}/{total}...")
+            return auditor.run(projects, comply=False, progress=progress, check=job.check, cache=self.audit_cache)[0]
+        
+        self._start_job("Validating", work, self._show_validation, "Validation Error")
+    
+    def _auditor(self, standard):
+        return ParallelAuditor(standard, self.config.get('audit_workers', 0), self.config.get('audit_chunk_size', 2000))
+    
+    def _show_validation(self, results):
+        self.validation_results = results
         self.val_tree.delete(*self.val_tree.get_children())
         errors = warnings = 0
-        for key, p in self.all_projects.items():
-            result = self.validator.validate_project(p)
-            self.validation_results[key] = result
+        for key, result in results.items():
             status = '[OK] Valid' if result['is_valid'] else '[X] Invalid'
             tag = 'pass' if result['is_valid'] else 'fail'
             self.val_tree.insert('', 'end', iid=key, values=(key[:30], len(result['errors']), len(result['warnings']), status), tags=(tag,))
             errors += len(result['errors'])
             warnings += len(result['warnings'])
-        valid = sum(1 for r in self.validation_results.values() if r['is_valid'])
-        self.val_sum.config(text=f"Valid: {valid}/{len(self.all_projects)} | Errors: {errors} | Warnings: {warnings}")
+        valid = sum(1 for r in results.values() if r['is_valid'])
+        self.val_sum.config(text=f"Valid: {valid}/{len(results)} | Errors: {errors} | Warnings: {warnings}")
+        self.status.config(text=f"Validated {len(results)} projects")
     
     def show_val_details(self, event):
         selected = self.val_tree.selection()
@@ -1019,26 +3716,55 @@ class EkotropeSyncApp:
         if not self.all_projects:
             messagebox.showwarning("No Data", "Load data first")
             return
-        self.compliance_results.clear()
-        self.comp_tree.delete(*self.comp_tree.get_children())
+        if self._job_busy(): return
         standard = ComplianceStandards.get_standard(self.std_cb.get())
         checker = ComplianceChecker(standard)
+        auditor = self._auditor(standard)
+        projects = self.all_projects
+        keys = list(projects.keys())
+        
+        def work(job):
+            if HAS_PANDAS:
+                # Columnar path: check text is formatted later, only for the project shown in show_comp_details
+                batch = checker.check_batch(projects)
+                job.check()
+                return batch, [batch.summary(i) for i in range(len(keys))]
+            progress = lambda done, total: job.progress(done, total, f"Checking compliance {done}/{total}...")
+            results = auditor.run(projects, validate=False, progress=progress, check=job.check, cache=self.audit_cache)[1]
+            return None, list(results.values())
+        
+        def done(result):
+            batch, results = result
+            self._comp_batch = batch
+            self._comp_rows = {key: i for i, key in enumerate(keys)} if batch is not None else {}
+            self._show_compliance(dict(zip(keys, results)))
+        
+        self._start_job("Checking compliance", work, done, "Compliance Error")
+    
+    def _show_compliance(self, results):
+        self.compliance_results = results
+        self.comp_tree.delete(*self.comp_tree.get_children())
         pass_count = fail_count = warn_count = 0
-        for key, p in self.all_projects.items():
-            result = checker.check_project(p)
-            self.compliance_results[key] = result
+        for key, result in results.items():
             tag = 'pass' if result['overall'] == 'PASS' else 'fail' if result['overall'] == 'FAIL' else 'warn'
             self.comp_tree.insert('', 'end', iid=key, values=(key[:30], result['pass_count'], result['fail_count'], result['warn_count'], result['overall']), tags=(tag,))
             if result['overall'] == 'PASS': pass_count += 1
             elif result['overall'] == 'FAIL': fail_count += 1
             else: warn_count += 1
         self.comp_sum.config(text=f"Pass: {pass_count} | Fail: {fail_count} | Warn: {warn_count}")
+        self.status.config(text=f"Checked compliance for {len(results)} projects")
+    
+    def _compliance_detail(self, key):
+        result = self.compliance_results.get(key, {})
+        if 'checks' not in result and self._comp_batch is not None and key in self._comp_rows:
+            result = self._comp_batch.result(self._comp_rows[key])
+        return result
     
     def show_comp_details(self, event):
         selected = self.comp_tree.selection()
         if not selected: return
         key = selected[0]
-        result = self.compliance_results.get(key, {})
+        result = self._compliance_detail(key)
         self.comp_txt.delete('1.0', 'end')
         self.comp_txt.insert('end', f"PROJECT: {key}\n{'='*50}\n\n")
         if result.get('footnotes_applied'):
@@ -1059,299 +3785,69 @@ class EkotropeSyncApp:
     # ================================================================
     
     def refresh_charts(self):
-        if not HAS_MATPLOTLIB: return
-        for w in self.chart_frame.winfo_children():
-            w.destroy()
+        if not HAS_MATPLOTLIB or not load_matplotlib(): return
         if not self.all_projects:
+            for w in self.chart_frame.winfo_children():
+                w.destroy()
+            self._chart_figures = {}
             ttk.Label(self.chart_frame, text="Load data to see charts", font=('Arial', 12)).pack(pady=50)
             return
+        data = self._chart_aggregates()
+        for name, (built, fig, canvas) in list(self._chart_figures.items()):
+            if built is not data:
+                canvas.get_tk_widget().destroy()
+                del self._chart_figures[name]
+        kept = {canvas.get_tk_widget() for _, _, canvas in self._chart_figures.values()}
+        for w in self.chart_frame.winfo_children():
+            if w in kept: w.pack_forget()
+            else: w.destroy()
         chart_type = self.chart_type_cb.get()
-        if chart_type == 'Overview':
-            self._draw_overview_charts()
-        elif chart_type == 'Duct Leakage':
-            self._draw_duct_charts()
-        elif chart_type == 'HVAC':
-            self._draw_hvac_charts()
-        elif chart_type == 'Static Pressure':
-            self._draw_pressure_charts()
-        elif chart_type == 'By Region':
-            self._draw_region_charts()
-    
-    def _draw_overview_charts(self):
-        fig = Figure(figsize=(12, 8), dpi=100, facecolor=self.theme.get('bg'))
-        projects = list(self.all_projects.values())
-        
-        # Pass/Fail pie
-        ax1 = fig.add_subplot(2, 2, 1, facecolor=self.theme.get('bg_alt'))
-        pf = [str(p.get('PassFail1', '')).lower() for p in projects]
-        passes = pf.count('pass')
-        fails = pf.count('fail')
-        other = len(pf) - passes - fails
-        if passes or fails or other:
-            ax1.pie([passes, fails, other], labels=['Pass', 'Fail', 'Other'], autopct='%1.0f%%', colors=['#28a745', '#dc3545', '#6c757d'])
-        ax1.set_title('Pass/Fail Distribution', color=self.theme.get('fg'))
-        
-        # TDL distribution
-        ax2 = fig.add_subplot(2, 2, 2, facecolor=self.theme.get('bg_alt'))
-        tdl_vals = [p.get('TDLCFM') for p in projects if p.get('TDLCFM') is not None]
-        if tdl_vals:
-            ax2.hist(tdl_vals, bins=20, color=self.theme.get('accent'), edgecolor='white')
-        ax2.set_xlabel('TDL CFM25', color=self.theme.get('fg'))
-        ax2.set_ylabel('Count', color=self.theme.get('fg'))
-        ax2.set_title('Total Duct Leakage Distribution', color=self.theme.get('fg'))
-        ax2.tick_params(colors=self.theme.get('fg'))
-        
-        # Rating types
-        ax3 = fig.add_subplot(2, 2, 3, facecolor=self.theme.get('bg_alt'))
-        ratings = [RatingType.determine(p) for p in projects]
-        confirmed = ratings.count('Confirmed')
-        projected = ratings.count('Projected')
-        ax3.bar(['Confirmed', 'Projected'], [confirmed, projected], color=[self.theme.get('success'), self.theme.get('warning')])
-        ax3.set_title('Rating Types', color=self.theme.get('fg'))
-        ax3.tick_params(colors=self.theme.get('fg'))
-        
-        # By region
-        ax4 = fig.add_subplot(2, 2, 4, facecolor=self.theme.get('bg_alt'))
-        regions = {}
-        for p in projects:
-            r = str(p.get('Region', 'Unknown'))[:15]
-            regions[r] = regions.get(r, 0) + 1
-        if regions:
-            top = sorted(regions.items(), key=lambda x: -x[1])[:8]
-            ax4.barh([t[0] for t in top], [t[1] for t in top], color=self.theme.get('accent'))
-        ax4.set_title('Projects by Region', color=self.theme.get('fg'))
-        ax4.tick_params(colors=self.theme.get('fg'))
-        
-        fig.tight_layout(pad=3.0)
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def _draw_duct_charts(self):
-        fig = Figure(figsize=(12, 8), dpi=100, facecolor=self.theme.get('bg'))
-        projects = list(self.all_projects.values())
-        
-        # TDL vs LTO scatter
-        ax1 = fig.add_subplot(2, 2, 1, facecolor=self.theme.get('bg_alt'))
-        tdl = [p.get('TDLCFM') for p in projects if p.get('TDLCFM') is not None and p.get('LTOCFM') is not None]
-        lto = [p.get('LTOCFM') for p in projects if p.get('TDLCFM') is not None and p.get('LTOCFM') is not None]
-        if tdl and lto:
-            ax1.scatter(tdl, lto, alpha=0.6, c=self.theme.get('accent'))
-            ax1.plot([0, max(tdl)], [0, max(tdl)], 'r--', alpha=0.5, label='1:1')
-        ax1.set_xlabel('TDL CFM25', color=self.theme.get('fg'))
-        ax1.set_ylabel('LTO CFM25', color=self.theme.get('fg'))
-        ax1.set_title('TDL vs LTO', color=self.theme.get('fg'))
-        ax1.tick_params(colors=self.theme.get('fg'))
-        
-        # TDL rate distribution
-        ax2 = fig.add_subplot(2, 2, 2, facecolor=self.theme.get('bg_alt'))
-        rates = []
-        for p in projects:
-            if p.get('TDLCFM') is not None and p.get('Living') and p['Living'] > 0:
-                rates.append((p['TDLCFM'] / p['Living']) * 100)
-        if rates:
-            ax2.hist(rates, bins=20, color=self.theme.get('accent'), edgecolor='white')
-            ax2.axvline(8, color='red', linestyle='--', label='Limit (8)')
-            ax2.axvline(12, color='orange', linestyle='--', label='Fn41 (12)')
-        ax2.set_xlabel('CFM25/100sqft', color=self.theme.get('fg'))
-        ax2.set_title('TDL Rate Distribution', color=self.theme.get('fg'))
-        ax2.tick_params(colors=self.theme.get('fg'))
-        ax2.legend()
-        
-        # LTO rate distribution
-        ax3 = fig.add_subplot(2, 2, 3, facecolor=self.theme.get('bg_alt'))
-        lto_rates = []
-        for p in projects:
-            if p.get('LTOCFM') is not None and p.get('Living') and p['Living'] > 0:
-                lto_rates.append((p['LTOCFM'] / p['Living']) * 100)
-        if lto_rates:
-            ax3.hist(lto_rates, bins=20, color='#17a2b8', edgecolor='white')
-            ax3.axvline(4, color='red', linestyle='--', label='Limit (4)')
-        ax3.set_xlabel('CFM25/100sqft', color=self.theme.get('fg'))
-        ax3.set_title('LTO Rate Distribution', color=self.theme.get('fg'))
-        ax3.tick_params(colors=self.theme.get('fg'))
-        ax3.legend()
-        
-        # TDL vs Sqft
-        ax4 = fig.add_subplot(2, 2, 4, facecolor=self.theme.get('bg_alt'))
-        sqft = [p.get('Living') for p in projects if p.get('TDLCFM') is not None and p.get('Living')]
-        tdl_v = [p.get('TDLCFM') for p in projects if p.get('TDLCFM') is not None and p.get('Living')]
-        if sqft and tdl_v:
-            ax4.scatter(sqft, tdl_v, alpha=0.5, c=self.theme.get('accent'))
-        ax4.set_xlabel('Living Sqft', color=self.theme.get('fg'))
-        ax4.set_ylabel('TDL CFM25', color=self.theme.get('fg'))
-        ax4.set_title('TDL vs Living Area', color=self.theme.get('fg'))
-        ax4.tick_params(colors=self.theme.get('fg'))
-        
-        fig.tight_layout(pad=3.0)
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def _draw_hvac_charts(self):
-        fig = Figure(figsize=(12, 8), dpi=100, facecolor=self.theme.get('bg'))
-        projects = list(self.all_projects.values())
-        
-        # CFM/Ton histogram
-        ax1 = fig.add_subplot(2, 2, 1, facecolor=self.theme.get('bg_alt'))
-        cpt = []
-        for p in projects:
-            if p.get('MeasuredCFM') and p.get('Tonnage') and p['Tonnage'] > 0:
-                cpt.append(p['MeasuredCFM'] / p['Tonnage'])
-        if cpt:
-            ax1.hist(cpt, bins=20, color=self.theme.get('accent'), edgecolor='white')
-            ax1.axvline(350, color='red', linestyle='--')
-            ax1.axvline(450, color='red', linestyle='--')
-        ax1.set_xlabel('CFM/Ton', color=self.theme.get('fg'))
-        ax1.set_title('Airflow per Ton', color=self.theme.get('fg'))
-        ax1.tick_params(colors=self.theme.get('fg'))
-        
-        # Charge variance
-        ax2 = fig.add_subplot(2, 2, 2, facecolor=self.theme.get('bg_alt'))
-        charges = [p.get('Charge') for p in projects if p.get('Charge') is not None]
-        if charges:
-            ax2.hist(charges, bins=20, color='#17a2b8', edgecolor='white')
-            ax2.axvline(-0.05, color='red', linestyle='--')
-            ax2.axvline(0.05, color='red', linestyle='--')
-        ax2.set_xlabel('Charge Variance', color=self.theme.get('fg'))
-        ax2.set_title('Refrigerant Charge', color=self.theme.get('fg'))
-        ax2.tick_params(colors=self.theme.get('fg'))
-        
-        # Tonnage vs Sqft
-        ax3 = fig.add_subplot(2, 2, 3, facecolor=self.theme.get('bg_alt'))
-        sqft = [p.get('Living') for p in projects if p.get('Tonnage') and p.get('Living')]
-        tons = [p.get('Tonnage') for p in projects if p.get('Tonnage') and p.get('Living')]
-        if sqft and tons:
-            ax3.scatter(sqft, tons, alpha=0.5, c=self.theme.get('accent'))
-        ax3.set_xlabel('Living Sqft', color=self.theme.get('fg'))
-        ax3.set_ylabel('Tonnage', color=self.theme.get('fg'))
-        ax3.set_title('Tonnage vs Living Area', color=self.theme.get('fg'))
-        ax3.tick_params(colors=self.theme.get('fg'))
-        
-        # Wattage
-        ax4 = fig.add_subplot(2, 2, 4, facecolor=self.theme.get('bg_alt'))
-        watts = [p.get('MeasuredWattage') for p in projects if p.get('MeasuredWattage') is not None]
-        if watts:
-            ax4.hist(watts, bins=20, color='#ffc107', edgecolor='white')
-        ax4.set_xlabel('Watts', color=self.theme.get('fg'))
-        ax4.set_title('Measured Wattage', color=self.theme.get('fg'))
-        ax4.tick_params(colors=self.theme.get('fg'))
-        
-        fig.tight_layout(pad=3.0)
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def _draw_pressure_charts(self):
-        fig = Figure(figsize=(12, 8), dpi=100, facecolor=self.theme.get('bg'))
-        projects = list(self.all_projects.values())
-        
-        # Return vs Supply scatter
-        ax1 = fig.add_subplot(2, 2, 1, facecolor=self.theme.get('bg_alt'))
-        ret = [abs(p.get('ReturnIWC', 0)) for p in projects if p.get('ReturnIWC') is not None and p.get('SupplyIWC') is not None]
-        sup = [abs(p.get('SupplyIWC', 0)) for p in projects if p.get('ReturnIWC') is not None and p.get('SupplyIWC') is not None]
-        if ret and sup:
-            ax1.scatter(ret, sup, alpha=0.6, c=self.theme.get('accent'))
-            ax1.axvline(0.20, color='red', linestyle='--', alpha=0.7)
-            ax1.axhline(0.25, color='red', linestyle='--', alpha=0.7)
-        ax1.set_xlabel('Return IWC', color=self.theme.get('fg'))
-        ax1.set_ylabel('Supply IWC', color=self.theme.get('fg'))
-        ax1.set_title('Return vs Supply Static', color=self.theme.get('fg'))
-        ax1.tick_params(colors=self.theme.get('fg'))
-        
-        # Return distribution
-        ax2 = fig.add_subplot(2, 2, 2, facecolor=self.theme.get('bg_alt'))
-        ret_vals = [abs(p.get('ReturnIWC', 0)) for p in projects if p.get('ReturnIWC') is not None]
-        if ret_vals:
-            ax2.hist(ret_vals, bins=20, color='#28a745', edgecolor='white')
-            ax2.axvline(0.20, color='red', linestyle='--', label='Max 0.20')
-        ax2.set_xlabel('IWC', color=self.theme.get('fg'))
-        ax2.set_title('Return Static Pressure', color=self.theme.get('fg'))
-        ax2.tick_params(colors=self.theme.get('fg'))
-        ax2.legend()
-        
-        # Supply distribution
-        ax3 = fig.add_subplot(2, 2, 3, facecolor=self.theme.get('bg_alt'))
-        sup_vals = [abs(p.get('SupplyIWC', 0)) for p in projects if p.get('SupplyIWC') is not None]
-        if sup_vals:
-            ax3.hist(sup_vals, bins=20, color='#17a2b8', edgecolor='white')
-            ax3.axvline(0.25, color='red', linestyle='--', label='Max 0.25')
-        ax3.set_xlabel('IWC', color=self.theme.get('fg'))
-        ax3.set_title('Supply Static Pressure', color=self.theme.get('fg'))
-        ax3.tick_params(colors=self.theme.get('fg'))
-        ax3.legend()
-        
-        # Total ESP
-        ax4 = fig.add_subplot(2, 2, 4, facecolor=self.theme.get('bg_alt'))
-        esp = [abs(p.get('ReturnIWC', 0)) + abs(p.get('SupplyIWC', 0)) for p in projects if p.get('ReturnIWC') is not None and p.get('SupplyIWC') is not None]
-        if esp:
-            ax4.hist(esp, bins=20, color='#6f42c1', edgecolor='white')
-            ax4.axvline(0.45, color='red', linestyle='--', label='Max 0.45')
-        ax4.set_xlabel('Total ESP (IWC)', color=self.theme.get('fg'))
-        ax4.set_title('Total External Static Pressure', color=self.theme.get('fg'))
-        ax4.tick_params(colors=self.theme.get('fg'))
-        ax4.legend()
-        
-        fig.tight_layout(pad=3.0)
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def _draw_region_charts(self):
-        fig = Figure(figsize=(12, 8), dpi=100, facecolor=self.theme.get('bg'))
-        projects = list(self.all_projects.values())
-        
-        regions = {}
-        for p in projects:
-            r = str(p.get('Region', 'Unknown'))[:20]
-            if r not in regions:
-                regions[r] = {'count': 0, 'pass': 0, 'tdl_sum': 0, 'tdl_count': 0}
-            regions[r]['count'] += 1
-            if str(p.get('PassFail1', '')).lower() == 'pass':
-                regions[r]['pass'] += 1
-            if p.get('TDLCFM') is not None:
-                regions[r]['tdl_sum'] += p['TDLCFM']
-                regions[r]['tdl_count'] += 1
-        
-        top = sorted(regions.items(), key=lambda x: -x[1]['count'])[:10]
-        names = [t[0] for t in top]
-        counts = [t[1]['count'] for t in top]
-        pass_rates = [t[1]['pass'] / t[1]['count'] * 100 if t[1]['count'] > 0 else 0 for t in top]
-        avg_tdl = [t[1]['tdl_sum'] / t[1]['tdl_count'] if t[1]['tdl_count'] > 0 else 0 for t in top]
-        
-        # Count by region
-        ax1 = fig.add_subplot(2, 2, 1, facecolor=self.theme.get('bg_alt'))
-        ax1.barh(names, counts, color=self.theme.get('accent'))
-        ax1.set_xlabel('Project Count', color=self.theme.get('fg'))
-        ax1.set_title('Projects by Region', color=self.theme.get('fg'))
-        ax1.tick_params(colors=self.theme.get('fg'))
-        
-        # Pass rate by region
-        ax2 = fig.add_subplot(2, 2, 2, facecolor=self.theme.get('bg_alt'))
-        colors = ['#28a745' if r >= 90 else '#ffc107' if r >= 70 else '#dc3545' for r in pass_rates]
-        ax2.barh(names, pass_rates, color=colors)
-        ax2.set_xlabel('Pass Rate (%)', color=self.theme.get('fg'))
-        ax2.set_title('Pass Rate by Region', color=self.theme.get('fg'))
-        ax2.tick_params(colors=self.theme.get('fg'))
-        ax2.set_xlim(0, 100)
+        if chart_type not in self._chart_figures:
+            with PERF.measure(f"refresh_charts ({chart_type})", rows=data.count):
+                fig = Figure(figsize=(12, 8), dpi=100)
+                self._chart_renderer().draw(fig, chart_type, data)
+                canvas = FigureCanvasTkAgg(fig, self.chart_frame)
+                canvas.draw()
+            self._chart_figures[chart_type] = (data, fig, canvas)
+        self._chart_figures[chart_type][2].get_tk_widget().pack(fill='both', expand=True)
+    
+    def _chart_aggregates(self):
+        """ChartData for the loaded projects, rebuilt only when the store was replaced or changed."""
+        projects, version = self.all_projects, getattr(self.all_projects, 'version', None)
+        cached = self._chart_data
+        if cached is None or cached[0] is not projects or version is None or cached[1] != version:
+            with PERF.measure('ChartData', rows=len(projects)):
+                cached = self._chart_data = (projects, version, ChartData(projects))
+        return cached[2]
+    
+    def export_chart_packs(self):
+        if not self.all_projects:
+            messagebox.showwarning("No Data", "Load data first")
+            return
+        if self._job_busy(): return
+        folder = filedialog.askdirectory(title="Chart pack folder")
+        if not folder: return
+        pack = ChartPack(folder, formats=ChartPack.FORMATS, workers=self.config.get('audit_workers', 0),
+                         max_points=self.config.get('chart_max_points', 5000), dense_mode=self.config.get('chart_dense_mode', 'hexbin'))
+        projects = self.all_projects
         
-        # Avg TDL by region
-        ax3 = fig.add_subplot(2, 2, 3, facecolor=self.theme.get('bg_alt'))
-        ax3.barh(names, avg_tdl, color='#17a2b8')
-        ax3.set_xlabel('Avg TDL CFM25', color=self.theme.get('fg'))
-        ax3.set_title('Avg TDL by Region', color=self.theme.get('fg'))
-        ax3.tick_params(colors=self.theme.get('fg'))
+        def work(job):
+            return pack.run(projects, lambda done, total: job.progress(done, total, f"Rendering chart packs... {done}/{total}"), job.check)
         
-        # Pie of top regions
-        ax4 = fig.add_subplot(2, 2, 4, facecolor=self.theme.get('bg_alt'))
-        if counts:
-            ax4.pie(counts[:6], labels=names[:6], autopct='%1.0f%%')
-        ax4.set_title('Top Regions Share', color=self.theme.get('fg'))
+        def done(paths):
+            self.status.config(text=f"Wrote {len(paths)} chart files to {folder}")
+            messagebox.showinfo("Export", f"Wrote {len(paths)} chart files to {folder}")
         
-        fig.tight_layout(pad=3.0)
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._start_job("Rendering chart packs", work, done, "Export Error")
+    
+    def _chart_renderer(self):
+        return ChartRenderer(self.theme.current, self.config.get('chart_max_points', 5000), self.config.get('chart_dense_mode', 'hexbin'))
+    
+    def _restyle_charts(self):
+        renderer = self._chart_renderer()
+        for _, fig, canvas in self._chart_figures.values():
+            renderer.restyle(fig)
+            canvas.draw_idle()
     
     # ================================================================
     # CALCULATORS
@@ -1424,6 +3920,45 @@ class EkotropeSyncApp:
         except:
             messagebox.showerror("Error", "Invalid input")
     
+    # ================================================================
+    # DIAGNOSTICS
+    # ================================================================
+    
+    def _toggle_perf(self):
+        PERF.enabled = self.perf_var.get() or self.perf_mem_var.get()
+        self.perf_var.set(PERF.enabled)
+        PERF.set_track_memory(self.perf_mem_var.get())
+        self.refresh_diagnostics()
+    
+    def refresh_diagnostics(self):
+        summary = PERF.summary()
+        self.diag_tree.delete(*self.diag_tree.get_children())
+        for name, s in sorted(summary['spans'].items(), key=lambda kv: -kv[1]['total_ms']):
+            self.diag_tree.insert('', 'end', values=(name, s['calls'], f"{s['total_ms']:.1f}", f"{s['last_ms']:.1f}", f"{s['max_ms']:.1f}",
+                                                     s['rows'] or '', f"{s['rows_per_s']:,.0f}" if s['rows_per_s'] else '',
+                                                     f"{s['peak_mb']:.1f}" if s['peak_mb'] is not None else ''))
+        for name, n in sorted(summary['counters'].items()):
+            self.diag_tree.insert('', 'end', values=(name, n, '', '', '', '', '', ''))
+        for e in STARTUP.entries:
+            self.diag_tree.insert('', 'end', values=(f"startup: {e['name']}", 1, f"{e['ms']:.1f}", f"{e['ms']:.1f}", f"{e['ms']:.1f}", '', '', ''))
+        state = "recording" if PERF.enabled else "off - tick Record timings, then repeat the slow operation"
+        peak = f" | process peak {summary['process_peak_mb']:.0f} MB" if summary['process_peak_mb'] else ""
+        self.diag_sum.config(text=f"Timings {state}{peak}")
+    
+    def reset_diagnostics(self):
+        PERF.reset()
+        self.refresh_diagnostics()
+    
+    def save_diagnostics(self):
+        filepath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not filepath: return
+        try:
+            with open(filepath, 'w') as f:
+                json.dump({**PERF.summary(), 'startup': STARTUP.entries}, f, indent=2)
+            self.status.config(text=f"Saved diagnostics to {filepath}")
+        except OSError as e:
+            messagebox.showerror("Save Error", str(e))
+    
     # ================================================================
     # HELP
     # ================================================================
@@ -1484,6 +4019,175 @@ Projected: Otherwise
         self.root.mainloop()
 
 
-if __name__ == '__main__':
+# ================================================================
+# HEADLESS CLI
+# ================================================================
+
+def template_arg(text):
+    try:
+        BuilderIdTemplate(text)
+    except Exception as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return text
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="DSLD Homes - Ekotrope Sync v9. Without --input the GUI is started.")
+    parser.add_argument('--input', '-i', help="Excel export (.xlsx/.xls) or REM/Rate file (.xml/.csv) to sync headless")
+    parser.add_argument('--input-type', choices=['auto', 'dsld', 'rem'], default='auto',
+                        help="auto: .xml/.csv are REM files, anything else a DSLD export; dsld also reads CSV exports")
+    parser.add_argument('--merge-rem', metavar='FILE', help="attach the test results in a REM/Rate file (.xml/.csv) to the matching --input projects")
+    parser.add_argument('--standard', default=None, choices=ComplianceStandards.get_all_versions(),
+                        help="ENERGY STAR version for compliance and JSON (default: config target version)")
+    parser.add_argument('--template', type=template_arg, help="builderHomeId template, e.g. {Subdivision1}_Lot{Lot1}")
+    parser.add_argument('--orientation', default=None, choices=[o[0] for o in HomeOrientation.ORIENTATIONS])
+    parser.add_argument('--json', dest='json_out', help="write Ekotrope JSON (.ndjson/.jsonl: one home per line)")
+    parser.add_argument('--rem-xml', help="write REM/Rate XML")
+    parser.add_argument('--rem-csv', help="write REM/Rate CSV")
+    parser.add_argument('--report', help="write validation/compliance report JSON")
+    parser.add_argument('--charts', metavar='DIR', help="write chart packs (all projects, per region, per subdivision) into DIR")
+    parser.add_argument('--chart-by', nargs='+', choices=ChartPack.LEVELS, default=ChartPack.LEVELS, help="chart pack groups (default: both)")
+    parser.add_argument('--chart-format', nargs='+', choices=ChartPack.FORMATS, default=['pdf'],
+                        help="pdf: one multi-page file per group; png: a folder of images per group")
+    parser.add_argument('--only-valid', action='store_true', help="export only projects that pass validation")
+    parser.add_argument('--fail-on-noncompliant', action='store_true', help="exit with status 3 if any project fails compliance")
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                        help="processes for validation/compliance (default: config audit_workers, 0 = one per CPU core)")
+    parser.add_argument('--chunk-size', type=int, default=None, metavar='N', help="projects per worker task (default: config audit_chunk_size)")
+    parser.add_argument('--no-cache', action='store_true', help="always parse --input, bypassing the on-disk project cache")
+    parser.add_argument('--startup-timing', nargs='?', const='-', metavar='JSON',
+                        help="print import/UI build timings once started (optionally also save them as JSON)")
+    parser.add_argument('--startup-budget', type=float, metavar='MS', help="flag the startup timing report when over this many ms")
+    parser.add_argument('--perf', nargs='?', const='-', metavar='JSON',
+                        help="record load/audit/export/chart timings (printed after a headless run, optionally saved as JSON)")
+    parser.add_argument('--perf-memory', action='store_true', help="with --perf, also record peak traced memory per step (slower)")
+    return parser
+
+def run_headless(args, out=None):
+    """Load -> validate -> check compliance -> export, with no tkinter import (matplotlib only for --charts). Returns an exit status."""
+    out = out or sys.stdout
+    log = lambda msg: print(msg, file=out)
+    config = dict(ConfigManager().config)
+    if args.template: config['builder_home_id_template'] = args.template
+    standard_name = args.standard or config.get('target_energy_star_version', 'ENERGY STAR 3.2')
+    orientation = args.orientation or config.get('default_orientation', 'N')
+    try:
+        ext = os.path.splitext(args.input)[1].lower()
+        all_projects = new_project_store()
+        if args.input_type == 'rem' or (args.input_type == 'auto' and ext in ('.xml', '.csv')):
+            all_projects.update(REMFileHandler.project_keys(REMFileHandler.read_rem_file(args.input)))
+        else:
+            cache = ProjectCache(max_mb=0 if args.no_cache else config.get('project_cache_mb', 500))
+            cached = cache.load(args.input)
+            if cached:
+                all_projects, info = cached
+                missing_cols, duplicates, coercion = info.get('missing_cols', []), info.get('duplicates', {}), info.get('coercion', {})
+            else:
+                rows, keys, coercer, found_cols = 0, ProjectKeys(), FieldCoercer(), []
+                for chunk in ExcelLoader.iter_chunks(args.input, coercer=coercer):
+                    if not found_cols and chunk:
+                        found_cols = sorted(set(chunk[0].keys()))
+                    all_projects.update(keys.add(chunk, rows))
+                    rows += len(chunk)
+                missing_cols, duplicates = keys.missing_cols, keys.duplicates
+                coercion = {'counts': coercer.counts, 'errors': coercer.errors}
+                try:
+                    cache.save(args.input, all_projects, {'missing_cols': missing_cols, 'found_cols': found_cols, 'duplicates': duplicates,
+                                                          'coercion': coercion})
+                except Exception as e:
+                    log(f"WARNING: could not cache {args.input}: {e}")
+            if missing_cols:
+                log(f"WARNING: missing expected columns: {', '.join(missing_cols)} - using fallback keys")
+            if duplicates:
+                log(f"WARNING: {len(duplicates)} duplicate Subdivision/Lot keys - later rows keyed Subdivision_LotN_<row>")
+                for line in ProjectKeys.report(duplicates): log(f"  {line}")
+            if coercion.get('counts'):
+                log(f"WARNING: {sum(coercion['counts'].values())} numeric/date cells could not be read - loaded as empty")
+                for line in FieldCoercer.report(coercion['counts'], coercion['errors']): log(f"  {line}")
+    except Exception as e:
+        log(f"ERROR: could not load {args.input}: {e}")
+        return 1
+    log(f"Loaded {len(all_projects)} projects from {args.input}")
+    if args.merge_rem:
+        try:
+            records = REMFileHandler.read_rem_file(args.merge_rem)
+        except Exception as e:
+            log(f"ERROR: could not load {args.merge_rem}: {e}")
+            return 1
+        joined = REMJoiner(all_projects).merge(records)
+        log(f"Matched {len(joined['matches'])}/{len(records)} REM records from {args.merge_rem} "
+            f"({', '.join(f'{n} by {m}' for m, n in joined['counts'].items())}); {len(joined['unmatched'])} unmatched")
+    
+    standard = ComplianceStandards.get_standard(standard_name)
+    auditor = ParallelAuditor(standard, args.workers if args.workers is not None else config.get('audit_workers', 0),
+                              args.chunk_size or config.get('audit_chunk_size', 2000))
+    # Without numpy compliance runs per project too, in the same pass over the workers
+    validation_results, compliance_results = auditor.run(all_projects, comply=not HAS_PANDAS)
+    valid = sum(1 for r in validation_results.values() if r['is_valid'])
+    log(f"Valid: {valid}/{len(all_projects)} | Errors: {sum(len(r['errors']) for r in validation_results.values())} | "
+        f"Warnings: {sum(len(r['warnings']) for r in validation_results.values())}")
+    
+    keys = list(all_projects.keys())
+    if HAS_PANDAS:
+        batch = ComplianceChecker(standard).check_batch(all_projects)
+        compliance_results = {key: batch.result(i) for i, key in enumerate(keys)} if args.report else \
+                             {key: batch.summary(i) for i, key in enumerate(keys)}
+    overall = [r['overall'] for r in compliance_results.values()]
+    log(f"Pass: {overall.count('PASS')} | Fail: {overall.count('FAIL')} | Warn: {overall.count('WARN')}")
+    
+    export_keys = [k for k in keys if validation_results[k]['is_valid']] if args.only_valid else keys
+    projects = [all_projects[k] for k in export_keys]
+    try:
+        if args.json_out:
+            # The whole store (no --only-valid) lets the generator render builder IDs column-wise
+            json_projects = all_projects if isinstance(all_projects, ProjectStore) and not args.only_valid else projects
+            count = EkotropeJSONGenerator(config).write(json_projects, args.json_out, standard_name, orientation, ndjson=is_ndjson(args.json_out))
+            log(f"Exported {count} homes to {args.json_out}")
+        if args.rem_xml:
+            REMFileHandler.export_to_rem_xml(projects, args.rem_xml)
+            log(f"Exported {len(projects)} projects to REM XML {args.rem_xml}")
+        if args.rem_csv:
+            REMFileHandler.export_to_rem_csv(projects, args.rem_csv)
+            log(f"Exported {len(projects)} projects to REM CSV {args.rem_csv}")
+        if args.report:
+            report = {'source': args.input, 'standard': standard_name, 'generated': datetime.now().isoformat(),
+                      'summary': {'projects': len(all_projects), 'valid': valid, 'pass': overall.count('PASS'),
+                                  'fail': overall.count('FAIL'), 'warn': overall.count('WARN')},
+                      'projects': {k: {'validation': validation_results[k], 'compliance': compliance_results[k]} for k in keys}}
+            with open(args.report, 'w') as f:
+                json.dump(report, f, indent=2)
+            log(f"Wrote report to {args.report}")
+        if args.charts:
+            if not importlib.util.find_spec('matplotlib'):
+                raise Exception("--charts requires matplotlib (pip install matplotlib)")
+            pack = ChartPack(args.charts, args.chart_by, args.chart_format, auditor.workers,
+                             max_points=config.get('chart_max_points', 5000), dense_mode=config.get('chart_dense_mode', 'hexbin'))
+            paths = pack.run(all_projects)
+            log(f"Wrote {len(paths)} chart files to {args.charts}")
+    except Exception as e:
+        log(f"ERROR: export failed: {e}")
+        return 1
+    if args.fail_on_noncompliant and 'FAIL' in overall:
+        return 3
+    return 0
+
+def main(argv=None):
+    multiprocessing.freeze_support()  # ParallelAuditor workers in the one-file EXE
+    args = build_arg_parser().parse_args(argv)
+    STARTUP.enabled = args.startup_timing is not None
+    STARTUP.output, STARTUP.budget_ms = args.startup_timing, args.startup_budget
+    PERF.enabled, PERF.output = args.perf is not None or args.perf_memory, args.perf
+    if args.perf_memory: PERF.set_track_memory(True)
+    if args.input:
+        status = run_headless(args)
+        STARTUP.report('headless sync done')
+        if PERF.enabled: PERF.report()
+        return status
     app = EkotropeSyncApp()
     app.run()
+    return 0
+
+STARTUP.record('module body', _STDLIB_DONE)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""
+Equivalence checks of the columnar/streaming engines against the plain implementations they replaced.
+
+python -m pytest tests
+"""
+
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
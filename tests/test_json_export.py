@@ -0,0 +1,86 @@
+"""Streaming Ekotrope JSON export (EkotropeJSONGenerator.write) against json.dump of the whole document."""
+
+import json
+import random
+
+import pytest
+
+from ekotrope_sync_v9aaa import EkotropeJSONGenerator, JobCancelled, ProjectStore
+
+TEXT = ['Oak Park', 'Pine Ridge ', 'Café "Nord"', 'a\\b', 'line\nbreak', '012', '', None, 7, 12.0]
+
+
+def random_projects(n, seed):
+    rnd = random.Random(seed)
+    projects = []
+    for _ in range(n):
+        p = {}
+        for f in ['Subdivision1', 'Lot1', 'StreetAddress', 'City', 'State', 'ZipCode', 'PermitNo1', 'RTIN', 'PassFail1']:
+            if rnd.random() < 0.8: p[f] = rnd.choice(TEXT)
+        for f in ['Living', 'BDCFM', 'TDLCFM', 'LTOCFM']:
+            if rnd.random() < 0.7: p[f] = rnd.choice([None, 0, 1850, 2.5, -0.125, 1e-7])
+        projects.append(p if rnd.random() > 0.05 else {})
+    return projects
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(EkotropeJSONGenerator, 'metadata', staticmethod(lambda count: {'generated': 'T', 'source': 'DSLD v9', 'count': count}))
+    return EkotropeJSONGenerator({'builder_home_id_template': '{Subdivision1}_Lot{Lot1}'})
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_write_matches_json_dump(tmp_path, generator, seed):
+    projects = random_projects(300, seed)
+    expected = json.dumps(generator.generate(projects, 'ENERGY STAR 3.1', 'S'), indent=2)
+    path = tmp_path / 'homes.json'
+    count = generator.write(projects, str(path), 'ENERGY STAR 3.1', 'S')
+    assert path.read_text() == expected
+    assert count == len(json.loads(expected)['homes'])
+
+
+def test_empty_export_matches_json_dump(tmp_path, generator):
+    path = tmp_path / 'homes.json'
+    assert generator.write([], str(path)) == 0
+    assert path.read_text() == json.dumps(generator.generate([]), indent=2)
+
+
+def test_store_export_matches_list_export(tmp_path, generator):
+    projects = random_projects(500, 7)
+    store = ProjectStore({f"K{i}": p for i, p in enumerate(projects)})
+    generator.write(projects, str(tmp_path / 'list.json'))
+    generator.write(store, str(tmp_path / 'store.json'))
+    assert (tmp_path / 'list.json').read_text() == (tmp_path / 'store.json').read_text()
+
+
+def test_ndjson_lines_are_the_homes(tmp_path, generator):
+    projects = random_projects(200, 3)
+    path = tmp_path / 'homes.ndjson'
+    generator.write(projects, str(path), ndjson=True)
+    assert [json.loads(line) for line in path.read_text().splitlines()] == generator.generate(projects)['homes']
+
+
+def test_cancelled_export_removes_file(tmp_path, generator):
+    path = tmp_path / 'homes.json'
+    def check():
+        raise JobCancelled()
+    with pytest.raises(JobCancelled):
+        generator.write(random_projects(50, 1), str(path), check=check)
+    assert not path.exists() and not list(tmp_path.iterdir())
+
+
+def test_failed_export_keeps_previous_file(tmp_path, generator, monkeypatch):
+    path = tmp_path / 'homes.json'
+    path.write_text('previous')
+    def check():
+        raise JobCancelled()
+    with pytest.raises(JobCancelled):
+        generator.write(random_projects(50, 1), str(path), check=check)
+    def broken(projects, *args):
+        yield {'home': 1}
+        raise ValueError('bad row')
+    monkeypatch.setattr(generator, 'iter_homes', broken)
+    with pytest.raises(ValueError):
+        generator.write(random_projects(50, 1), str(path))
+    assert path.read_text() == 'previous'
+    assert [p.name for p in tmp_path.iterdir()] == ['homes.json']
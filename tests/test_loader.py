@@ -0,0 +1,73 @@
+"""ExcelLoader: the same synthetic export read from .xlsx and from .csv gives the same values and types."""
+
+import pytest
+
+import synthetic
+from ekotrope_sync_v9aaa import DSLDSchema, ExcelLoader, FieldCoercer, REMFileHandler
+
+
+@pytest.fixture(scope='module')
+def loaded(tmp_path_factory):
+    out = tmp_path_factory.mktemp('portfolio')
+    result = {}
+    for ext in ('xlsx', 'csv'):
+        path = str(out / f'dsld.{ext}')
+        synthetic.write_workbook(path, 600, seed=11, missing=0.1)
+        coercer = FieldCoercer()
+        result[ext] = (ExcelLoader.load_file(path, coercer), coercer)
+    return result
+
+
+def typed(record):
+    return {k: (type(v).__name__, v) for k, v in record.items()}
+
+
+def test_csv_and_xlsx_load_the_same_records(loaded):
+    xlsx, csv = loaded['xlsx'][0], loaded['csv'][0]
+    assert len(xlsx) == len(csv) == 600
+    for a, b in zip(xlsx, csv):
+        assert typed(a) == typed(b)
+
+
+@pytest.mark.parametrize('field', ['Lot1', 'ZipCode', 'PDWFails1', 'PermitNo1', 'RTIN'])
+def test_text_fields_are_text(loaded, field):
+    for ext in ('xlsx', 'csv'):
+        values = [p[field] for p in loaded[ext][0] if p.get(field) is not None]
+        assert values and all(type(v) is str for v in values), ext
+
+
+def test_numeric_and_date_fields_typed(loaded):
+    for ext in ('xlsx', 'csv'):
+        projects, coercer = loaded[ext]
+        assert not coercer.counts, ext
+        assert all(type(p['Living']) is int for p in projects if p.get('Living') is not None)
+        assert all(type(p['Tonnage']) in (int, float) for p in projects if p.get('Tonnage') is not None)
+        assert all(len(p['PDWCreated1']) == 10 for p in projects if p.get('PDWCreated1') is not None)
+
+
+def test_rem_csv_export_is_the_same(loaded, tmp_path):
+    paths = []
+    for ext in ('xlsx', 'csv'):
+        path = tmp_path / f'rem_{ext}.csv'
+        REMFileHandler.export_to_rem_csv(loaded[ext][0], str(path))
+        paths.append(path)
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+
+
+def test_text_keeps_sheet_spelling():
+    assert FieldCoercer.text([None, '012', 1, 1.0, 70438.0, 1.5, True]) == [None, '012', '1', '1', '70438', '1.5', 'True']
+    assert set(DSLDSchema.ALL_FIELDS) == FieldCoercer.NUMERIC | FieldCoercer.DATES | FieldCoercer.TEXT
+
+
+def test_blank_text_is_missing_not_invalid(tmp_path):
+    coercer = FieldCoercer()
+    assert coercer.numeric('Living', ['', '  ', '\t', '12', 'x', None, ' 1,850 ']) == [None, None, None, 12, None, None, 1850]
+    assert coercer.dates('PDWCreated1', ['', ' ', '2024-01-02', 'soon', None], start=10) == [None, None, '2024-01-02', None, None]
+    assert coercer.counts == {'Living': 1, 'PDWCreated1': 1}
+    assert coercer.errors == [(4, 'Living', 'x'), (13, 'PDWCreated1', 'soon')]
+    path = tmp_path / 'blanks.csv'
+    path.write_text('Subdivision,Lot,Living,PDW Created\nOak Park,1, ,  \nOak Park,2,1850,2024-01-02\n')
+    coercer = FieldCoercer()
+    projects = ExcelLoader.load_file(str(path), coercer)
+    assert [(p['Living'], p['PDWCreated1']) for p in projects] == [(None, None), (1850, '2024-01-02')]
+    assert not coercer.counts and not coercer.errors
@@ -0,0 +1,41 @@
+"""merge_projects: collisions with the loaded projects vs keys repeated within the merged batch."""
+
+import pytest
+
+from ekotrope_sync_v9aaa import ProjectStore, merge_projects
+
+BATCH = [('A_Lot1', {'Lot1': 'a1'}), ('N_Lot1', {'Lot1': 'n1'}), ('N_Lot1', {'Lot1': 'n2'}), ('A_Lot1', {'Lot1': 'a2'}), ('M_Lot1', {'Lot1': 'm'})]
+
+
+@pytest.fixture(params=[dict, ProjectStore])
+def target(request):
+    return request.param({'A_Lot1': {'Lot1': 'a0'}, 'B_Lot1': {'Lot1': 'b0'}})
+
+
+def test_replace(target):
+    result = merge_projects(target, BATCH, 'replace')
+    assert result == {'added': ['N_Lot1', 'M_Lot1'], 'replaced': ['A_Lot1'], 'kept': [], 'collisions': ['A_Lot1'],
+                      'duplicates': ['N_Lot1', 'A_Lot1']}
+    assert {k: dict(target[k]) for k in target} == {'A_Lot1': {'Lot1': 'a2'}, 'B_Lot1': {'Lot1': 'b0'},
+                                                    'N_Lot1': {'Lot1': 'n2'}, 'M_Lot1': {'Lot1': 'm'}}
+
+
+def test_keep(target):
+    result = merge_projects(target, BATCH, 'keep')
+    assert result['added'] == ['N_Lot1', 'M_Lot1'] and result['kept'] == ['A_Lot1'] and result['replaced'] == []
+    assert result['duplicates'] == ['N_Lot1', 'A_Lot1']
+    assert dict(target['A_Lot1']) == {'Lot1': 'a0'} and dict(target['N_Lot1']) == {'Lot1': 'n2'}
+
+
+def test_report_only_counts_loaded_keys(target):
+    result = merge_projects(target, [(k, p) for k, p in BATCH if k != 'A_Lot1'], 'report')
+    assert result['collisions'] == [] and result['duplicates'] == ['N_Lot1']
+    assert result['added'] == ['N_Lot1', 'M_Lot1'] and dict(target['N_Lot1']) == {'Lot1': 'n2'}
+    before = set(target)
+    result = merge_projects(target, [('B_Lot1', {}), ('Z_Lot1', {})], 'report')
+    assert result['collisions'] == ['B_Lot1'] and result['added'] == [] and set(target) == before
+
+
+def test_unknown_policy(target):
+    with pytest.raises(Exception, match='Unknown merge policy'):
+        merge_projects(target, BATCH, 'merge')
@@ -0,0 +1,22 @@
+"""ParallelAuditor: spawned worker processes give the same results as the in-process run."""
+
+import synthetic
+import ekotrope_sync_v9aaa as sync
+from ekotrope_sync_v9aaa import ComplianceStandards, ParallelAuditor
+
+
+def test_workers_match_serial(monkeypatch):
+    monkeypatch.setattr(ParallelAuditor, 'MIN_PARALLEL_ROWS', 0)
+    contexts = []
+    real = sync._process_pool
+    def pool(workers):
+        executor = real(workers)
+        contexts.append(executor._mp_context.get_start_method())
+        return executor
+    monkeypatch.setattr(sync, '_process_pool', pool)
+    projects = synthetic.make_projects(600, seed=3)
+    standard = ComplianceStandards.get_standard('ENERGY STAR 3.2')
+    serial = ParallelAuditor(standard, 1, 100).run(projects)
+    parallel = ParallelAuditor(standard, 2, 100).run(projects)
+    assert contexts == ['spawn']
+    assert parallel == serial
@@ -0,0 +1,51 @@
+"""ProjectCache: caching is best-effort and never makes a loadable workbook fail."""
+
+import io
+import os
+from datetime import time
+
+import pytest
+
+import ekotrope_sync_v9aaa as sync
+from ekotrope_sync_v9aaa import ExcelLoader, ProjectCache, ProjectStore
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['Subdivision', 'Lot', 'Living', 'Start Time'])
+    ws.append(['Oak Park', 1, 1800, time(8, 30)])
+    ws.append(['Oak Park', 2, 2100, time(9, 15)])
+    path = tmp_path / 'times.xlsx'
+    wb.save(path)
+    return str(path)
+
+
+def test_save_failure_leaves_no_entry(tmp_path, workbook):
+    cache = ProjectCache(root=str(tmp_path / 'cache'))
+    store = ProjectStore({f"K{i}": p for i, p in enumerate(ExcelLoader.load_file(workbook))})
+    with pytest.raises(TypeError):
+        cache.save(workbook, store)
+    assert os.listdir(cache.root) == []
+    assert cache.load(workbook) is None
+
+
+def test_headless_run_warns_when_caching_fails(tmp_path, monkeypatch, workbook):
+    monkeypatch.setattr(sync, 'CONFIG_DIR', str(tmp_path / 'config'))
+    out = io.StringIO()
+    assert sync.run_headless(sync.build_arg_parser().parse_args(['--input', workbook]), out) == 0
+    assert 'WARNING: could not cache' in out.getvalue()
+    assert 'Loaded 2 projects' in out.getvalue()
+    assert os.listdir(tmp_path / 'config' / 'project_cache') == []
+
+
+def test_save_then_load(tmp_path):
+    cache = ProjectCache(root=str(tmp_path / 'cache'))
+    source = tmp_path / 'dsld.csv'
+    source.write_text('Subdivision,Lot\nOak Park,1\n')
+    cache.save(str(source), ProjectStore({'Oak Park_Lot1': {'Subdivision1': 'Oak Park', 'Lot1': '1'}}), {'missing_cols': []})
+    store, info = cache.load(str(source))
+    assert dict(store.items()) == {'Oak Park_Lot1': {'Subdivision1': 'Oak Park', 'Lot1': '1'}}
+    assert info['missing_cols'] == [] and info['format'] == ProjectCache.FORMAT
@@ -0,0 +1,166 @@
+"""ProjectIndex queries against a plain scan of the project dicts, before and after edits to the store."""
+
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from ekotrope_sync_v9aaa import ProjectIndex, ProjectStore, RatingType
+
+TODAY = date.today()
+DAYS = [(TODAY + timedelta(days=d)).isoformat() for d in (-400, -30, -7, -1, 0, 1, 5, 14, 30, 200)]
+CHOICES = {
+    'Region': ['North', 'south ', 'SOUTH', 'East', None, 7],
+    'Subdivision1': ['Oak Park', 'oak park', 'Pine Ridge', ' Pecan', None, ''],
+    'PassFail1': ['Pass', 'PASS', 'Fail', 'pending', None],
+    'Tech': ['Ann', 'Bo', None],
+    'Lot1': ['1', '012', 12, None],
+    'Living': [None, 0, 450, 1500, 1850, 2200.5, 3100, 'n/a', float('nan')],
+    'ReturnCount': [None, 1, 2, 3, 4],
+    'TDLCFM': [None, 0, 80, 119.5, 150, 240, 400],
+    'LTOCFM': [None, 20, 40, 95.5, 180],
+    'Tonnage': [None, 2, 2.5, 3, 4],
+    'FinalCreatedDate': DAYS + [None, 'soon'],
+    'TargetClosingDate': DAYS + [None, '2024-02-30'],
+}
+
+
+def random_project(rnd):
+    if rnd.random() < 0.03: return {}
+    return {f: rnd.choice(values) for f, values in CHOICES.items() if rnd.random() < 0.85}
+
+
+def random_condition(rnd):
+    kind = rnd.random()
+    if kind < 0.35:
+        field = rnd.choice(['Region', 'Subdivision1', 'PassFail1', 'Tech', 'Lot1', 'RatingType'])
+        pool = ['confirmed', 'Projected'] if field == 'RatingType' else [v for v in CHOICES[field] if v is not None] + ['nothing']
+        return field, rnd.choice(['in', 'not in', '==', '!=']), rnd.sample(pool, rnd.randint(1, 2))
+    if kind < 0.75:
+        field = rnd.choice(['Living', 'ReturnCount', 'TDLCFM', 'LTOCFM', 'Tonnage', 'TDLAllowable', 'LTOAllowable'])
+        op = rnd.choice(['>', '>=', '<', '<=', '==', '!=', 'between', 'column'])
+        if op == 'column':
+            return field, rnd.choice(['>', '>=', '<', '<=', '==', '!=']), rnd.choice(['TDLAllowable', 'LTOCFM', 'Living'])
+        pool = [0, 3, 40, 80, 119.5, 120, 1500, 1850, 2200.5]
+        return field, op, rnd.sample(pool, 2) if op == 'between' else rnd.choice(pool)
+    field = rnd.choice(['FinalCreatedDate', 'TargetClosingDate'])
+    op = rnd.choice(['within', 'between', '>', '<=', '=='])
+    if op == 'within': return field, op, rnd.choice([-30, -7, 0, 1, 14])
+    return field, op, rnd.sample(DAYS, 2) if op == 'between' else rnd.choice(DAYS)
+
+
+# --- the reference: one project at a time, from the ProjectIndex docstring
+
+def number(p, field):
+    if field in ('TDLAllowable', 'LTOAllowable'):
+        living = number(p, 'Living')
+        if not living > 0: return math.nan
+        if field == 'LTOAllowable': return max(living / 100 * 4.0, 40.0)
+        returns = number(p, 'ReturnCount')
+        fn41 = not math.isnan(returns) and returns >= 3
+        return max(living / 100 * (12.0 if fn41 else 8.0), 120.0 if fn41 else 80.0)
+    v = p.get(field)
+    if field in ProjectIndex.DATES:
+        try:
+            return float(date.fromisoformat(str(v)[:10]).toordinal())
+        except ValueError:
+            return math.nan
+    return float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else math.nan
+
+
+def compare(a, op, b):
+    if math.isnan(a) or math.isnan(b): return False
+    return {'>': a > b, '>=': a >= b, '<': a < b, '<=': a <= b, '==': a == b, '!=': a != b}[op]
+
+
+def matches(p, field, op, value):
+    if field in ProjectIndex.CATEGORICAL or field == 'Lot1':
+        v = RatingType.determine(p) if field == 'RatingType' else p.get(field)
+        if v is None: return False
+        targets = {str(t).strip().lower() for t in value}
+        return (str(v).strip().lower() in targets) != (op in ('not in', '!='))
+    a = number(p, field)
+    if isinstance(value, str) and value in ProjectIndex.NUMERIC:
+        return compare(a, op, number(p, value))
+    if op == 'within':
+        today = float(TODAY.toordinal())
+        lo, hi = sorted((today, today + value))
+        return lo <= a <= hi
+    day = lambda v: float(date.fromisoformat(v).toordinal()) if field in ProjectIndex.DATES else float(v)
+    if op == 'between':
+        lo, hi = sorted(day(v) for v in value)
+        return lo <= a <= hi
+    return compare(a, op, day(value))
+
+
+def scan(reference, conditions):
+    return [k for k, p in reference.items() if p and all(matches(p, *c) for c in conditions)]
+
+
+def check(index, reference, rnd, queries=60):
+    for _ in range(queries):
+        conditions = [random_condition(rnd) for _ in range(rnd.randint(1, 3))]
+        assert index.keys(conditions) == scan(reference, conditions), conditions
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_queries_match_scan_before_and_after_edits(seed):
+    rnd = random.Random(seed)
+    reference = {f"K{i}": random_project(rnd) for i in range(400)}
+    store = ProjectStore(reference)
+    reference = {k: dict(p) for k, p in reference.items()}
+    index = ProjectIndex(store)
+    check(index, reference, rnd)
+    # A few edits (patched into the built indexes), then enough to force rebuilds
+    for edits in (3, 10, 80):
+        keys = list(reference)
+        for _ in range(edits):
+            action, key = rnd.random(), rnd.choice(keys)
+            if action < 0.6:
+                field = rnd.choice(list(CHOICES))
+                value = rnd.choice(CHOICES[field])
+                store[key][field] = value
+                reference[key][field] = value
+            elif action < 0.8:
+                p = random_project(rnd)
+                store[key] = p
+                reference[key] = dict(p)
+            else:
+                new = f"N{len(reference)}"
+                p = random_project(rnd)
+                store[new] = p
+                reference[new] = dict(p)
+        check(index, reference, rnd)
+
+
+def test_cleared_store_rebuilds():
+    rnd = random.Random(5)
+    reference = {f"K{i}": random_project(rnd) for i in range(200)}
+    store = ProjectStore(reference)
+    index = ProjectIndex(store)
+    check(index, reference, rnd, 20)
+    store.clear()
+    reference = {f"R{i}": random_project(rnd) for i in range(150)}
+    store.update(reference)
+    check(index, reference, rnd, 20)
+
+
+def test_parse():
+    assert ProjectIndex.parse('Subdivision1 in Oak Park, Pine; TargetClosingDate within 14; TDLCFM > TDLAllowable; Living between 1500..2500') == [
+        ('Subdivision1', 'in', ['Oak Park', 'Pine']), ('TargetClosingDate', 'within', 14.0), ('TDLCFM', '>', 'TDLAllowable'),
+        ('Living', 'between', [1500.0, 2500.0])]
+
+
+def test_parse_text_fields_compare_as_text():
+    conditions = ProjectIndex.parse('Lot1 == 12; ZipCode != 70438; PermitNo1 == 005')
+    assert conditions == [('Lot1', '==', ['12']), ('ZipCode', '!=', ['70438']), ('PermitNo1', '==', ['005'])]
+    store = ProjectStore({f"K{i}": {'Lot1': lot, 'ZipCode': zipcode, 'PermitNo1': permit}
+                          for i, (lot, zipcode, permit) in enumerate([('12', '70438', '005'), ('13', '70433', '5'), ('12', None, None)])})
+    index = ProjectIndex(store)
+    assert index.keys(ProjectIndex.parse('Lot1 == 12')) == ['K0', 'K2']
+    assert index.keys(ProjectIndex.parse('Lot1 != 12')) == ['K1']
+    assert index.keys(ProjectIndex.parse('ZipCode == 70438')) == ['K0']
+    assert index.keys(ProjectIndex.parse('ZipCode != 70438')) == ['K1']
+    assert index.keys(ProjectIndex.parse('PermitNo1 == 005')) == ['K0']
+    assert index.keys(ProjectIndex.parse('Living > 1500; Lot1 == 12')) == []
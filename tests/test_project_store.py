@@ -0,0 +1,111 @@
+"""ProjectStore / ProjectRow against the dict-of-dicts all_projects they replaced, on randomized projects."""
+
+import random
+
+import numpy as np
+import pytest
+
+from ekotrope_sync_v9aaa import DSLDSchema, ProjectRow, ProjectStore
+
+EXTRA = ['Notes', 'Custom1']
+
+
+def random_value(rnd, field):
+    if field in DSLDSchema.NUMERIC_FIELDS:
+        return rnd.choice([None, 0, 7, -3, 1850, 2.5, 0.125, -0.0, 1e20, 2 ** 60, 'n/a', '1,850', True])
+    return rnd.choice([None, '', 'Oak Park', 'Lot 7', '070437', 12, 12.0, 3.5, False, '2024-03-05'])
+
+
+def random_projects(n, seed):
+    rnd = random.Random(seed)
+    fields = DSLDSchema.ALL_FIELDS + EXTRA
+    projects = {}
+    for i in range(n):
+        p = {f: random_value(rnd, f) for f in rnd.sample(fields, rnd.randint(0, 12))}
+        projects[f"K{rnd.randint(0, n)}"] = p  # repeated keys: the later project wins, as in dict.update
+    return projects
+
+
+def assert_same(store, reference):
+    assert len(store) == len(reference)
+    assert list(store) == list(reference)
+    for key, p in reference.items():
+        assert key in store
+        row = store[key]
+        assert isinstance(row, ProjectRow)
+        assert dict(row) == p
+        assert {f: type(v) for f, v in row.items()} == {f: type(v) for f, v in p.items()}
+        assert len(row) == len(p) and bool(row) == bool(p)
+        for f in DSLDSchema.ALL_FIELDS + EXTRA + ['Unknown']:
+            assert row.get(f) == p.get(f) and row.get(f, 'dflt') == p.get(f, 'dflt')
+            assert (f in row) == (f in p)
+            if f not in p:
+                with pytest.raises(KeyError): row[f]
+    assert 'missing key' not in store
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_rows_match_dicts(seed):
+    reference = random_projects(300, seed)
+    store = ProjectStore()
+    keys = list(reference)
+    store.update({k: reference[k] for k in keys[:100]})  # several batches, crossing the initial capacity
+    store.update({k: reference[k] for k in keys[100:]})
+    assert_same(store, reference)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_edits_match_dicts(seed):
+    rnd = random.Random(seed)
+    reference = random_projects(200, seed)
+    store = ProjectStore(reference)
+    reference = {k: dict(p) for k, p in reference.items()}
+    keys = list(reference)
+    for _ in range(300):
+        key, field = rnd.choice(keys), rnd.choice(DSLDSchema.ALL_FIELDS + EXTRA)
+        action = rnd.random()
+        if action < 0.6:
+            value = random_value(rnd, field)
+            store[key][field] = value
+            reference[key][field] = value
+        elif action < 0.8:
+            replacement = random_projects(1, rnd.random()).popitem()[1]
+            store[key] = replacement
+            reference[key] = dict(replacement)
+        else:
+            rows = rnd.sample(range(len(keys)), 5)
+            values = [random_value(rnd, field) for _ in rows]
+            store.set_rows(field, rows, values)
+            for r, v in zip(rows, values):
+                reference[keys[r]][field] = v
+    assert_same(store, reference)
+
+
+def test_save_load_roundtrip(tmp_path):
+    reference = random_projects(500, 11)
+    store = ProjectStore(reference)
+    store.save(str(tmp_path / 'store'))
+    loaded = ProjectStore.load(str(tmp_path / 'store'))
+    assert_same(loaded, reference)
+    key = next(iter(reference))
+    loaded[key]['Living'] = 1234  # copy-on-write map: edits stay in memory
+    assert ProjectStore.load(str(tmp_path / 'store'))[key].get('Living') == reference[key].get('Living')
+
+
+def test_column_views_match_rows():
+    reference = random_projects(400, 3)
+    store = ProjectStore(reference)
+    rows = list(reference.values())
+    for f in DSLDSchema.ALL_FIELDS + EXTRA:
+        assert store.values_of(f) == [p.get(f) for p in rows]
+        values, valid = store.numeric(f)
+        # numbers are valid, except ints too large for float64 in a numeric column (kept exactly, as other values)
+        big = f in DSLDSchema.NUMERIC_FIELDS
+        expected = [type(p.get(f)) is float or (type(p.get(f)) is int and not (big and abs(p.get(f)) >= 2 ** 53)) for p in rows]
+        assert valid.tolist() == expected
+        assert np.array_equal(values[valid], np.array([p[f] for p, ok in zip(rows, expected) if ok], dtype=float))
+        predicate = lambda v: isinstance(v, str) and 'a' in v
+        assert store.match(f, predicate, default='a').tolist() == [predicate(p.get(f, 'a')) for p in rows]
+        distinct = store.distinct(f, default='absent')
+        assert sorted(map(repr, distinct)) == sorted({repr(p.get(f, 'absent')) for p in rows})
+    assert store.nonempty().tolist() == [bool(p) for p in rows]
@@ -0,0 +1,125 @@
+"""REMJoiner against a brute-force matcher that scans every project for every record, and on synthetic
+REM records whose project is known."""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from ekotrope_sync_v9aaa import ProjectStore, REMJoiner
+import synthetic
+
+SUBS = ['Oak Park', 'oak-park', 'Pine Ridge', None]
+LOTS = ['1', '01', 'Lot 1', 2, 2.0, '3', None]
+PERMITS = ['BP-100', 'bp 100', 'BP-200', 'BP-300', None]
+STREETS = ['12 Oak Street', '12 Oak St', '12 Oak Str', '14 Elm Drive', '14 Elm Dr.', '7 Pecan Lane', '7 Pecann Lane', 'Main St', None]
+ZIPS = ['70437', '70437-1234', '70438', None]
+CITIES = ['Covington', 'COVINGTON', 'Mandeville', None]
+
+
+def random_project(rnd):
+    p = {}
+    for field, pool in (('Subdivision1', SUBS), ('Lot1', LOTS), ('PermitNo1', PERMITS), ('StreetAddress', STREETS),
+                        ('ZipCode', ZIPS), ('City', CITIES)):
+        if rnd.random() < 0.8: p[field] = rnd.choice(pool)
+    if rnd.random() < 0.5:  # mostly unique permits, spelled several ways
+        p['PermitNo1'] = rnd.choice(['BP-{}', 'bp {}', 'BP{}']).format(rnd.randint(1, 150))
+    if rnd.random() < 0.3:
+        p['Lot1'] = rnd.choice(['{}', 'Lot {}', '0{}', '{}.0']).format(rnd.randint(1, 60))
+    p['TDLCFM'] = rnd.choice([None, 80, 120.5])
+    return p
+
+
+def brute_force(projects, records):
+    """The documented rules, one record at a time over every project."""
+    rows = list(projects.values())
+    key = lambda fn, p, field: fn(p.get(field)) if p else None
+    def unique(record_key, project_key):
+        if record_key is None: return None
+        found = [r for r, p in enumerate(rows) if project_key(p) == record_key]
+        return found[0] if len(found) == 1 else None
+    J = REMJoiner
+    lot = lambda p: (key(J.text_key, p, 'Subdivision1'), key(J.lot_key, p, 'Lot1'))
+    addr_zip = lambda p: (key(J.address_key, p, 'StreetAddress'), key(J.zip_key, p, 'ZipCode'))
+    matches, pending = {}, []
+    for i, r in enumerate(records):
+        tries = [('permit', key(J.permit_key, r, 'PermitNo1'), lambda p: key(J.permit_key, p, 'PermitNo1')),
+                 ('lot', lot(r) if all(lot(r)) else None, lambda p: lot(p) if all(lot(p)) else None),
+                 ('address', addr_zip(r) if all(addr_zip(r)) else None, lambda p: addr_zip(p) if all(addr_zip(p)) else None),
+                 ('address', key(J.address_key, r, 'StreetAddress'), lambda p: key(J.address_key, p, 'StreetAddress'))]
+        for method, record_key, project_key in tries:
+            row = unique(record_key, project_key)
+            if row is not None:
+                matches[i] = (row, method)
+                break
+        else:
+            pending.append(i)
+    taken = {row for row, _ in matches.values()}
+    for i in pending:
+        number, street = J._split_address(key(J.address_key, records[i], 'StreetAddress'))
+        if number is None: continue
+        zipcode, city = key(J.zip_key, records[i], 'ZipCode'), key(J.text_key, records[i], 'City')
+        if not zipcode and not city: continue
+        ratios = {}
+        for row, p in enumerate(rows):
+            n, s = J._split_address(key(J.address_key, p, 'StreetAddress'))
+            if row in taken or n != number: continue
+            if zipcode and key(J.zip_key, p, 'ZipCode') != zipcode: continue
+            if not zipcode and key(J.text_key, p, 'City') != city: continue
+            ratio = SequenceMatcher(None, street, s).ratio()
+            if ratio > J.FUZZY_RATIO: ratios[row] = ratio
+        best = [row for row, ratio in ratios.items() if ratio == max(ratios.values())] if ratios else []
+        if len(best) == 1: matches[i] = (best[0], 'fuzzy')
+    return matches
+
+
+def as_dict(result):
+    return {i: (row, method) for i, row, method in result['matches']}
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_join_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    projects = {f"K{i}": random_project(rnd) for i in range(60)}
+    records = [random_project(rnd) for _ in range(80)]
+    expected = brute_force(projects, records)
+    for target in (projects, ProjectStore(projects)):
+        result = REMJoiner(target).join(records)
+        assert as_dict(result) == expected
+        assert sorted(result['unmatched']) == [i for i in range(len(records)) if i not in expected]
+        assert sum(result['counts'].values()) == len(expected)
+
+
+def test_apply_store_matches_dict():
+    rnd = random.Random(3)
+    projects = {f"K{i}": random_project(rnd) for i in range(200)}
+    records = [dict(random_project(rnd), TDLCFM=rnd.choice([None, 99.5]), LTOCFM=rnd.choice([None, 44])) for _ in range(300)]
+    store, plain = ProjectStore(projects), {k: dict(p) for k, p in projects.items()}
+    REMJoiner(store).merge(records)
+    REMJoiner(plain).merge(records)
+    assert {k: dict(store[k]) for k in store} == plain
+
+
+def test_apply_later_record_wins():
+    projects = {'A': {'PermitNo1': 'BP-1', 'TDLCFM': 10}}
+    records = [{'PermitNo1': 'bp 1', 'TDLCFM': 20.0}, {'PermitNo1': 'BP1', 'TDLCFM': 30.0}, {'PermitNo1': 'BP1', 'TDLCFM': None}]
+    for target in (projects, ProjectStore(projects)):
+        REMJoiner(target).merge(records)
+        assert target['A']['TDLCFM'] == 30.0
+
+
+def test_synthetic_records_find_their_project():
+    n = 2000
+    rnd = random.Random(11)
+    rows = list(synthetic.iter_rows(n, seed=5, duplicates=0))
+    store = synthetic.make_projects(n, seed=5, duplicates=0)
+    records = []
+    for p in rows:
+        record = {'StreetAddress': synthetic.rem_address(rnd, p['StreetAddress']), 'ZipCode': p['ZipCode'], 'City': p['City'], 'TDLCFM': 1.0}
+        if rnd.random() < 0.5:
+            record.update({f: p[f] for f in ('Subdivision1', 'Lot1', 'PermitNo1') if p[f] is not None})
+        records.append(record)
+    result = REMJoiner(store).join(records)
+    wrong = [(i, row) for i, row, _ in result['matches'] if row != i]
+    assert not wrong
+    assert len(result['matches']) > 0.9 * n
@@ -0,0 +1,79 @@
+"""Streaming REM XML export (export_to_rem_xml / _pretty_xml) against the minidom toprettyxml output it replaced."""
+
+import random
+import re
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+
+import pytest
+
+from ekotrope_sync_v9aaa import REMFileHandler, _pretty_xml
+
+TEXT = ['Oak Park', 'A & B <Lots>', 'say "hi"', "it's", 'x > y', 'line\r\nbreak', 'cr\ronly', 'tab\there', ' padded ',
+        'Café – ½', '012', '70437']
+
+
+def minidom_export(projects):
+    """The export before streaming: the whole tree, serialized and pretty-printed by minidom."""
+    root = ET.Element('REMRateExport')
+    for k, v in [('version', '1.0'), ('exportDate', 'DATE'), ('source', 'DSLD Ekotrope Sync v9')]:
+        root.set(k, v)
+    for i, p in enumerate(projects):
+        if p: root.append(REMFileHandler._building_element(p, i))
+    return minidom.parseString(ET.tostring(root, encoding='unicode')).toprettyxml(indent="  ")
+
+
+def random_project(rnd):
+    if rnd.random() < 0.05: return {}
+    p = {}
+    for f in ['StreetAddress', 'City', 'State', 'ZipCode', 'Subdivision1', 'Lot1', 'PermitNo1']:
+        if rnd.random() < 0.7: p[f] = rnd.choice(TEXT + ['', None, 12, 7.5])
+    for f in ['Living', 'TDLCFM', 'LTOCFM', 'BDCFM', 'Tonnage', 'MeasuredCFM', 'ReturnIWC', 'SupplyIWC', 'Charge']:
+        if rnd.random() < 0.7: p[f] = rnd.choice([None, 0, 1850, 2.5, -0.125, 1e-7, 123456.789])
+    return p
+
+
+def exported(tmp_path, projects, **kw):
+    path = tmp_path / 'out.xml'
+    REMFileHandler.export_to_rem_xml(projects, str(path), **kw)
+    return re.sub(r'exportDate="[^"]*"', 'exportDate="DATE"', path.read_text(encoding='utf-8'))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_export_matches_minidom(tmp_path, seed):
+    rnd = random.Random(seed)
+    projects = [random_project(rnd) for _ in range(300)] + [None]
+    assert exported(tmp_path, projects) == minidom_export(projects)
+
+
+def test_empty_export_matches_minidom(tmp_path):
+    assert exported(tmp_path, []) == minidom_export([])
+    assert exported(tmp_path, [{}, None]) == minidom_export([{}, None])
+
+
+def test_unindented_export_is_same_document(tmp_path):
+    projects = [random_project(random.Random(9)) for _ in range(50)]
+    pretty, compact = exported(tmp_path, projects), exported(tmp_path, projects, indent=None)
+    assert '>\n' not in compact.split('\n', 1)[1].rstrip('\n')  # whitespace only inside text
+    strip = lambda e: [(x.tag, sorted(x.attrib.items()), (x.text or '').strip() if len(x) else x.text) for x in e.iter()]
+    assert strip(ET.fromstring(pretty.encode())) == strip(ET.fromstring(compact.encode()))
+
+
+def random_tree(rnd, depth=0):
+    elem = ET.Element(rnd.choice(['A', 'Bee', 'c_d', 'E1']))
+    for _ in range(rnd.randint(0, 3)):
+        elem.set(rnd.choice(['id', 'name', 'x']), rnd.choice(TEXT))
+    if depth < 3 and rnd.random() < 0.5:
+        for _ in range(rnd.randint(1, 4)):
+            elem.append(random_tree(rnd, depth + 1))
+    elif rnd.random() < 0.7:
+        elem.text = rnd.choice(TEXT)
+    return elem
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_pretty_xml_matches_minidom(seed):
+    elem = random_tree(random.Random(seed))
+    out = ['<?xml version="1.0" ?>\n']
+    _pretty_xml(out, elem, "  ")
+    assert ''.join(out) == minidom.parseString(ET.tostring(elem, encoding='unicode')).toprettyxml(indent="  ")
@@ -0,0 +1,109 @@
+"""VirtualTreeview selection against what the user clicked, on a stand-in Treeview (no display needed)."""
+
+from types import SimpleNamespace
+
+from ekotrope_sync_v9aaa import VirtualTreeview
+
+SHIFT, CONTROL = 0x0001, 0x0004
+
+
+class FakeTree:
+    """The part of ttk.Treeview VirtualTreeview uses, with the class bindings' plain-click selection."""
+    def __init__(self):
+        self.items, self.values, self.selected, self.focused, self.bindings = [], {}, [], '', {}
+    def configure(self, **kw): pass
+    def bind(self, sequence, func): self.bindings[sequence] = func
+    def get_children(self): return tuple(self.items)
+    def delete(self, *items): self.items = [i for i in self.items if i not in items]
+    def insert(self, parent, index, iid): self.items.append(iid)
+    def item(self, iid, values, tags): self.values[iid] = values
+    def selection_set(self, items):
+        self.selected = list(items)
+        self.fire('<<TreeviewSelect>>')
+    def selection(self): return tuple(self.selected)
+    def yview_moveto(self, f): pass
+    def focus(self, item=None):
+        if item is None: return self.focused
+        self.focused = item
+    def identify_region(self, x, y): return 'cell'
+    def fire(self, sequence, **event):
+        return self.bindings[sequence](SimpleNamespace(**event))
+
+    # user actions: the widget binding runs first, then what the Treeview class binding does
+    def click(self, j, state=0):
+        self.fire('<ButtonPress-1>', x=5, y=5, state=state)
+        item = f"row{j}"
+        if state & CONTROL:
+            self.selected = [i for i in self.selected if i != item] if item in self.selected else self.selected + [item]
+        elif state & SHIFT:
+            self.selected = self.selected + [item]
+        else:
+            self.selected = [item]
+        self.focused = item
+        self.fire('<<TreeviewSelect>>')
+
+    def arrow(self, step, state=0):
+        if self.fire('<Up>' if step < 0 else '<Down>', state=state) == 'break': return
+        j = int(self.focused[3:]) + step
+        self.focused, self.selected = f"row{j}", [f"row{j}"]
+        self.fire('<<TreeviewSelect>>')
+
+
+def make(n=100, visible=10):
+    tree = FakeTree()
+    view = VirtualTreeview(tree, SimpleNamespace(configure=lambda **kw: None, set=lambda a, b: None), lambda key: ((key,), ''))
+    view.visible = visible
+    view.set_rows([f"K{i}" for i in range(n)])
+    return tree, view
+
+
+def test_plain_click_after_select_all_replaces():
+    tree, view = make()
+    view.select_all()
+    tree.click(3)
+    assert view.selection_keys() == ['K3']
+
+
+def test_click_scroll_click_keeps_one():
+    tree, view = make()
+    tree.click(2)
+    view.scroll(50)
+    tree.click(4)
+    assert view.selection_keys() == ['K54']
+
+
+def test_modifier_clicks_extend_across_scrolls():
+    tree, view = make()
+    tree.click(2)
+    view.scroll(50)
+    tree.click(4, CONTROL)
+    tree.click(6, SHIFT)
+    assert view.selection_keys() == ['K2', 'K54', 'K56']
+    tree.click(4, CONTROL)  # toggles K54 off, off-screen K2 stays
+    assert view.selection_keys() == ['K2', 'K56']
+
+
+def test_scrolling_keeps_selection():
+    tree, view = make()
+    view.select_all()
+    for _ in range(20):
+        view.scroll(7)
+    view.scroll(-200)
+    assert len(view.selection_keys()) == 100
+
+
+def test_arrows():
+    tree, view = make(visible=5)
+    tree.click(3)
+    tree.arrow(1)              # inside the window: the Treeview moves the selection
+    assert view.selection_keys() == ['K4']
+    tree.arrow(1)              # past the last row: the window scrolls
+    assert view.selection_keys() == ['K5'] and view.top == 1
+    tree.arrow(1, SHIFT)
+    tree.arrow(-1, SHIFT)
+    tree.arrow(-1, SHIFT)
+    assert view.selection_keys() == ['K4', 'K5', 'K6']
+    view.scroll(50)
+    tree.focus('row0')
+    tree.arrow(1)              # a plain arrow drops the extended, now off-screen rows
+    assert view.selection_keys() == [f"K{view.top + 1}"]